@@ -18,7 +18,11 @@ st.sidebar.markdown("### Herramientas Disponibles")
 menu_options = {
     "🏠 Inicio": "home",
     "📈 Distribución Binomial Inversa": "binomial",
+    "📐 Intervalos de Confianza Binomiales": "binomial_ci",
     "🎯 Plan de Muestreo (Bernoulli)": "sampling",
+    "📏 Plan de Muestreo por Variables": "variables_sampling",
+    "🧩 Muestreo Doble, Múltiple y Secuencial": "double_sampling",
+    "🏭 Plan de Muestreo (Lote Finito)": "finite_lot",
     "χ² Pruebas de Chi-Cuadrado": "chi_square",
     "⍺ Probability Distribution":"distributions",
     "Fisher-Snedecor":"fisher"
@@ -233,6 +237,10 @@ elif selected_page == "binomial":
                 else:
                     st.error("❌ No se pudo encontrar una solución. Verifica los valores ingresados.")
     
+    # Tablas completas de p
+    from binomial_tables import show_table_generator
+    show_table_generator()
+    
     # Ejemplos
     with st.expander("📝 Ver ejemplos de uso"):
         st.markdown("""
@@ -246,11 +254,27 @@ elif selected_page == "binomial":
         - A = 0.975, n = 20, r = 1 → p ≈ 1.234818
         """)
 
+elif selected_page == "binomial_ci":
+    from binomial_ci import show_binomial_ci
+    show_binomial_ci()
+
 elif selected_page == "sampling":
     # Importar y ejecutar la app de plan de muestreo
     from sampling_plan import show_sampling_plan
     show_sampling_plan()
 
+elif selected_page == "variables_sampling":
+    from sampling_variables import show_variables_plan
+    show_variables_plan()
+
+elif selected_page == "double_sampling":
+    from sampling_double import show_double_sampling
+    show_double_sampling()
+
+elif selected_page == "finite_lot":
+    from sampling_hypergeom import show_hypergeom_plan
+    show_hypergeom_plan()
+
 elif selected_page == "chi_square":
     # Importar y ejecutar las pruebas de chi-cuadrado
     from chi_square import show_chi_square
@@ -0,0 +1,198 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.stats import beta, norm
+
+from binomial_inverse import find_p_batch
+
+# Métodos de intervalo disponibles
+METHODS = {
+    "clopper_pearson": "Clopper-Pearson (exacto)",
+    "wilson": "Wilson",
+    "jeffreys": "Jeffreys",
+}
+
+# Filas por bloque al procesar un CSV (la memoria no depende del total de filas)
+CHUNK_ROWS = 100_000
+
+def _clopper_pearson(x, n, tail):
+    """
+    Límites exactos: son la binomial inversa de find_p_batch.
+    Superior: P(X ≤ x | p) = tail; inferior: P(X ≤ x - 1 | p) = 1 - tail.
+    """
+    lower = np.where(x > 0, find_p_batch(1 - tail, n, x - 1), 0.0)
+    upper = np.where(x < n, find_p_batch(tail, n, x), 1.0)
+    return lower, upper
+
+def _wilson(x, n, tail):
+    z = norm.isf(tail)
+    z2 = z * z
+    center = (x + z2 / 2) / (n + z2)
+    half = z / (n + z2) * np.sqrt(x * (n - x) / n + z2 / 4)
+    return np.clip(center - half, 0.0, 1.0), np.clip(center + half, 0.0, 1.0)
+
+def _jeffreys(x, n, tail):
+    """Cuantiles de la posterior Beta(x + 1/2, n - x + 1/2); x = 0 y x = n llegan al borde"""
+    lower = np.where(x > 0, beta.ppf(tail, x + 0.5, n - x + 0.5), 0.0)
+    upper = np.where(x < n, beta.isf(tail, x + 0.5, n - x + 0.5), 1.0)
+    return lower, upper
+
+_BOUNDS = {
+    "clopper_pearson": _clopper_pearson,
+    "wilson": _wilson,
+    "jeffreys": _jeffreys,
+}
+
+def confidence_intervals(successes, trials, confidence=0.95, methods=tuple(METHODS)):
+    """
+    Intervalos de confianza para p de muchos grupos en una sola llamada
+    vectorizada.
+
+    Por cada método de `methods` retorna cuatro columnas:
+    - `{método}_inf`, `{método}_sup`: intervalo bilateral (α/2 en cada cola)
+    - `{método}_cota_inf`: cota inferior unilateral, intervalo [L, 1]
+    - `{método}_cota_sup`: cota superior unilateral, intervalo [0, U]
+
+    Las filas con ensayos < 1, éxitos fuera de 0..n o valores no enteros
+    quedan en NaN. Retorna un DataFrame con las columnas `exitos`, `ensayos`,
+    `p_hat` y las de los intervalos.
+    """
+    x = np.asarray(successes, dtype=float)
+    n = np.asarray(trials, dtype=float)
+    x, n = np.broadcast_arrays(x, n)
+    valid = (n >= 1) & (x >= 0) & (x <= n) & (x == np.round(x)) & (n == np.round(n))
+    # Las filas inválidas se calculan con un valor neutro y se anulan al final
+    x_safe, n_safe = np.where(valid, x, 0.0), np.where(valid, n, 1.0)
+    alpha = 1 - confidence
+
+    result = {"exitos": x, "ensayos": n, "p_hat": np.where(valid, x_safe / n_safe, np.nan)}
+    for method in methods:
+        bounds = _BOUNDS[method]
+        two_lower, two_upper = bounds(x_safe, n_safe, alpha / 2)
+        one_lower, one_upper = bounds(x_safe, n_safe, alpha)
+        for suffix, values in (("inf", two_lower), ("sup", two_upper),
+                               ("cota_inf", one_lower), ("cota_sup", one_upper)):
+            result[f"{method}_{suffix}"] = np.where(valid, values, np.nan)
+    return pd.DataFrame(result)
+
+def stream_csv_intervals(source, output, successes_col, trials_col, confidence=0.95,
+                         methods=tuple(METHODS), chunk_rows=CHUNK_ROWS, progress_callback=None):
+    """
+    Lee el CSV `source` por bloques de `chunk_rows` filas, calcula los
+    intervalos de cada bloque con confidence_intervals y escribe las
+    columnas originales más las de los intervalos en `output` (ruta o
+    archivo abierto) a medida que avanza, así que la memoria no crece con el
+    número de filas. Los valores no numéricos quedan en NaN.
+
+    `progress_callback(filas)` se llama tras cada bloque. Retorna el total
+    de filas procesadas.
+    """
+    rows = 0
+    header = True
+    for chunk in pd.read_csv(source, chunksize=chunk_rows):
+        successes = pd.to_numeric(chunk[successes_col], errors="coerce").to_numpy(dtype=float)
+        trials = pd.to_numeric(chunk[trials_col], errors="coerce").to_numpy(dtype=float)
+        intervals = confidence_intervals(successes, trials, confidence, methods)
+        intervals = intervals.drop(columns=["exitos", "ensayos"]).set_index(chunk.index)
+        pd.concat([chunk, intervals], axis=1).to_csv(output, mode="w" if header else "a",
+                                                     header=header, index=False, float_format="%.10g")
+        header = False
+        rows += len(chunk)
+        if progress_callback:
+            progress_callback(rows)
+    return rows
+
+def show_binomial_ci():
+    import tempfile
+    from pathlib import Path
+
+    import streamlit as st
+
+    st.title("📐 Intervalos de Confianza Binomiales por Lotes")
+    st.markdown("""
+    Calcula intervalos de confianza para la proporción **p** de cada fila de un archivo CSV
+    (por ejemplo, defectuosos e inspeccionados por SKU). El archivo se procesa por bloques,
+    así que puede tener cientos de miles de filas.
+
+    - **Clopper-Pearson**: exacto, es la binomial inversa (P(X ≤ x | p) = α/2 para el límite superior)
+    - **Wilson**: score, buena cobertura media con muestras pequeñas
+    - **Jeffreys**: cuantiles de la posterior Beta(x + ½, n - x + ½)
+    """)
+
+    uploaded = st.file_uploader("Archivo CSV", type=["csv"])
+    if uploaded is None:
+        st.info("Sube un CSV con una columna de éxitos (defectuosos) y otra de ensayos (inspeccionados)")
+        return
+    uploaded.seek(0)
+    columns = list(pd.read_csv(uploaded, nrows=0).columns)
+    if len(columns) < 2:
+        st.error("⚠️ El archivo debe tener al menos dos columnas")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        successes_col = st.selectbox("Columna de éxitos (x)", columns, index=0)
+    with col2:
+        trials_col = st.selectbox("Columna de ensayos (n)", columns, index=1)
+    with col3:
+        confidence = st.number_input("Nivel de confianza", min_value=0.5, max_value=0.9999,
+                                     value=0.95, step=0.01, format="%.4f")
+    methods = st.multiselect("Métodos", list(METHODS), default=list(METHODS), format_func=METHODS.get)
+    if not methods:
+        st.warning("Elige al menos un método")
+        return
+    st.caption("Por método: intervalo bilateral (`_inf`, `_sup`) y cotas unilaterales al mismo nivel "
+               "(`_cota_inf` para [L, 1] y `_cota_sup` para [0, U])")
+
+    inputs = (uploaded.file_id, successes_col, trials_col, confidence, tuple(methods))
+    if st.button("Calcular intervalos", type="primary"):
+        uploaded.seek(0)
+        status = st.empty()
+        started = time.perf_counter()
+        with tempfile.NamedTemporaryFile("w+", suffix=".csv", newline="", encoding="utf-8", delete=False) as output:
+            try:
+                rows = stream_csv_intervals(uploaded, output, successes_col, trials_col, confidence, methods,
+                                            progress_callback=lambda done: status.caption(f"{done:,} filas procesadas..."))
+            except Exception:
+                output.close()
+                Path(output.name).unlink(missing_ok=True)
+                raise
+        status.empty()
+        # Un archivo temporal por sesión: el resultado anterior se borra al reemplazarlo
+        previous = st.session_state.get("binomial_ci_result")
+        if previous:
+            Path(previous["path"]).unlink(missing_ok=True)
+        st.session_state.binomial_ci_result = {"inputs": inputs, "path": output.name, "rows": rows,
+                                               "seconds": time.perf_counter() - started}
+
+    stored = st.session_state.get("binomial_ci_result")
+    if not stored or stored["inputs"] != inputs:
+        return
+    st.success(f"✅ {stored['rows']:,} filas en {stored['seconds']:.2f} s")
+    st.dataframe(pd.read_csv(stored["path"], nrows=100), hide_index=True)
+    st.caption("Vista previa de las primeras 100 filas")
+    with open(stored["path"], "rb") as f:
+        st.download_button("⬇️ Descargar resultados (CSV)", f, file_name="intervalos_binomiales.csv", mime="text/csv")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Intervalos de confianza binomiales para cada fila de un CSV.")
+    parser.add_argument("entrada", help="CSV de entrada")
+    parser.add_argument("salida", help="CSV de salida (columnas de entrada + intervalos)")
+    parser.add_argument("--exitos", default="exitos", help="Columna de éxitos (defectuosos)")
+    parser.add_argument("--ensayos", default="ensayos", help="Columna de ensayos (inspeccionados)")
+    parser.add_argument("--confianza", type=float, default=0.95)
+    parser.add_argument("--metodos", nargs="+", choices=list(METHODS), default=list(METHODS))
+    parser.add_argument("--filas-por-bloque", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    rows = stream_csv_intervals(args.entrada, args.salida, args.exitos, args.ensayos, args.confianza,
+                                args.metodos, args.filas_por_bloque)
+    elapsed = time.perf_counter() - started
+    print(f"{rows:,} filas guardadas en {args.salida} ({elapsed:.1f} s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.stats import binom
+from scipy.stats import binom, beta
 from scipy.optimize import brentq
 
 def find_p_from_cumulative(A, n, r):
@@ -27,3 +27,48 @@ def find_p_from_cumulative(A, n, r):
             return p_solution
         except:
             return None
+
+# Tolerancia |F(r | n, p) - A| para aceptar la fórmula cerrada sin recurrir a brentq
+_CLOSED_FORM_TOL = 1e-9
+
+# Desde este n la CDF es tan empinada en p que la fórmula cerrada puede pasar la
+# tolerancia; por debajo siempre la cumple y la verificación no la revisa
+_VERIFY_MIN_N = 10_000
+
+def find_p_batch(A, n, r, verify=False):
+    """
+    Versión vectorizada de find_p_from_cumulative para tablas de consultas.
+    
+    A, n y r admiten arreglos de NumPy (con broadcasting) y se resuelven
+    todos a la vez con la identidad
+    
+        P(X ≤ r | n, p) = 1 - I_p(r+1, n-r)  ⇒  p = cuantil superior A de Beta(r+1, n-r)
+    
+    Casos borde:
+    - A = 1 → p = 0 y A = 0 → p = 1 (límites de la CDF en p).
+    - r ≥ n (la CDF vale 1 para todo p), r < 0, n < 1 o A fuera de [0, 1]:
+      no hay un p único y se retorna NaN.
+    
+    Con verify=True se comprueba |F(r | n, p) - A| ≤ 1e-9 en las consultas
+    donde la fórmula cerrada puede perder precisión (n ≥ 10 000 o resultado
+    NaN) y las que no lo cumplen se resuelven con find_p_from_cumulative
+    (brentq); si tampoco allí hay solución, quedan en NaN.
+    """
+    A, n, r = np.broadcast_arrays(np.asarray(A, dtype=float), np.asarray(n), np.asarray(r))
+    p = np.full(A.shape, np.nan)
+    valid = (n >= 1) & (r >= 0) & (r < n) & (A >= 0) & (A <= 1)
+    p[valid & (A == 1)] = 0.0
+    p[valid & (A == 0)] = 1.0
+    
+    interior = valid & (A > 0) & (A < 1)
+    a, b = r[interior] + 1, n[interior] - r[interior]
+    p[interior] = beta.isf(A[interior], a, b)
+    
+    if verify:
+        risky = interior & ((n >= _VERIFY_MIN_N) | np.isnan(p))
+        residual = np.abs(binom.cdf(r[risky], n[risky], p[risky]) - A[risky])
+        # ~(x <= tol) también marca los NaN de la fórmula cerrada
+        for index in np.flatnonzero(risky)[~(residual <= _CLOSED_FORM_TOL)]:
+            fallback = find_p_from_cumulative(A.flat[index], n.flat[index], r.flat[index])
+            p.flat[index] = np.nan if fallback is None else fallback
+    return p
@@ -0,0 +1,265 @@
+import argparse
+import io
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.special import bdtr
+
+# Tolerancias del ancho final del horquillado de cada celda
+_XTOL = 1e-13
+_RTOL = 1e-11
+
+# Tope de iteraciones de regula falsi (Illinois) por celda
+_MAX_ITERATIONS = 200
+
+# Niveles de confianza de las tablas publicadas por defecto
+STANDARD_LEVELS = (0.01, 0.025, 0.05, 0.10, 0.90, 0.95, 0.975, 0.99)
+
+def _illinois(A, n, r, lo, hi, stats):
+    """
+    Resuelve F(r | n, p) = A para todas las celdas a la vez dentro de sus
+    horquillados [lo, hi] con regula falsi modificada (Illinois): F es
+    decreciente en p, así que F(lo) ≥ A ≥ F(hi). Con horquillados estrechos
+    bastan unas pocas evaluaciones de la binomial por celda.
+    """
+    # Los vecinos son soluciones con error ≤ la tolerancia: se ensancha en esa medida
+    slack = 2 * np.maximum(_XTOL, _RTOL * hi)
+    lo, hi = np.maximum(lo - slack, 0.0), np.minimum(hi + slack, 1.0)
+    f_lo = bdtr(r, n, lo) - A
+    f_hi = bdtr(r, n, hi) - A
+    stats['evaluaciones_cdf'] += 2 * lo.size
+    # Horquillados que aun así no encierran la raíz vuelven a [0, 1]
+    broken = (f_lo < 0) | (f_hi > 0)
+    if broken.any():
+        lo[broken], hi[broken] = 0.0, 1.0
+        f_lo[broken], f_hi[broken] = 1.0 - A[broken], bdtr(r[broken], n, 1.0) - A[broken]
+        stats['evaluaciones_cdf'] += int(broken.sum())
+    # Último extremo que se movió: +1 lo, -1 hi (Illinois divide el valor del otro)
+    side = np.zeros(lo.size, dtype=np.int8)
+    active = np.flatnonzero(hi - lo > np.maximum(_XTOL, _RTOL * hi))
+    for _ in range(_MAX_ITERATIONS):
+        if active.size == 0:
+            break
+        a, b, fa, fb = lo[active], hi[active], f_lo[active], f_hi[active]
+        span = fa - fb
+        x = np.where(span > 0, a + fa * (b - a) / np.where(span > 0, span, 1.0), 0.5 * (a + b))
+        fx = bdtr(r[active], n, x) - A[active]
+        stats['evaluaciones_cdf'] += active.size
+
+        right = fx > 0
+        left = fx < 0
+        exact = ~(right | left)
+        moved = np.where(right, 1, np.where(left, -1, 0)).astype(np.int8)
+        repeated = moved == side[active]
+        # El extremo que no se mueve por segunda vez seguida pierde la mitad de su valor
+        fb = np.where(right & repeated, 0.5 * fb, fb)
+        fa = np.where(left & repeated, 0.5 * fa, fa)
+        lo[active] = np.where(right | exact, x, a)
+        hi[active] = np.where(left | exact, x, b)
+        f_lo[active] = np.where(right, fx, fa)
+        f_hi[active] = np.where(left, fx, fb)
+        side[active] = moved
+
+        width = hi[active] - lo[active]
+        active = active[width > np.maximum(_XTOL, _RTOL * hi[active])]
+    return 0.5 * (lo + hi)
+
+def inverse_binomial_table(n, levels, previous=None, stats=None):
+    """
+    Tabla de p con P(X ≤ r | n, p) = A para r = 0..n-1 (filas) y cada nivel
+    A de `levels` (columnas). Con r = n la CDF vale 1 para todo p y no hay
+    fila.
+
+    La solución es creciente en r, así que la tabla se llena por niveles de
+    refinamiento: primero r = 0, s, 2s, ... (s potencia de 2) y luego los
+    puntos medios, cada uno horquillado entre sus vecinos ya resueltos
+    p(r - s) ≤ p(r) ≤ p(r + s). Con la tabla `previous = (n', p')` de un n'
+    menor el horquillado se estrecha además con
+    p'(r - (n - n')) ≤ p(r) ≤ p'(r), porque
+    F(r - k | n', p) ≤ F(r | n' + k, p) ≤ F(r | n', p).
+
+    Retorna un arreglo (n, len(levels)). En `stats` se acumulan las
+    evaluaciones de la binomial.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('evaluaciones_cdf', 0)
+    levels = np.asarray(levels, dtype=float)
+    shape = (n, levels.size)
+    lo, hi = np.zeros(shape), np.ones(shape)
+    if previous is not None:
+        prev_n, prev_p = previous
+        k = n - prev_n
+        if k <= 0:
+            raise ValueError("La tabla previa debe tener un n menor")
+        hi[:prev_n] = prev_p
+        lo[k:] = prev_p
+
+    p = np.full(shape, np.nan)
+    top = 1 << (n.bit_length() - 1)
+    stride = top
+    while stride >= 1:
+        if stride == top:
+            rows = np.arange(0, n, stride)
+            cell_lo, cell_hi = lo[rows], hi[rows]
+        else:
+            # Múltiplos impares de stride: sus vecinos r ± stride ya están resueltos
+            rows = np.arange(stride, n, 2 * stride)
+            above = np.minimum(rows + stride, n - 1)
+            cell_lo = np.maximum(lo[rows], p[rows - stride])
+            cell_hi = np.where((rows + stride < n)[:, None], np.minimum(hi[rows], p[above]), hi[rows])
+        grid_r = np.broadcast_to(rows[:, None], cell_lo.shape).ravel()
+        grid_A = np.broadcast_to(levels, cell_lo.shape).ravel()
+        p[rows] = _illinois(grid_A, n, grid_r, cell_lo.ravel(), cell_hi.ravel(), stats).reshape(cell_lo.shape)
+        stride //= 2
+
+    # Límites de la CDF en p: A = 1 en p = 0 y A = 0 en p = 1
+    p[:, levels >= 1] = 0.0
+    p[:, levels <= 0] = 1.0
+    return p
+
+def inverse_binomial_tables(ns, levels):
+    """
+    Genera las tablas de los n de `ns` en orden creciente, cada una
+    horquillada con la anterior (inverse_binomial_table). Produce
+    (n, tabla, segundos, evaluaciones de la binomial) por tabla.
+    """
+    previous = None
+    for n in sorted(set(int(n) for n in ns if n >= 1)):
+        stats = {}
+        started = time.perf_counter()
+        table = inverse_binomial_table(n, levels, previous, stats)
+        yield n, table, time.perf_counter() - started, stats['evaluaciones_cdf']
+        previous = (n, table)
+
+def tables_to_csv(tables, levels):
+    """CSV con columnas n, r y una columna de p por nivel A"""
+    frames = []
+    for n, table in tables:
+        frame = pd.DataFrame(table, columns=[f"A={level:g}" for level in levels])
+        frame.insert(0, "r", np.arange(n))
+        frame.insert(0, "n", n)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True).to_csv(index=False, float_format="%.12g")
+
+def tables_to_npz(tables, levels):
+    """
+    Formato binario compacto (.npz comprimido): `levels`, `ns`, `offsets`
+    (inicio de cada tabla en `p`) y `p` con todas las filas apiladas.
+    """
+    ns = np.array([n for n, _ in tables], dtype=np.int64)
+    buffer = io.BytesIO()
+    np.savez_compressed(
+        buffer,
+        levels=np.asarray(levels, dtype=float),
+        ns=ns,
+        offsets=np.concatenate([[0], np.cumsum(ns)]),
+        p=np.vstack([table for _, table in tables]),
+    )
+    return buffer.getvalue()
+
+def load_tables_npz(source):
+    """Lee un archivo de tables_to_npz: (levels, {n: tabla})"""
+    with np.load(source) as data:
+        offsets = data["offsets"]
+        tables = {int(n): data["p"][offsets[i]:offsets[i + 1]] for i, n in enumerate(data["ns"])}
+        return data["levels"], tables
+
+def show_table_generator():
+    """Sección de la página binomial para generar tablas completas de p"""
+    import streamlit as st
+
+    with st.expander("📋 Generador de tablas de p (r = 0..n-1, varios niveles A)"):
+        st.markdown(
+            "Genera tablas completas de p para cada n de un rango y varios niveles A. Cada celda se "
+            "horquilla con sus vecinas ya resueltas (p crece con r y decrece con n), así que bastan unas "
+            "pocas evaluaciones de la binomial por celda."
+        )
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            n_min = st.number_input("n desde", min_value=1, value=1, step=1, key="table_n_min")
+        with col2:
+            n_max = st.number_input("n hasta", min_value=1, value=200, step=1, key="table_n_max")
+        with col3:
+            n_step = st.number_input("Paso de n", min_value=1, value=1, step=1, key="table_n_step")
+        levels_text = st.text_input("Niveles A (separados por coma)",
+                                    value=", ".join(f"{level:g}" for level in STANDARD_LEVELS),
+                                    key="table_levels")
+        try:
+            levels = sorted({float(value) for value in levels_text.split(",") if value.strip()})
+        except ValueError:
+            st.error("⚠️ Los niveles A deben ser números separados por coma")
+            return
+        if not levels or not all(0 <= level <= 1 for level in levels):
+            st.error("⚠️ Ingresa al menos un nivel A entre 0 y 1")
+            return
+        if n_max < n_min:
+            st.error("⚠️ n hasta debe ser mayor o igual que n desde")
+            return
+
+        inputs = (int(n_min), int(n_max), int(n_step), tuple(levels))
+        ns = range(int(n_min), int(n_max) + 1, int(n_step))
+        if st.button("Generar tablas"):
+            progress = st.progress(0.0)
+            tables, timings = [], []
+            for i, (n, table, seconds, evaluations) in enumerate(inverse_binomial_tables(ns, levels)):
+                tables.append((n, table))
+                timings.append({"n": n, "Celdas": table.size, "Evaluaciones por celda": evaluations / table.size,
+                                "ms": seconds * 1000})
+                progress.progress((i + 1) / len(ns))
+            progress.empty()
+            st.session_state.table_result = {"inputs": inputs, "tables": tables, "timings": pd.DataFrame(timings)}
+
+        stored = st.session_state.get("table_result")
+        if not stored or stored["inputs"] != inputs:
+            return
+        tables, timings = stored["tables"], stored["timings"]
+        st.caption(f"{len(tables):,} tablas · {int(timings['Celdas'].sum()):,} celdas · "
+                   f"{timings['ms'].sum() / 1000:.2f} s · "
+                   f"{timings['Evaluaciones por celda'].mean():.1f} evaluaciones por celda en promedio")
+        tab_time, tab_preview = st.tabs(["Tiempo por tabla", "Vista previa"])
+        with tab_time:
+            st.dataframe(timings, hide_index=True)
+        with tab_preview:
+            n, table = tables[-1]
+            preview = pd.DataFrame(table, columns=[f"A={level:g}" for level in levels])
+            preview.insert(0, "r", np.arange(n))
+            st.caption(f"Tabla de n = {n:,}")
+            st.dataframe(preview, hide_index=True)
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("⬇️ Descargar CSV", tables_to_csv(tables, levels),
+                               file_name="tablas_binomial_inversa.csv", mime="text/csv")
+        with col2:
+            st.download_button("⬇️ Descargar binario (.npz)", tables_to_npz(tables, levels),
+                               file_name="tablas_binomial_inversa.npz", mime="application/octet-stream")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera tablas de la binomial inversa (p para r = 0..n-1).")
+    parser.add_argument("--n-min", type=int, default=1)
+    parser.add_argument("--n-max", type=int, required=True)
+    parser.add_argument("--n-paso", type=int, default=1)
+    parser.add_argument("--niveles", type=float, nargs="+", default=list(STANDARD_LEVELS),
+                        help="Niveles A de la probabilidad acumulada")
+    parser.add_argument("--salida", required=True, help="Archivo .csv o .npz")
+    args = parser.parse_args(argv)
+
+    tables = []
+    for n, table, seconds, evaluations in inverse_binomial_tables(range(args.n_min, args.n_max + 1, args.n_paso),
+                                                                  args.niveles):
+        tables.append((n, table))
+        print(f"n = {n}: {table.size:,} celdas, {evaluations / table.size:.1f} evaluaciones por celda, "
+              f"{seconds * 1000:.1f} ms", file=sys.stderr)
+    if args.salida.endswith(".npz"):
+        with open(args.salida, "wb") as f:
+            f.write(tables_to_npz(tables, args.niveles))
+    else:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(tables_to_csv(tables, args.niveles))
+    print(f"{len(tables):,} tablas guardadas en {args.salida}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ import pandas as pd
 import numpy as np
 from scipy.stats import chi2
 
+from stat_tables import chi2_critical, show_table_section
+
 def show_chi_square():
     """Interfaz principal para pruebas de chi-cuadrado"""
     
@@ -23,6 +25,9 @@ def show_chi_square():
         prueba_consistencia()
     else:
         prueba_independencia()
+    
+    st.markdown("---")
+    show_table_section("chi2", key="chi_tabla")
 
 
 def prueba_bondad_ajuste():
@@ -121,7 +126,7 @@ def prueba_bondad_ajuste():
         gl = num_categorias - 1
         
         # Valor crítico
-        chi_critico = chi2.ppf(1 - alpha, gl)
+        chi_critico = chi2_critical(alpha, gl)
         
         # Mostrar resultados
         mostrar_resultados_bondad(edited_df, O, E, chi_cuadrado_obs, chi_critico, gl, alpha)
@@ -242,7 +247,7 @@ def prueba_consistencia():
         gl = (num_filas - 1) * (num_columnas - 1)
         
         # Valor crítico
-        chi_critico = chi2.ppf(1 - alpha, gl)
+        chi_critico = chi2_critical(alpha, gl)
         
         # Mostrar resultados
         mostrar_resultados_tabla(
@@ -367,7 +372,7 @@ def prueba_independencia():
         gl = (num_filas - 1) * (num_columnas - 1)
         
         # Valor crítico
-        chi_critico = chi2.ppf(1 - alpha, gl)
+        chi_critico = chi2_critical(alpha, gl)
         
         # Mostrar resultados
         mostrar_resultados_tabla(
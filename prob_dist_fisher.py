@@ -1,7 +1,6 @@
 import streamlit as st
-import numpy as np
-import scipy.stats as stats
 
+from stat_tables import f_critical, show_table_section
 
 
 # Selección del modelo
@@ -18,12 +17,8 @@ def render():
         try:
             if modelo == "Fisher-Snedecor (F)":
                 df1, df2 = params['df1'], params['df2']
-                dist = stats.f(dfn=df1, dfd=df2)
-            
-            if lado == "Izquierda" and modelo == "Fisher-Snedecor (F)":
-                return dist.ppf(prob)
-            elif lado == "Derecha" and modelo == "Fisher-Snedecor (F)":
-                return dist.ppf(prob)
+                # ppf(prob) es el valor crítico de cola derecha 1 - prob: tabla precalculada o SciPy
+                return f_critical(1 - prob, df1, df2)
         except Exception as e:
             return f"Error en cálculo: {e}"
 
@@ -46,3 +41,5 @@ def render():
             st.error(prob)
         else:
             st.write(f"**Probabilidad {lado.lower()} en x={x}:** {prob:.8f}")
+
+    show_table_section("f", key="fisher_tabla")
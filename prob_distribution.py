@@ -1,114 +1,364 @@
 import streamlit as st
 import numpy as np
 import scipy.stats as stats
+import functools
 
-
+# Registro de modelos: constructor de la distribución congelada de SciPy a partir
+# del dict de parámetros, esquema de los parámetros (argumentos de st.number_input)
+# y tipo de soporte
+MODELOS = {
+    "Proceso de Bernoulli - Modelo Binomial": {
+        "constructor": lambda p: stats.binom(p['n'], p['p']),
+        "parametros": {
+            'n': dict(label="Número de ensayos (n)", min_value=1, value=10),
+            'p': dict(label="Probabilidad de éxito (p)", min_value=0.000, max_value=1.0, value=0.5, format="%0.6f"),
+        },
+        "soporte": "discreto",
+    },
+    "Proceso de Poisson - Poisson": {
+        "constructor": lambda p: stats.poisson(p['lambda']),
+        "parametros": {
+            'lambda': dict(label="Tasa (λ o x raya)", min_value=0.100, value=1.0, format="%0.6f"),
+        },
+        "soporte": "discreto",
+    },
+    "Exponencial": {
+        "constructor": lambda p: stats.expon(scale=1/p['lambda']),
+        "parametros": {
+            'lambda': dict(label="Tasa (λ)", min_value=0.100, value=1.0, format="%0.6f"),
+        },
+        "soporte": "continuo",
+    },
+    "Weibull": {
+        "constructor": lambda p: stats.weibull_min(c=p['k'], scale=p['lambda']),
+        "parametros": {
+            'k': dict(label="Shape (k o  β)", min_value=0.100, value=1.0, format="%0.6f"),
+            'lambda': dict(label="Scale (λ o α)", min_value=0.100, value=1.0, format="%0.6f"),
+        },
+        "soporte": "continuo",
+    },
+    "Gumbel del min": {
+        "constructor": lambda p: stats.gumbel_l(loc=p['mu'], scale=p['beta']),
+        "parametros": {
+            'mu': dict(label="Loc (μ o θ)", value=0.000, format="%0.6f"),
+            'beta': dict(label="Scale (β)", min_value=0.100, value=1.0, format="%0.6f"),
+        },
+        "soporte": "continuo",
+    },
+    "Gumbel del max": {
+        "constructor": lambda p: stats.gumbel_r(loc=p['mu'], scale=p['beta']),
+        "parametros": {
+            'mu': dict(label="Loc (μ o θ)", value=0.000, format="%0.6f"),
+            'beta': dict(label="Scale (β)", min_value=0.100, value=1.0, format="%0.6f"),
+        },
+        "soporte": "continuo",
+    },
+    "Pareto": {
+        "constructor": lambda p: stats.pareto(b=p['alpha'], scale=p['xm']),
+        "parametros": {
+            'alpha': dict(label="Shape (α)", min_value=0.100, value=1.0, format="%0.6f"),
+            'xm': dict(label="Scale (x_m)", min_value=0.100, value=1.0, format="%0.6f"),
+        },
+        "soporte": "continuo",
+    },
+    "Normal": {
+        "constructor": lambda p: stats.norm(loc=p['mu'], scale=p['sigma']),
+        "parametros": {
+            'mu': dict(label="Media (μ)", value=0.000, format="%0.6f"),
+            'sigma': dict(label="Desviación (σ)", min_value=0.100, value=1.0, format="%0.6f"),
+        },
+        "soporte": "continuo",
+    },
+    "Log Normal": {
+        "constructor": lambda p: stats.lognorm(s=p['sigma'], scale=np.exp(p['mu'])),
+        "parametros": {
+            'mu': dict(label="Media log (μ)", value=0.000, format="%0.6f"),
+            'sigma': dict(label="Desviación log (σ)", min_value=0.100, value=1.0, format="%0.6f"),
+        },
+        "soporte": "continuo",
+    },
+    "Gamma - Poisson": {
+        "constructor": lambda p: stats.nbinom(n=p['r'], p=p['p']),
+        "parametros": {
+            'r': dict(label="Éxitos (r)", min_value=1, value=5),
+            'p': dict(label="Probabilidad (p)", min_value=0.000, max_value=1.0, value=0.5, format="%0.6f"),
+        },
+        "soporte": "discreto",
+    },
+    "Gamma - Empírica": {
+        "constructor": lambda p: stats.gamma(a=p['k'], scale=p['theta']),
+        "parametros": {
+            'k': dict(label="Shape (k)", min_value=0.100, value=1.0, format="%0.6f"),
+            'theta': dict(label="Scale (θ)", min_value=0.100, value=1.0, format="%0.6f"),
+        },
+        "soporte": "continuo",
+    },
+}
 
 # Selección del modelo
-modelos = [
-    "Proceso de Bernoulli - Modelo Binomial",
-    "Proceso de Poisson - Poisson",
-    "Exponencial",
-    "Weibull",
-    "Gumbel del min",
-    "Gumbel del max",
-    "Pareto",
-    "Normal",
-    "Log Normal",
-    "Gamma - Poisson",
-    "Gamma - Empírica"
-]
+modelos = list(MODELOS)
+
+# Tamaños de las cachés LRU de distribuciones congeladas, de evaluaciones y de tramos de curva
+_DISTRIBUCIONES_EN_CACHE = 256
+_EVALUACIONES_EN_CACHE = 4096
+_TRAMOS_EN_CACHE = 1024
+
+# Curvas: puntos iniciales por tramo, niveles de refinamiento y tolerancias (fracción del pico de la densidad / de la CDF)
+_PUNTOS_TRAMO = 8
+_NIVELES_REFINAMIENTO = 8
+_TOLERANCIA_DENSIDAD = 2e-3
+_TOLERANCIA_CDF = 1e-3
+_MAX_TRAMOS = 256
+
+# Discretos: enteros por tramo a partir de los cuales solo se conservan los que mueven la curva
+_ENTEROS_TRAMO = 64
+
+# Puntos como máximo en el modo "Rango" de la página
+_MAX_PUNTOS_RANGO = 100_000
+
+# Inversiones (cuantiles) recordadas por distribución, lado y arreglo de probabilidades
+_INVERSIONES_EN_CACHE = 512
+
+# Tolerancia relativa al comparar una probabilidad con un escalón de la CDF discreta
+_TOLERANCIA_ESCALON = 4 * np.finfo(float).eps
+
+def clave_parametros(params):
+    """Clave hashable de un dict de parámetros (pares ordenados por nombre)"""
+    return tuple(sorted(params.items()))
+
+@functools.lru_cache(maxsize=_DISTRIBUCIONES_EN_CACHE)
+def distribucion_congelada(modelo, clave):
+    """
+    Distribución congelada de SciPy del modelo con los parámetros de
+    `clave` (ver clave_parametros), construida una sola vez por combinación.
+    """
+    return MODELOS[modelo]["constructor"](dict(clave))
+
+@functools.lru_cache(maxsize=_EVALUACIONES_EN_CACHE)
+def evaluar(modelo, clave, metodo, x):
+    """cdf, sf, pdf, pmf o ppf de la distribución congelada en un punto, memorizado"""
+    return float(getattr(distribucion_congelada(modelo, clave), metodo)(x))
+
+def calcular_probabilidad(modelo, params, x, lado):
+    """Probabilidad de cola izquierda P(X ≤ x) o derecha P(X > x), o un mensaje de error"""
+    try:
+        metodo = "cdf" if lado == "Izquierda" else "sf"
+        return evaluar(modelo, clave_parametros(params), metodo, float(x))
+    except Exception as e:
+        return f"Error en cálculo: {e}"
+
+def evaluar_puntos(modelo, params, xs):
+    """
+    Evalúa la distribución en todos los puntos de `xs` en una sola llamada
+    vectorizada: densidad (pdf, o pmf en los modelos discretos), cdf
+    P(X ≤ x), sf P(X > x) y ppf, que toma cada punto como probabilidad
+    (NaN fuera de [0, 1]). Retorna un DataFrame con una fila por punto.
+    """
+    import pandas as pd
+
+    dist = distribucion_congelada(modelo, clave_parametros(params))
+    xs = np.asarray(xs, dtype=float)
+    densidad = dist.pmf(xs) if MODELOS[modelo]["soporte"] == "discreto" else dist.pdf(xs)
+    with np.errstate(invalid="ignore"):
+        return pd.DataFrame({
+            "x": xs,
+            "densidad": densidad,
+            "cdf": dist.cdf(xs),
+            "sf": dist.sf(xs),
+            "ppf": dist.ppf(xs),
+        })
+
+@functools.lru_cache(maxsize=_DISTRIBUCIONES_EN_CACHE)
+def _escala_curva(modelo, clave):
+    """
+    Ancho de tramo (potencia de 2 cercana al rango intercuartílico, al menos
+    1 en los discretos) y pico aproximado de la densidad, por juego de
+    parámetros.
+    """
+    dist = distribucion_congelada(modelo, clave)
+    q1, q3 = dist.ppf([0.25, 0.75])
+    iqr = q3 - q1 if np.isfinite(q3 - q1) and q3 > q1 else 1.0
+    ancho = 2.0 ** np.round(np.log2(iqr))
+    cuantiles = dist.ppf(np.linspace(0.05, 0.95, 19))
+    if MODELOS[modelo]["soporte"] == "discreto":
+        return max(ancho, 1.0), float(np.max(dist.pmf(np.round(cuantiles))))
+    return ancho, float(np.max(dist.pdf(cuantiles)))
+
+@functools.lru_cache(maxsize=_TRAMOS_EN_CACHE)
+def _tramo_curva(modelo, clave, nivel, indice):
+    """
+    Puntos (x, densidad, cdf) del tramo [indice·ancho, (indice+1)·ancho),
+    con el ancho base del juego de parámetros multiplicado por 2^nivel.
+
+    En los modelos continuos se parte de una grilla uniforme y se subdivide
+    cada intervalo donde la interpolación lineal en el punto medio se aleja
+    de la densidad o de la CDF más que la tolerancia, hasta
+    _NIVELES_REFINAMIENTO veces: las zonas planas quedan con pocos puntos y
+    los picos con muchos. En los discretos son los enteros del tramo; si
+    pasan de _ENTEROS_TRAMO, solo aquellos donde la pmf o la CDF cambian de
+    escalón de tolerancia respecto del entero anterior.
+    """
+    dist = distribucion_congelada(modelo, clave)
+    ancho, pico = _escala_curva(modelo, clave)
+    ancho *= 2.0 ** nivel
+    inicio = indice * ancho
+    if MODELOS[modelo]["soporte"] == "discreto":
+        x = np.arange(np.ceil(inicio), inicio + ancho)
+        pmf, cdf = dist.pmf(x), dist.cdf(x)
+        if len(x) > _ENTEROS_TRAMO:
+            nivel_pmf = np.floor(pmf / (_TOLERANCIA_DENSIDAD * pico))
+            nivel_cdf = np.floor(cdf / _TOLERANCIA_CDF)
+            cambia = np.concatenate([[True], (np.diff(nivel_pmf) != 0) | (np.diff(nivel_cdf) != 0)])
+            x, pmf, cdf = x[cambia], pmf[cambia], cdf[cambia]
+        return x, pmf, cdf
+
+    # El extremo derecho es el primer punto del tramo siguiente
+    x = np.linspace(inicio, inicio + ancho, _PUNTOS_TRAMO + 1)
+    densidad, cdf = dist.pdf(x), dist.cdf(x)
+    for _ in range(_NIVELES_REFINAMIENTO):
+        medio = 0.5 * (x[:-1] + x[1:])
+        densidad_medio, cdf_medio = dist.pdf(medio), dist.cdf(medio)
+        refinar = ((np.abs(densidad_medio - 0.5 * (densidad[:-1] + densidad[1:])) > _TOLERANCIA_DENSIDAD * pico)
+                   | (np.abs(cdf_medio - 0.5 * (cdf[:-1] + cdf[1:])) > _TOLERANCIA_CDF))
+        if not refinar.any():
+            break
+        x = np.concatenate([x, medio[refinar]])
+        densidad = np.concatenate([densidad, densidad_medio[refinar]])
+        cdf = np.concatenate([cdf, cdf_medio[refinar]])
+        orden = np.argsort(x)
+        x, densidad, cdf = x[orden], densidad[orden], cdf[orden]
+    return x[:-1], densidad[:-1], cdf[:-1]
+
+def curva(modelo, params, x_min, x_max):
+    """
+    Curvas de densidad y CDF en [x_min, x_max] con resolución adaptativa.
+
+    El eje x se divide en tramos fijos por juego de parámetros y cada tramo
+    se calcula una vez y queda en caché (_tramo_curva): al desplazar o
+    ampliar el rango solo se calculan los tramos nuevos. Los rangos muy
+    amplios usan tramos de ancho 2^nivel veces mayor. Retorna un
+    DataFrame con columnas x, densidad y cdf.
+    """
+    import pandas as pd
+
+    clave = clave_parametros(params)
+    ancho, _ = _escala_curva(modelo, clave)
+    # Rangos muy amplios usan tramos más anchos (también fijos) para no pasar de _MAX_TRAMOS
+    nivel = max(0, int(np.ceil(np.log2((x_max - x_min) / ancho / _MAX_TRAMOS))))
+    ancho *= 2.0 ** nivel
+    tramos = [_tramo_curva(modelo, clave, nivel, indice)
+              for indice in range(int(np.floor(x_min / ancho)), int(np.floor(x_max / ancho)) + 1)]
+    x, densidad, cdf = (np.concatenate(partes) for partes in zip(*tramos))
+    dentro = (x >= x_min) & (x <= x_max)
+    return pd.DataFrame({"x": x[dentro], "densidad": densidad[dentro], "cdf": cdf[dentro]})
+
+def _menor_entero(cumple, x0):
+    """
+    Menor entero x con cumple(x) (condición monótona: falsa y luego
+    verdadera), vectorizado: horquillado por galope desde la estimación x0
+    y bisección entera.
+    """
+    lo, hi = x0 - 1, x0.copy()
+    paso = np.ones_like(x0)
+    # Galope hacia arriba hasta que hi cumpla y hacia abajo hasta que lo no cumpla
+    while True:
+        subir = ~cumple(hi)
+        bajar = cumple(lo)
+        if not (subir.any() or bajar.any()):
+            break
+        lo, hi = (np.where(subir, hi, np.where(bajar, lo - paso, lo)),
+                  np.where(subir, hi + paso, np.where(bajar, lo, hi)))
+        paso = np.where(subir | bajar, 2 * paso, paso)
+    while np.any(hi - lo > 1):
+        medio = np.floor((lo + hi) / 2)
+        ok = cumple(medio)
+        hi, lo = np.where(ok, medio, hi), np.where(ok, lo, medio)
+    return hi
+
+@functools.lru_cache(maxsize=_INVERSIONES_EN_CACHE)
+def _cuantiles_cache(modelo, clave, lado, probabilidades):
+    dist = distribucion_congelada(modelo, clave)
+    q = np.array(probabilidades, dtype=float)
+    with np.errstate(invalid="ignore"):
+        x = dist.ppf(q) if lado == "Izquierda" else dist.isf(q)
+        if MODELOS[modelo]["soporte"] == "discreto":
+            # Menor entero con P(X ≤ x) ≥ q (Izquierda) o P(X > x) ≤ q (Derecha). La estimación de
+            # SciPy puede quedar corrida: por redondeo cuando q coincide con un escalón, y en colas
+            # derechas muy pequeñas isf pasa por 1 - q y cae en el extremo del soporte.
+            interior = (q > 0) & (q < 1)
+            # Donde SciPy no da una estimación finita (isf en colas < 1e-17) se parte de la mediana
+            x = np.where(interior & ~np.isfinite(x), dist.ppf(0.5), x)
+            q_int = q[interior]
+            # Holgura relativa a la cola más chica: cerca de 1 los escalones están a menos de un eps
+            holgura = _TOLERANCIA_ESCALON * np.minimum(q_int, 1 - q_int)
+            if lado == "Izquierda":
+                cumple = lambda v: dist.cdf(v) >= q_int - holgura
+            else:
+                cumple = lambda v: dist.sf(v) <= q_int + holgura
+            x[interior] = _menor_entero(cumple, x[interior])
+    x.setflags(write=False)
+    return x
+
+def cuantiles(modelo, params, probabilidades, lado="Izquierda"):
+    """
+    Cuantiles de la distribución para un arreglo de probabilidades, en una
+    sola llamada vectorizada:
+
+    - Izquierda: x con P(X ≤ x) = q (ppf); valor crítico de cola izquierda
+    - Derecha: x con P(X > x) = q (isf); valor crítico de cola derecha
+
+    En los modelos discretos la CDF es escalonada y se devuelve el menor
+    entero con P(X ≤ x) ≥ q (o P(X > x) ≤ q), corrigiendo el escalón cuando
+    q coincide con un valor de la CDF salvo redondeo y en las colas
+    extremas donde ppf/isf de SciPy fallan. Las inversiones de la
+    misma distribución congelada quedan en caché.
+    """
+    probabilidades = np.asarray(probabilidades, dtype=float)
+    x = _cuantiles_cache(modelo, clave_parametros(params), lado, tuple(probabilidades.ravel().tolist()))
+    return x.reshape(probabilidades.shape)
+
+def intervalo_central(modelo, params, confianzas):
+    """
+    Intervalos centrales [L, U] con probabilidad (1 - c)/2 en cada cola para
+    cada nivel de confianza c. Retorna (L, U, cobertura) con la cobertura
+    real P(L ≤ X ≤ U), que en los discretos es al menos c.
+    """
+    confianzas = np.asarray(confianzas, dtype=float)
+    cola = (1 - confianzas) / 2
+    inferior = cuantiles(modelo, params, cola, "Izquierda")
+    superior = cuantiles(modelo, params, cola, "Derecha")
+    dist = distribucion_congelada(modelo, clave_parametros(params))
+    if MODELOS[modelo]["soporte"] == "discreto":
+        cobertura = dist.cdf(superior) - dist.cdf(inferior - 1)
+    else:
+        cobertura = dist.cdf(superior) - dist.cdf(inferior)
+    return inferior, superior, cobertura
+
 def render():
     # Título de la app
     st.title("Probability Distributions - Cálculo de Probabilidades")
     modelo_seleccionado = st.selectbox("Selecciona un modelo de distribución:", modelos)
 
-    # Función para calcular la probabilidad
-    def calcular_probabilidad(modelo, params, x, lado):
-        try:
-            if modelo == "Proceso de Bernoulli - Modelo Binomial":
-                n, p = params['n'], params['p']
-                dist = stats.binom(n, p)
-                cdf = dist.cdf(x)
-            elif modelo == "Proceso de Poisson - Poisson":
-                lam = params['lambda']
-                dist = stats.poisson(lam)
-                cdf = dist.cdf(x)
-            elif modelo == "Exponencial":
-                lam = params['lambda']
-                dist = stats.expon(scale=1/lam)
-                cdf = dist.cdf(x)
-            elif modelo == "Weibull":
-                k, lam = params['k'], params['lambda']
-                dist = stats.weibull_min(c=k, scale=lam)
-                cdf = dist.cdf(x)
-            elif modelo == "Gumbel del min":
-                mu, beta = params['mu'], params['beta']
-                dist = stats.gumbel_l(loc=mu, scale=beta)
-                cdf = dist.cdf(x)
-            elif modelo == "Gumbel del max":
-                mu, beta = params['mu'], params['beta']
-                dist = stats.gumbel_r(loc=mu, scale=beta)
-                cdf = dist.cdf(x)
-            elif modelo == "Pareto":
-                alpha, xm = params['alpha'], params['xm']
-                dist = stats.pareto(b=alpha, scale=xm)
-                cdf = dist.cdf(x)
-            elif modelo == "Normal":
-                mu, sigma = params['mu'], params['sigma']
-                dist = stats.norm(loc=mu, scale=sigma)
-                cdf = dist.cdf(x)
-            elif modelo == "Log Normal":
-                mu, sigma = params['mu'], params['sigma']
-                dist = stats.lognorm(s=sigma, scale=np.exp(mu))
-                cdf = dist.cdf(x)
-            elif modelo == "Gamma - Poisson":
-                r, p = params['r'], params['p']
-                dist = stats.nbinom(n=r, p=p)
-                cdf = dist.cdf(x)
-            elif modelo == "Gamma - Empírica":
-                k, theta = params['k'], params['theta']
-                dist = stats.gamma(a=k, scale=theta)
-                cdf = dist.cdf(x)
-            
-            if lado == "Izquierda":
-                return cdf
-            elif lado == "Derecha":
-                return 1 - cdf
-        except Exception as e:
-            return f"Error en cálculo: {e}"
-
     # Inputs de parámetros según el modelo (usando number_input para entrada manual)
     params = {}
-    if modelo_seleccionado == "Proceso de Bernoulli - Modelo Binomial":
-        params['n'] = st.number_input("Número de ensayos (n)", min_value=1, value=10)
-        params['p'] = st.number_input("Probabilidad de éxito (p)", min_value=0.000, max_value=1.0, value=0.5, format="%0.6f")
-    elif modelo_seleccionado == "Proceso de Poisson - Poisson":
-        params['lambda'] = st.number_input("Tasa (λ o x raya)", min_value=0.100, value=1.0, format="%0.6f")
-    elif modelo_seleccionado == "Exponencial":
-        params['lambda'] = st.number_input("Tasa (λ)", min_value=0.100, value=1.0, format="%0.6f")
-    elif modelo_seleccionado == "Weibull":
-        params['k'] = st.number_input(f"Shape (k o  β)", min_value=0.100, value=1.0, format="%0.6f")
-        params['lambda'] = st.number_input("Scale (λ o α)", min_value=0.100, value=1.0, format="%0.6f")
-    elif modelo_seleccionado in ["Gumbel del min", "Gumbel del max"]:
-        params['mu'] = st.number_input("Loc (μ o θ)", value=0.000, format="%0.6f")
-        params['beta'] = st.number_input("Scale (β)", min_value=0.100, value=1.0, format="%0.6f")
-    elif modelo_seleccionado == "Pareto":
-        params['alpha'] = st.number_input("Shape (α)", min_value=0.100, value=1.0, format="%0.6f")
-        params['xm'] = st.number_input("Scale (x_m)", min_value=0.100, value=1.0, format="%0.6f")
-    elif modelo_seleccionado == "Normal":
-        params['mu'] = st.number_input("Media (μ)", value=0.000, format="%0.6f")
-        params['sigma'] = st.number_input("Desviación (σ)", min_value=0.100, value=1.0, format="%0.6f")
-    elif modelo_seleccionado == "Log Normal":
-        params['mu'] = st.number_input("Media log (μ)", value=0.000, format="%0.6f")
-        params['sigma'] = st.number_input("Desviación log (σ)", min_value=0.100, value=1.0, format="%0.6f")
-    elif modelo_seleccionado == "Gamma - Poisson":
-        params['r'] = st.number_input("Éxitos (r)", min_value=1, value=5)
-        params['p'] = st.number_input("Probabilidad (p)", min_value=0.000, max_value=1.0, value=0.5, format="%0.6f")
-    elif modelo_seleccionado == "Gamma - Empírica":
-        params['k'] = st.number_input("Shape (k)", min_value=0.100, value=1.0, format="%0.6f")
-        params['theta'] = st.number_input("Scale (θ)", min_value=0.100, value=1.0, format="%0.6f")
+    for nombre, entrada in MODELOS[modelo_seleccionado]["parametros"].items():
+        params[nombre] = st.number_input(**entrada)
+
+    modo = st.radio("Modo", ["Probabilidad en un punto", "Varios puntos y curvas", "Cuantiles e intervalos",
+                             "Simulación Monte Carlo"], horizontal=True)
+    if modo == "Varios puntos y curvas":
+        _render_varios_puntos(modelo_seleccionado, params)
+    elif modo == "Cuantiles e intervalos":
+        _render_cuantiles(modelo_seleccionado, params)
+    elif modo == "Simulación Monte Carlo":
+        from prob_sampling import show_simulation
+        show_simulation(modelo_seleccionado, params)
+    else:
+        _render_un_punto(modelo_seleccionado, params)
+    _render_tablas()
 
+def _render_un_punto(modelo_seleccionado, params):
+    """Probabilidad de un lado en un x y despeje de un parámetro"""
     # Input para x y selección de lado
     x = st.number_input("Valor de x", value=0.0, format="%0.6f")
     lado = st.selectbox("Selecciona el lado de la probabilidad:", ["Izquierda", "Derecha"])
@@ -120,3 +370,158 @@ def render():
             st.error(prob)
         else:
             st.write(f"**Probabilidad {lado.lower()} en x={x}:** {prob:.8f}")
+
+    # Problema inverso: despejar un parámetro para probabilidades objetivo dadas
+    with st.expander("🔁 Despejar un parámetro a partir de la probabilidad"):
+        from prob_inversion import SOLVABLE, solve_parameter
+        import pandas as pd
+
+        nombre = st.selectbox("Parámetro a despejar", list(SOLVABLE[modelo_seleccionado]))
+        texto = st.text_input(f"Probabilidades objetivo del lado {lado.lower()} en x={x} (separadas por coma)",
+                              value="0.05, 0.5, 0.95")
+        try:
+            objetivos = [float(v) for v in texto.split(",") if v.strip()]
+        except ValueError:
+            st.error("Las probabilidades deben ser números separados por coma")
+            objetivos = []
+        if objetivos:
+            valores = solve_parameter(modelo_seleccionado, params, nombre, objetivos, x, lado)
+            verificacion = []
+            for valor in valores:
+                if np.isnan(valor):
+                    verificacion.append(np.nan)
+                    continue
+                verificacion.append(calcular_probabilidad(modelo_seleccionado, dict(params, **{nombre: float(valor)}), x, lado))
+            st.dataframe(pd.DataFrame({"Objetivo": objetivos, nombre: valores, "Probabilidad obtenida": verificacion}),
+                         hide_index=True)
+            if np.isnan(valores).any():
+                st.caption("NaN: la probabilidad objetivo no es alcanzable variando solo ese parámetro")
+
+def _leer_puntos(modelo):
+    """Puntos x de la página: lista escrita, rango o columna de un CSV subido"""
+    import pandas as pd
+
+    origen = st.radio("Puntos x", ["Lista", "Rango", "Columna de un CSV"], horizontal=True)
+    if origen == "Lista":
+        texto = st.text_input("Valores de x (separados por coma)", value="0, 1, 2, 3")
+        try:
+            return np.array([float(v) for v in texto.split(",") if v.strip()])
+        except ValueError:
+            st.error("Los valores de x deben ser números separados por coma")
+            return None
+    if origen == "Rango":
+        discreto = MODELOS[modelo]["soporte"] == "discreto"
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            desde = st.number_input("Desde", value=0.0, format="%0.6f")
+        with col2:
+            hasta = st.number_input("Hasta", value=200.0 if discreto else 5.0, format="%0.6f")
+        with col3:
+            paso = st.number_input("Paso", min_value=1e-6, value=1.0 if discreto else 0.1, format="%0.6f")
+        if hasta < desde:
+            st.error("El final del rango debe ser mayor o igual que el inicio")
+            return None
+        cantidad = int(np.floor((hasta - desde) / paso + 1e-9)) + 1
+        if cantidad > _MAX_PUNTOS_RANGO:
+            st.error(f"El rango tiene {cantidad:,} puntos; el máximo es {_MAX_PUNTOS_RANGO:,}. "
+                     "Aumenta el paso o acorta el rango")
+            return None
+        return desde + paso * np.arange(cantidad)
+    archivo = st.file_uploader("Archivo CSV", type=["csv"])
+    if archivo is None:
+        return None
+    datos = pd.read_csv(archivo)
+    columna = st.selectbox("Columna con los valores de x", list(datos.columns))
+    return pd.to_numeric(datos[columna], errors="coerce").dropna().to_numpy(dtype=float)
+
+def _render_varios_puntos(modelo, params):
+    """Tabla de densidad, cdf, sf y ppf en muchos puntos y curvas de densidad y CDF"""
+    import altair as alt
+
+    xs = _leer_puntos(modelo)
+    if xs is None or xs.size == 0:
+        return
+    tabla = evaluar_puntos(modelo, params, xs)
+    discreto = MODELOS[modelo]["soporte"] == "discreto"
+    st.caption(f"{xs.size:,} puntos · densidad = {'pmf' if discreto else 'pdf'} · "
+               "ppf toma cada x como probabilidad (NaN fuera de [0, 1])")
+    st.dataframe(tabla, hide_index=True)
+    st.download_button("⬇️ Descargar tabla (CSV)", tabla.to_csv(index=False), file_name="distribucion_puntos.csv",
+                       mime="text/csv")
+
+    # Rango de las curvas: el de los puntos, con margen, o el central de la distribución si es un solo punto
+    dist = distribucion_congelada(modelo, clave_parametros(params))
+    x_min, x_max = float(xs.min()), float(xs.max())
+    if x_max <= x_min:
+        x_min, x_max = (float(v) for v in dist.ppf([0.001, 0.999]))
+    margen = 0.05 * (x_max - x_min)
+    datos = curva(modelo, params, x_min - margen, x_max + margen)
+    st.caption(f"Curvas con {len(datos):,} puntos de resolución adaptativa")
+
+    tab_densidad, tab_cdf = st.tabs(["Densidad", "CDF"])
+    with tab_densidad:
+        base = alt.Chart(datos).encode(
+            x=alt.X("x:Q", title="x"),
+            y=alt.Y("densidad:Q", title="pmf" if discreto else "pdf"),
+            tooltip=[alt.Tooltip("x:Q", format=".4f"), alt.Tooltip("densidad:Q", format=".6f")]
+        )
+        st.altair_chart((base.mark_bar() if discreto else base.mark_line()).interactive(), width="stretch")
+    with tab_cdf:
+        chart = alt.Chart(datos).mark_line(interpolate="step-after" if discreto else "linear").encode(
+            x=alt.X("x:Q", title="x"),
+            y=alt.Y("cdf:Q", title="P(X ≤ x)"),
+            tooltip=[alt.Tooltip("x:Q", format=".4f"), alt.Tooltip("cdf:Q", format=".6f")]
+        ).interactive()
+        st.altair_chart(chart, width="stretch")
+
+def _leer_lista(etiqueta, valor):
+    """Lista de probabilidades en (0, 1) escrita separada por comas, o None si no es válida"""
+    texto = st.text_input(etiqueta, value=valor)
+    try:
+        valores = np.array([float(v) for v in texto.split(",") if v.strip()])
+    except ValueError:
+        st.error("Los valores deben ser números separados por coma")
+        return None
+    if valores.size == 0 or not np.all((valores > 0) & (valores < 1)):
+        st.error("Ingresa probabilidades entre 0 y 1 (sin incluirlos)")
+        return None
+    return valores
+
+def _render_cuantiles(modelo, params):
+    """Valores críticos para probabilidades de cola dadas e intervalos centrales"""
+    import pandas as pd
+
+    discreto = MODELOS[modelo]["soporte"] == "discreto"
+    dist = distribucion_congelada(modelo, clave_parametros(params))
+
+    st.markdown("#### Valores críticos")
+    lado = st.selectbox("Cola de la probabilidad:", ["Izquierda", "Derecha"])
+    probabilidades = _leer_lista(f"Probabilidades de la cola {lado.lower()} (separadas por coma)",
+                                 "0.01, 0.025, 0.05, 0.1, 0.5, 0.9, 0.95, 0.975, 0.99")
+    if probabilidades is not None:
+        x = cuantiles(modelo, params, probabilidades, lado)
+        tabla = pd.DataFrame({"Probabilidad": probabilidades, "x": x})
+        if lado == "Izquierda":
+            tabla["P(X ≤ x) real"] = dist.cdf(x)
+        else:
+            tabla["P(X > x) real"] = dist.sf(x)
+        st.dataframe(tabla, hide_index=True)
+        if discreto:
+            st.caption("Modelo discreto: x es el menor entero que alcanza la probabilidad pedida, así que la "
+                       "probabilidad real puede superarla (cola izquierda) o quedar por debajo (cola derecha)")
+
+    st.markdown("#### Intervalos centrales")
+    confianzas = _leer_lista("Niveles de confianza (separados por coma)", "0.8, 0.9, 0.95, 0.99")
+    if confianzas is not None:
+        inferior, superior, cobertura = intervalo_central(modelo, params, confianzas)
+        st.dataframe(pd.DataFrame({"Confianza": confianzas, "Límite inferior": inferior,
+                                   "Límite superior": superior, "Cobertura real": cobertura}), hide_index=True)
+
+def _render_tablas():
+    """Tablas impresas de la normal, t, binomial y Poisson desde el almacén precalculado"""
+    from stat_tables import TABLES, show_table_section
+
+    st.subheader("📋 Tablas estadísticas")
+    tabla = st.selectbox("Tabla", ["normal", "t", "binomial", "poisson"],
+                         format_func=lambda nombre: TABLES[nombre]["titulo"], key="dist_tabla")
+    show_table_section(tabla, key=f"dist_tabla_{tabla}")
@@ -0,0 +1,134 @@
+import numpy as np
+
+from prob_distribution import MODELOS
+
+# Parámetros que se pueden despejar en cada modelo y su tipo:
+# "escala" (positivo, se busca en log), "posicion" (real) o "probabilidad" (en (0, 1), se busca en logit).
+# Con x y los demás parámetros fijos la CDF es monótona en cada uno de ellos.
+SOLVABLE = {
+    "Proceso de Bernoulli - Modelo Binomial": {"p": "probabilidad"},
+    "Proceso de Poisson - Poisson": {"lambda": "escala"},
+    "Exponencial": {"lambda": "escala"},
+    "Weibull": {"lambda": "escala"},
+    "Gumbel del min": {"mu": "posicion", "beta": "escala"},
+    "Gumbel del max": {"mu": "posicion", "beta": "escala"},
+    "Pareto": {"alpha": "escala", "xm": "escala"},
+    "Normal": {"mu": "posicion", "sigma": "escala"},
+    "Log Normal": {"mu": "posicion", "sigma": "escala"},
+    "Gamma - Poisson": {"p": "probabilidad"},
+    "Gamma - Empírica": {"k": "escala", "theta": "escala"},
+}
+
+# Transformaciones a una coordenada u sin restricciones, sus inversas y el dominio de u
+_TRANSFORMS = {
+    "escala": (np.log, np.exp, (-300.0, 300.0)),
+    "posicion": (lambda v: v, lambda u: u, (-1e15, 1e15)),
+    "probabilidad": (lambda v: np.log(v) - np.log1p(-v), lambda u: 0.5 * (1 + np.tanh(u / 2)), (-40.0, 40.0)),
+}
+
+# Punto de partida del horquillado cuando el parámetro no trae un valor válido
+_DEFAULT_START = {"escala": 1.0, "posicion": 0.0, "probabilidad": 0.5}
+
+# Duplicaciones del horquillado y tope de iteraciones de Illinois
+_MAX_EXPANSIONS = 60
+_MAX_ITERATIONS = 200
+_UTOL = 1e-12
+
+def _probability(modelo, params, name, values, x, lado):
+    """Probabilidad del lado pedido en x con el parámetro `name` tomando los valores `values` (arreglo)"""
+    dist = MODELOS[modelo]["constructor"](dict(params, **{name: values}))
+    with np.errstate(all="ignore"):
+        return dist.cdf(x) if lado == "Izquierda" else dist.sf(x)
+
+def solve_parameter(modelo, params, name, targets, x, lado="Izquierda", stats=None):
+    """
+    Valores del parámetro `name` del modelo con los que la probabilidad del
+    lado pedido en x es igual a cada objetivo: P(X ≤ x) = objetivo
+    (Izquierda) o P(X > x) = objetivo (Derecha). Los demás parámetros se
+    toman de `params`.
+
+    `targets` y `x` admiten arreglos (con broadcasting) y se resuelven
+    todos a la vez:
+
+    1. Horquillado automático: partiendo del valor actual del parámetro,
+       se duplica un intervalo simétrico en la coordenada sin restricciones
+       (log para escalas, logit para probabilidades) hasta que la
+       diferencia con el objetivo cambia de signo; como la probabilidad es
+       monótona en el parámetro, el signo no vuelve a cambiar.
+    2. Regula falsi modificada (Illinois) vectorizada dentro de cada
+       horquillado.
+
+    Donde el objetivo no es alcanzable (por ejemplo, fuera del soporte)
+    el resultado es NaN. En `stats` se informan las pasadas vectorizadas.
+    Cada pasada arma una sola distribución con el parámetro como arreglo;
+    las distribuciones con parámetros escalares se recuerdan en
+    prob_distribution.distribucion_congelada.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('pasadas', 0)
+    kind = SOLVABLE[modelo][name]
+    forward, inverse, (u_min, u_max) = _TRANSFORMS[kind]
+    targets, x = np.broadcast_arrays(np.asarray(targets, dtype=float), np.asarray(x, dtype=float))
+    shape = targets.shape
+    targets, x = targets.ravel(), x.ravel()
+    start = params.get(name, _DEFAULT_START[kind])
+    params = {k: v for k, v in params.items() if k != name}
+
+    def residual(u, index):
+        stats['pasadas'] += 1
+        return _probability(modelo, params, name, inverse(u), x[index], lado) - targets[index]
+
+    # 1. Horquillado por duplicación alrededor del valor actual
+    with np.errstate(all="ignore"):
+        center = float(forward(np.float64(start)))
+    if not u_min < center < u_max:
+        center = float(forward(np.float64(_DEFAULT_START[kind])))
+    lo = np.full(targets.size, center - 1.0)
+    hi = np.full(targets.size, center + 1.0)
+    everything = np.arange(targets.size)
+    f_lo, f_hi = residual(lo, everything), residual(hi, everything)
+    pending = np.flatnonzero(~(f_lo * f_hi <= 0))
+    step = 1.0
+    for _ in range(_MAX_EXPANSIONS):
+        if pending.size == 0:
+            break
+        step *= 2
+        lo[pending] = np.maximum(lo[pending] - step, u_min)
+        hi[pending] = np.minimum(hi[pending] + step, u_max)
+        f_lo[pending] = residual(lo[pending], pending)
+        f_hi[pending] = residual(hi[pending], pending)
+        # Se descartan los que ya cubren todo el dominio sin cambio de signo
+        pending = pending[~(f_lo[pending] * f_hi[pending] <= 0)
+                          & ((lo[pending] > u_min) | (hi[pending] < u_max))]
+    unsolved = ~(f_lo * f_hi <= 0)
+
+    # 2. Illinois sobre g(u) con g(lo) y g(hi) de signos opuestos
+    side = np.zeros(targets.size, dtype=np.int8)
+    active = np.flatnonzero(~unsolved & (hi - lo > _UTOL * np.maximum(1.0, np.abs(lo))))
+    for _ in range(_MAX_ITERATIONS):
+        if active.size == 0:
+            break
+        a, b, fa, fb = lo[active], hi[active], f_lo[active], f_hi[active]
+        span = fa - fb
+        u = np.where(span != 0, a + fa * (b - a) / np.where(span != 0, span, 1.0), 0.5 * (a + b))
+        # Protección: si la secante cae fuera (valores no finitos), bisección
+        u = np.where(np.isfinite(u) & (u > a) & (u < b), u, 0.5 * (a + b))
+        fu = residual(u, active)
+        same_as_lo = np.sign(fu) == np.sign(fa)
+        exact = fu == 0
+        moved = np.where(exact, 0, np.where(same_as_lo, 1, -1)).astype(np.int8)
+        repeated = moved == side[active]
+        fb = np.where((moved == 1) & repeated, 0.5 * fb, fb)
+        fa = np.where((moved == -1) & repeated, 0.5 * fa, fa)
+        lo[active] = np.where((moved == 1) | exact, u, a)
+        hi[active] = np.where((moved == -1) | exact, u, b)
+        f_lo[active] = np.where(moved == 1, fu, fa)
+        f_hi[active] = np.where(moved == -1, fu, fb)
+        side[active] = moved
+        width = hi[active] - lo[active]
+        active = active[width > _UTOL * np.maximum(1.0, np.abs(lo[active]))]
+
+    solution = inverse(0.5 * (lo + hi))
+    solution[unsolved | ~np.isfinite(targets) | ~np.isfinite(x)] = np.nan
+    return solution.reshape(shape)
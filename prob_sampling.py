@@ -0,0 +1,354 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from scipy.stats import chi2
+
+from prob_distribution import MODELOS, clave_parametros, cuantiles, distribucion_congelada
+
+# Variables por bloque: es lo único que vive en memoria por proceso (8 MB en float64)
+CHUNK_SIZE = 1_000_000
+
+# Cortes por defecto del histograma (cuantiles teóricos equiprobables) y tope para los discretos
+DEFAULT_BINS = 1000
+_MAX_CORTES = 20_000
+
+# Probabilidades de los cuantiles empíricos que se informan
+PROBABILITIES = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99, 0.999)
+
+# Probabilidades de cola con cortes adicionales, para que los cuantiles extremos caigan en clases acotadas
+_COLAS = 10.0 ** -np.arange(2.1, 12.05, 0.1)
+
+# Frecuencia esperada mínima por clase en la prueba χ² (se agrupan clases vecinas hasta alcanzarla)
+_MIN_ESPERADA = 5
+
+def _chunk_sizes(total, chunk):
+    """Tamaños de los bloques: todos de `chunk` salvo el último"""
+    full, rest = divmod(int(total), int(chunk))
+    return [int(chunk)] * full + ([rest] if rest else [])
+
+def _seed_sequences(seed, blocks):
+    """
+    Una SeedSequence hija e independiente por bloque. El bloque i usa
+    siempre la hija i, así que las variables no dependen de cuántos
+    procesos se usen ni del orden en que terminan. Sin semilla se toma
+    entropía del sistema; la semilla usada queda en `entropy`.
+    """
+    root = np.random.SeedSequence(seed)
+    return root, root.spawn(blocks)
+
+def _draw(modelo, clave, seed_sequence, size):
+    dist = distribucion_congelada(modelo, clave)
+    return np.asarray(dist.rvs(size=size, random_state=np.random.default_rng(seed_sequence)), dtype=float)
+
+def generate(modelo, params, total, seed=None, chunk=CHUNK_SIZE):
+    """
+    Generador de `total` variables aleatorias del modelo en bloques de
+    `chunk` (numpy.random.Generator, una SeedSequence por bloque): nunca
+    hay más de un bloque en memoria. Con la misma semilla y tamaño de
+    bloque se obtienen las mismas variables que valida monte_carlo.
+    """
+    clave = clave_parametros(params)
+    sizes = _chunk_sizes(total, chunk)
+    _, seeds = _seed_sequences(seed, len(sizes))
+    for seed_sequence, size in zip(seeds, sizes):
+        yield _draw(modelo, clave, seed_sequence, size)
+
+def histogram_edges(modelo, params, bins=DEFAULT_BINS, probabilities=PROBABILITIES):
+    """
+    Cortes del histograma en streaming. Continuos: cuantiles teóricos
+    de probabilidades 1/bins, ..., (bins-1)/bins (clases equiprobables),
+    de `probabilities` y de colas de 1e-2 a 1e-12 (diez por década) de
+    cada lado, así que los cuantiles informados quedan en clases acotadas.
+    Discretos: todos los enteros entre los cuantiles 1e-12 y 1 - 1e-12 si
+    son a lo sumo _MAX_CORTES (los cuantiles empíricos salen exactos) y,
+    si no, los mismos cuantiles teóricos que en los continuos.
+    """
+    if MODELOS[modelo]["soporte"] == "discreto":
+        lo = cuantiles(modelo, params, [1e-12], "Izquierda")[0]
+        hi = cuantiles(modelo, params, [1e-12], "Derecha")[0]
+        if np.isfinite(lo) and np.isfinite(hi) and hi - lo < _MAX_CORTES:
+            return np.arange(lo, hi + 1, dtype=float)
+    left = np.concatenate([np.arange(1, bins) / bins, np.asarray(probabilities, dtype=float), _COLAS])
+    edges = np.concatenate([cuantiles(modelo, params, left, "Izquierda"),
+                            cuantiles(modelo, params, _COLAS, "Derecha")])
+    return np.unique(edges[np.isfinite(edges)])
+
+def _chunk_summary(values):
+    """(n, media, suma de cuadrados centrados, mínimo, máximo) de un bloque"""
+    mean = float(values.mean())
+    return len(values), mean, float(np.square(values - mean).sum()), float(values.min()), float(values.max())
+
+def _sample_chunks(modelo, clave, edges, jobs):
+    """
+    Tarea de un proceso: genera los bloques de `jobs` [(índice, SeedSequence,
+    tamaño)] uno a uno y retorna sus conteos por clase y sus momentos.
+    """
+    counts = np.zeros(len(edges) + 1, dtype=np.int64)
+    moments = {}
+    for index, seed_sequence, size in jobs:
+        values = _draw(modelo, clave, seed_sequence, size)
+        # Clase i: edges[i-1] < x ≤ edges[i], así el acumulado es #{X ≤ edges[i]}
+        counts += np.bincount(np.searchsorted(edges, values, side="left"), minlength=len(counts))
+        moments[index] = _chunk_summary(values)
+    return counts, moments
+
+def _merge_moments(moments):
+    """Combina los momentos por bloque en orden de índice (Chan et al.): resultado reproducible"""
+    n, mean, m2 = 0, 0.0, 0.0
+    minimum, maximum = np.inf, -np.inf
+    for index in sorted(moments):
+        n_b, mean_b, m2_b, min_b, max_b = moments[index]
+        delta = mean_b - mean
+        total = n + n_b
+        mean += delta * n_b / total
+        m2 += m2_b + delta * delta * n * n_b / total
+        n = total
+        minimum, maximum = min(minimum, min_b), max(maximum, max_b)
+    return n, mean, m2, minimum, maximum
+
+def monte_carlo(modelo, params, total, seed=None, chunk=CHUNK_SIZE, workers=1, bins=DEFAULT_BINS,
+                probabilities=PROBABILITIES):
+    """
+    Simula `total` variables del modelo y las compara con la distribución
+    teórica sin guardarlas: cada bloque sólo aporta sus conteos sobre los
+    cortes de histogram_edges y sus momentos, que se suman entre bloques y
+    procesos.
+
+    Es un generador: tras cada tarea terminada entrega el informe parcial
+    (ver summarize) con lo acumulado hasta ese momento, y el último es el
+    informe final. Con `workers` > 1 los bloques se reparten entre procesos
+    con SeedSequence independientes; el resultado es el mismo con cualquier
+    número de procesos.
+    """
+    clave = clave_parametros(params)
+    edges = histogram_edges(modelo, params, bins, probabilities)
+    sizes = _chunk_sizes(total, chunk)
+    root, seeds = _seed_sequences(seed, len(sizes))
+    jobs = list(zip(range(len(sizes)), seeds, sizes))
+    counts = np.zeros(len(edges) + 1, dtype=np.int64)
+    moments = {}
+    started = time.perf_counter()
+
+    def report():
+        result = summarize(modelo, params, edges, counts, moments, probabilities)
+        result.update(semilla=root.entropy, bloques=len(moments), bloques_total=len(sizes),
+                      procesos=workers, segundos=time.perf_counter() - started)
+        return result
+
+    if workers <= 1:
+        for job in jobs:
+            chunk_counts, chunk_moments = _sample_chunks(modelo, clave, edges, [job])
+            counts += chunk_counts
+            moments.update(chunk_moments)
+            yield report()
+        return
+    # Varias tareas por proceso para repartir la carga, sin pasar de un bloque por tarea
+    per_task = max(1, len(jobs) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_sample_chunks, modelo, clave, edges, jobs[i:i + per_task])
+                   for i in range(0, len(jobs), per_task)]
+        for done in as_completed(futures):
+            chunk_counts, chunk_moments = done.result()
+            counts += chunk_counts
+            moments.update(chunk_moments)
+            yield report()
+
+def _chi_square(observed, expected):
+    """χ² agrupando clases vecinas hasta que cada una espere al menos _MIN_ESPERADA"""
+    # Cortes voraces: cada grupo termina en la primera clase que completa _MIN_ESPERADA desde el corte anterior
+    cumulative = np.cumsum(expected)
+    cuts = []
+    reached = 0.0
+    while True:
+        end = int(np.searchsorted(cumulative, reached + _MIN_ESPERADA, side="left"))
+        if end >= len(expected) - 1:
+            break
+        cuts.append(end + 1)
+        reached = cumulative[end]
+    # El resto, aunque espere menos, queda en el último grupo
+    groups = np.zeros(len(expected), dtype=int)
+    groups[cuts] = 1
+    groups = np.cumsum(groups)
+    observed_g = np.bincount(groups, weights=observed)
+    expected_g = np.bincount(groups, weights=expected)
+    keep = expected_g > 0
+    if keep.sum() < 2:
+        return np.nan, 0, np.nan
+    statistic = float(np.sum((observed_g[keep] - expected_g[keep]) ** 2 / expected_g[keep]))
+    dof = int(keep.sum() - 1)
+    return statistic, dof, float(chi2.sf(statistic, dof))
+
+def summarize(modelo, params, edges, counts, moments, probabilities=PROBABILITIES):
+    """
+    Informe a partir de los conteos por clase y los momentos por bloque:
+
+    - `cuantiles`: por probabilidad q, cuantil teórico, empírico (el valor
+      de la clase que contiene la posición ⌈qN⌉, interpolado dentro de la
+      clase en los continuos; exacto en los discretos con todos los
+      enteros como cortes) y la clase que lo contiene (`desde`, `hasta`).
+      Las clases de los extremos no están acotadas: ahí se informa su
+      corte interior en lugar de interpolar hasta el mínimo o el máximo
+    - `cdf`: CDF empírica y teórica en cada corte y su diferencia
+    - `ks`: máxima |F_emp - F| en los cortes (cota inferior del estadístico
+      de Kolmogorov-Smirnov) y su valor crítico asintótico al 5 %
+    - `chi2`, `gl`, `p_valor`: prueba χ² de bondad de ajuste por clases
+    - `momentos`: media y varianza empíricas y teóricas, mínimo y máximo
+    """
+    import pandas as pd
+
+    dist = distribucion_congelada(modelo, clave_parametros(params))
+    n, mean, m2, minimum, maximum = _merge_moments(moments)
+    cumulative = np.cumsum(counts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        theoretical = dist.cdf(edges)
+        empirical = cumulative[:-1] / n
+
+        # Cuantiles: clase i que contiene la posición k = ⌈qN⌉ y su ubicación dentro de ella
+        probabilities = np.asarray(probabilities, dtype=float)
+        rank = np.maximum(np.ceil(probabilities * n), 1)
+        index = np.searchsorted(cumulative, rank, side="left")
+        lower = np.concatenate([[minimum], edges])[index]
+        upper = np.concatenate([edges, [maximum]])[index]
+        before = np.concatenate([[0], cumulative])[index]
+        if MODELOS[modelo]["soporte"] == "discreto":
+            estimate = upper
+        else:
+            estimate = lower + (rank - before) / counts[index] * (upper - lower)
+        if len(edges):
+            estimate = np.where(index == 0, edges[0], np.where(index == len(edges), edges[-1], estimate))
+
+    expected = n * np.diff(np.concatenate([[0.0], theoretical, [1.0]]))
+    statistic, dof, p_value = _chi_square(counts.astype(float), expected)
+    ks = float(np.max(np.abs(empirical - theoretical))) if len(edges) else np.nan
+    return {
+        "n": int(n),
+        "cuantiles": pd.DataFrame({"q": probabilities,
+                                   "teórico": cuantiles(modelo, params, probabilities, "Izquierda"),
+                                   "empírico": estimate, "desde": lower, "hasta": upper}),
+        "cdf": pd.DataFrame({"x": edges, "F empírica": empirical, "F teórica": theoretical,
+                             "diferencia": empirical - theoretical}),
+        "ks": ks,
+        "ks_critico": 1.358 / np.sqrt(n),
+        "chi2": statistic,
+        "gl": dof,
+        "p_valor": p_value,
+        "momentos": pd.DataFrame({
+            "": ["Media", "Varianza", "Mínimo", "Máximo"],
+            "Empírico": [mean, m2 / (n - 1) if n > 1 else np.nan, minimum, maximum],
+            "Teórico": [float(dist.mean()), float(dist.var()), *(float(v) for v in dist.support())],
+        }),
+    }
+
+def write_npy(path, modelo, params, total, seed=None, chunk=CHUNK_SIZE):
+    """Guarda las variables en un .npy escrito por bloques sobre un arreglo mapeado en memoria"""
+    output = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(int(total),))
+    start = 0
+    for values in generate(modelo, params, total, seed, chunk):
+        output[start:start + len(values)] = values
+        start += len(values)
+    output.flush()
+    del output
+
+def show_simulation(modelo, params):
+    """Sección de la página de distribuciones: simulación Monte Carlo y validación contra la teoría"""
+    import altair as alt
+    import streamlit as st
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        total = int(st.number_input("Variables a generar", min_value=1, max_value=10**10, value=1_000_000,
+                                    step=1_000_000))
+    with col2:
+        seed = int(st.number_input("Semilla", min_value=0, value=12345, step=1))
+    with col3:
+        workers = int(st.number_input("Procesos", min_value=1, value=1, max_value=os.cpu_count() or 1, step=1))
+    chunk = int(st.number_input("Variables por bloque", min_value=1_000, max_value=50_000_000, value=CHUNK_SIZE,
+                                step=100_000))
+    st.caption(f"{len(_chunk_sizes(total, chunk)):,} bloques · a lo sumo {min(total, chunk) * 8 / 2**20:.0f} MB "
+               "por proceso · el resultado no depende del número de procesos")
+
+    inputs = (modelo, clave_parametros(params), total, seed, workers, chunk)
+    if st.button("Simular", type="primary"):
+        progress = st.progress(0.0)
+        status = st.empty()
+        for result in monte_carlo(modelo, params, total, seed, chunk, workers):
+            progress.progress(result["bloques"] / result["bloques_total"])
+            status.caption(f"{result['n']:,} variables · máx |F empírica − F teórica| {result['ks']:.2e} · "
+                           f"{result['segundos']:.1f} s")
+        progress.empty()
+        status.empty()
+        st.session_state.simulation_result = {"inputs": inputs, "result": result}
+
+    stored = st.session_state.get("simulation_result")
+    if not stored or stored["inputs"] != inputs:
+        return
+    result = stored["result"]
+    st.success(f"✅ {result['n']:,} variables en {result['segundos']:.2f} s "
+               f"({result['n'] / max(result['segundos'], 1e-9):,.0f} por segundo, {result['procesos']} procesos)")
+    col1, col2 = st.columns(2)
+    with col1:
+        ajuste = "✅" if result["ks"] <= result["ks_critico"] else "⚠️"
+        st.metric("Máx |F empírica − F teórica|", f"{result['ks']:.2e}",
+                  help=f"Valor crítico de Kolmogorov-Smirnov al 5 %: {result['ks_critico']:.2e}")
+        st.caption(f"{ajuste} valor crítico KS al 5 %: {result['ks_critico']:.2e}")
+    with col2:
+        st.metric("χ² de bondad de ajuste", f"{result['chi2']:.2f}", help=f"{result['gl']} grados de libertad")
+        st.caption(f"p-valor: {result['p_valor']:.4f} con {result['gl']} grados de libertad")
+
+    st.markdown("#### Cuantiles")
+    st.dataframe(result["cuantiles"], hide_index=True)
+    st.caption("Empírico: la clase del histograma que contiene el cuantil es [desde, hasta]")
+    st.markdown("#### Momentos")
+    st.dataframe(result["momentos"], hide_index=True)
+
+    chart = alt.Chart(result["cdf"]).mark_line().encode(
+        x=alt.X("x:Q", title="x"),
+        y=alt.Y("diferencia:Q", title="F empírica − F teórica"),
+        tooltip=[alt.Tooltip("x:Q", format=".4f"), alt.Tooltip("diferencia:Q", format=".2e")]
+    ).interactive()
+    st.altair_chart(chart, width="stretch")
+    st.download_button("⬇️ Descargar CDF empírica y teórica (CSV)", result["cdf"].to_csv(index=False),
+                       file_name="simulacion_cdf.csv", mime="text/csv")
+    param_args = "".join(f" --param {name}={value}" for name, value in params.items())
+    st.caption(f"Semilla {result['semilla']}: `python prob_sampling.py \"{modelo}\"{param_args} --n {total} "
+               f"--semilla {result['semilla']} --bloque {chunk}` reproduce la simulación")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulación Monte Carlo de los modelos de distribución.")
+    parser.add_argument("modelo", choices=list(MODELOS))
+    parser.add_argument("--param", action="append", default=[], metavar="NOMBRE=VALOR",
+                        help="Parámetro del modelo (por defecto, el valor de la página)")
+    parser.add_argument("--n", type=int, default=1_000_000, help="Variables a generar")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--procesos", type=int, default=1)
+    parser.add_argument("--bloque", type=int, default=CHUNK_SIZE, help="Variables por bloque")
+    parser.add_argument("--salida", help="Guarda las variables en un .npy en lugar de validarlas")
+    args = parser.parse_args(argv)
+
+    params = {name: entry["value"] for name, entry in MODELOS[args.modelo]["parametros"].items()}
+    for item in args.param:
+        name, _, value = item.partition("=")
+        if name not in params:
+            parser.error(f"{args.modelo} no tiene el parámetro {name}")
+        params[name] = type(params[name])(float(value))
+
+    started = time.perf_counter()
+    if args.salida:
+        write_npy(args.salida, args.modelo, params, args.n, args.semilla, args.bloque)
+        print(f"{args.n:,} variables guardadas en {args.salida} ({time.perf_counter() - started:.1f} s)",
+              file=sys.stderr)
+        return
+    for result in monte_carlo(args.modelo, params, args.n, args.semilla, args.bloque, args.procesos):
+        print(f"\r{result['n']:,} variables ({result['segundos']:.1f} s)", end="", file=sys.stderr)
+    print(file=sys.stderr)
+    print(result["cuantiles"].to_string(index=False))
+    print(result["momentos"].to_string(index=False))
+    print(f"Semilla {result['semilla']} · máx |F_emp - F| = {result['ks']:.3e} (crítico 5 %: {result['ks_critico']:.3e})"
+          f" · χ² = {result['chi2']:.2f} con {result['gl']} gl (p = {result['p_valor']:.4f})")
+
+if __name__ == "__main__":
+    main()
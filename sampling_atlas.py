@@ -0,0 +1,176 @@
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Archivo por defecto del atlas de planes precalculados
+ATLAS_PATH = Path(__file__).resolve().parent / "atlas_planes.npy"
+
+# Resolución de la grilla: p₀, p₁, α y β se indexan en unidades de 1e-4
+RESOLUTION = 10_000
+_FIELD_BITS = 14
+
+# Modos de búsqueda indexados en la clave (mismo orden que sampling_plan.SEARCH_MODES)
+MODES = ("heuristica", "minimo", "gran_n")
+
+ATLAS_DTYPE = np.dtype([
+    ("key", np.int64),
+    ("n", np.int64),
+    ("r", np.int64),
+    ("alpha_real", np.float64),
+    ("beta_real", np.float64),
+])
+
+# Grilla estándar de niveles de riesgo
+STANDARD_RISKS = (0.01, 0.05, 0.1, 0.2)
+
+def _quantize(value):
+    """Valor en unidades de la grilla, o None si no cae exactamente en ella"""
+    units = round(value * RESOLUTION)
+    if abs(value * RESOLUTION - units) > 1e-6 or not 0 <= units < 2**_FIELD_BITS:
+        return None
+    return units
+
+def atlas_key(case, p0, p1, alpha, beta, mode="heuristica"):
+    """
+    Clave entera del plan (modo, caso, p₀, p₁, α, β), o None si algún
+    parámetro no cae en la grilla del atlas.
+    """
+    fields = [_quantize(v) for v in (p0, p1, alpha, beta)]
+    if None in fields or mode not in MODES:
+        return None
+    key = MODES.index(mode) << 1 | (case - 1)
+    for units in fields:
+        key = key << _FIELD_BITS | units
+    return key
+
+_loaded = {}
+
+# Serializa las lecturas y escrituras de append_plan (las sesiones de Streamlit comparten el proceso)
+_append_lock = threading.Lock()
+
+def load_atlas(path=ATLAS_PATH):
+    """
+    Atlas mapeado en memoria (np.load con mmap_mode), o None si no existe.
+
+    Se vuelve a abrir sólo si el archivo cambió desde la última carga.
+    """
+    path = Path(path)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _loaded.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, np.load(path, mmap_mode="r"))
+        _loaded[path] = cached
+    return cached[1]
+
+def lookup_plan(case, p0, p1, alpha, beta, mode="heuristica", path=ATLAS_PATH):
+    """
+    Busca un plan en el atlas por búsqueda binaria sobre las claves ordenadas.
+
+    Retorna (n, r, α_real, β_real) o None si no está (o no hay atlas).
+    """
+    key = atlas_key(case, p0, p1, alpha, beta, mode)
+    atlas = load_atlas(path)
+    if key is None or atlas is None or len(atlas) == 0:
+        return None
+    keys = atlas["key"]
+    i = int(np.searchsorted(keys, key))
+    if i == len(keys) or keys[i] != key:
+        return None
+    row = atlas[i]
+    return int(row["n"]), int(row["r"]), float(row["alpha_real"]), float(row["beta_real"])
+
+def _write_atlas(records, path):
+    """
+    Ordena por clave y reemplaza el archivo de forma atómica. El temporal
+    tiene un nombre único (dos escrituras simultáneas no se pisan) y antes
+    de reemplazar se suelta el mapeo en memoria del atlas anterior: en
+    Windows no se puede reemplazar un archivo mapeado.
+    """
+    records = records[np.argsort(records["key"], kind="stable")]
+    _, unique = np.unique(records["key"], return_index=True)
+    records = records[unique]
+    path = Path(path)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name + ".", suffix=".tmp",
+                                     delete=False) as tmp:
+        np.save(tmp, records)
+    _loaded.pop(path, None)
+    try:
+        os.replace(tmp.name, path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+    return len(records)
+
+def append_plan(case, p0, p1, alpha, beta, solution, mode="heuristica", path=ATLAS_PATH):
+    """
+    Agrega un plan calculado en vivo al atlas (crea el archivo si no existe).
+
+    Retorna False si los parámetros no caen en la grilla del atlas.
+    """
+    key = atlas_key(case, p0, p1, alpha, beta, mode)
+    if key is None:
+        return False
+    record = np.array([(key, *solution)], dtype=ATLAS_DTYPE)
+    with _append_lock:
+        atlas = load_atlas(path)
+        if atlas is not None:
+            # Las entradas existentes tienen prioridad sobre la nueva
+            record = np.concatenate([np.asarray(atlas), record])
+            del atlas
+        _write_atlas(record, path)
+    return True
+
+def parameter_grid(p_values, risks=STANDARD_RISKS, cases=(1, 2)):
+    """Todas las combinaciones válidas (caso, p₀, p₁, α, β) de la grilla"""
+    for case, p0, p1, alpha, beta in itertools.product(cases, p_values, p_values, risks, risks):
+        if (case == 1 and p1 > p0) or (case == 2 and p1 < p0):
+            yield {"p0": p0, "alpha": alpha, "p1": p1, "beta": beta, "case": case}
+
+def build_atlas(p_values, risks=STANDARD_RISKS, mode="heuristica", path=ATLAS_PATH, workers=None):
+    """
+    Genera el atlas resolviendo toda la grilla con sampling_batch.solve_batch.
+
+    Retorna la cantidad de planes guardados.
+    """
+    from sampling_batch import solve_batch
+
+    records = []
+    for result in solve_batch(parameter_grid(p_values, risks), workers, mode):
+        if result.get("n") is None:
+            continue
+        key = atlas_key(result["case"], result["p0"], result["p1"], result["alpha"], result["beta"], mode)
+        if key is not None:
+            records.append((key, result["n"], result["r"], result["alpha_real"], result["beta_real"]))
+    return _write_atlas(np.array(records, dtype=ATLAS_DTYPE), path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera el atlas de planes de muestreo precalculados.")
+    parser.add_argument("--salida", default=str(ATLAS_PATH), help="Archivo .npy del atlas")
+    parser.add_argument("--p-min", type=float, default=0.01)
+    parser.add_argument("--p-max", type=float, default=0.20)
+    parser.add_argument("--p-paso", type=float, default=0.01)
+    parser.add_argument("--riesgos", type=float, nargs="+", default=list(STANDARD_RISKS),
+                        help="Niveles de α y β de la grilla")
+    parser.add_argument("--modo", choices=MODES[:2], default="heuristica")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    steps = int(round((args.p_max - args.p_min) / args.p_paso))
+    p_values = [round(args.p_min + i * args.p_paso, 4) for i in range(steps + 1)]
+    start = time.perf_counter()
+    count = build_atlas(p_values, args.riesgos, args.modo, args.salida, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"{count:,} planes guardados en {args.salida} ({elapsed:.1f} s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
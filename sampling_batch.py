@@ -0,0 +1,197 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from sampling_plan import normal_approximation, find_exact_solution, find_minimal_solution
+
+# Columnas de entrada y de salida del solucionador por lotes
+INPUT_FIELDS = ["id", "p0", "alpha", "p1", "beta", "case"]
+OUTPUT_FIELDS = INPUT_FIELDS + ["n_aprox", "r_aprox", "n", "r", "alpha_real", "beta_real", "error"]
+
+def _parse_row(row, index):
+    """
+    Normaliza una fila de parámetros a los tipos esperados.
+
+    Acepta un dict con nombres de columna o una secuencia (tupla, lista o
+    fila de un arreglo de NumPy) en el orden p0, alpha, p1, beta[, case].
+    """
+    if not isinstance(row, dict):
+        row = dict(zip(["p0", "alpha", "p1", "beta", "case"], row))
+    return {
+        "id": row.get("id") if row.get("id") not in (None, "") else index,
+        "p0": float(row["p0"]),
+        "alpha": float(row["alpha"]),
+        "p1": float(row["p1"]),
+        "beta": float(row["beta"]),
+        "case": int(row.get("case") or 1),
+    }
+
+def _parse_row_or_error(row, index):
+    """
+    _parse_row sin interrumpir el lote: una fila que no se puede leer vuelve
+    con su id y el motivo en la columna "error". Las filas que ya traen un
+    error (de read_parameter_rows) pasan sin cambios.
+    """
+    if isinstance(row, dict) and row.get("error"):
+        return row
+    try:
+        return _parse_row(row, index)
+    except (KeyError, TypeError, ValueError) as exc:
+        row_id = row.get("id") if isinstance(row, dict) and row.get("id") not in (None, "") else index
+        return {"id": row_id, "error": f"Fila inválida: {exc!r}"}
+
+def read_parameter_rows(path):
+    """
+    Lee filas de parámetros desde un archivo CSV o JSONL (según la extensión).
+
+    Columnas: p0, alpha, p1, beta y opcionalmente case (1 por defecto) e id
+    (el número de fila por defecto). Las filas se leen de a una, sin cargar
+    el archivo completo en memoria; una fila que no se puede leer se entrega
+    con su id y el motivo en la columna "error", sin detener la lectura.
+    """
+    path = Path(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.suffix.lower() in (".jsonl", ".json"):
+            rows = (line for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for index, row in enumerate(rows):
+            if isinstance(row, str):
+                try:
+                    row = json.loads(row)
+                except ValueError as exc:
+                    yield {"id": index, "error": f"Fila inválida: {exc}"}
+                    continue
+            yield _parse_row_or_error(row, index)
+
+def solve_plan(params, mode="heuristica"):
+    """
+    Resuelve un plan de muestreo sin interfaz gráfica.
+
+    Usa normal_approximation y luego find_exact_solution (modo "heuristica",
+    el mismo que la página) o find_minimal_solution (modo "minimo"). Los
+    errores de validación se informan en la columna "error".
+    """
+    result = dict(params)
+    p0, alpha, p1, beta, case = (params[k] for k in ("p0", "alpha", "p1", "beta", "case"))
+    if case not in (1, 2):
+        result["error"] = "case debe ser 1 o 2"
+        return result
+    for name in ("p0", "alpha", "p1", "beta"):
+        # `not (0 < x < 1)` también descarta NaN
+        if not 0 < params[name] < 1:
+            result["error"] = f"{name} debe estar entre 0 y 1 (sin incluirlos)"
+            return result
+    if case == 1 and p1 <= p0:
+        result["error"] = "Para el Caso 1, p₁ debe ser mayor que p₀"
+        return result
+    if case == 2 and p1 >= p0:
+        result["error"] = "Para el Caso 2, p₁ debe ser menor que p₀"
+        return result
+
+    n_approx, r_approx = normal_approximation(p0, alpha, p1, beta, case)
+    result["n_aprox"], result["r_aprox"] = n_approx, r_approx
+    if mode == "minimo":
+        solution = find_minimal_solution(p0, alpha, p1, beta, case)
+    else:
+        solution = find_exact_solution(n_approx, r_approx, p0, alpha, p1, beta, case)
+
+    if solution:
+        result["n"], result["r"], result["alpha_real"], result["beta_real"] = solution
+    else:
+        result["error"] = "No se encontró una solución válida"
+    return result
+
+def _solve_chunk(chunk, mode):
+    """
+    Resuelve un bloque de filas dentro de un proceso del pool. Una excepción
+    en una fila queda en su columna "error" y no afecta a las demás.
+    """
+    results = []
+    for params in chunk:
+        try:
+            results.append(solve_plan(params, mode))
+        except Exception as exc:
+            results.append(dict(params, error=f"{type(exc).__name__}: {exc}"))
+    return results
+
+def solve_batch(rows, workers=None, mode="heuristica", chunk_size=8):
+    """
+    Resuelve muchas filas de parámetros en paralelo con un pool de procesos.
+
+    `rows` puede ser cualquier iterable de filas (dicts, tuplas o un arreglo
+    de NumPy, ver _parse_row), por ejemplo el de read_parameter_rows. Las
+    filas se envían en bloques de `chunk_size` y los resultados se entregan a
+    medida que terminan, no en el orden de entrada (cada resultado conserva
+    su id). `workers` es la cantidad de procesos (por defecto, todos los
+    núcleos). Las filas inválidas se entregan con el motivo en la columna
+    "error" y el lote sigue.
+    """
+    workers = workers or os.cpu_count() or 1
+    rows = (_parse_row_or_error(params, index) for index, params in enumerate(rows))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        chunk = []
+        for params in rows:
+            if params.get("error"):
+                yield params
+                continue
+            chunk.append(params)
+            if len(chunk) == chunk_size:
+                pending.add(executor.submit(_solve_chunk, chunk, mode))
+                chunk = []
+            # Limitar los bloques en vuelo para no leer toda la entrada de golpe
+            if len(pending) >= 4 * workers:
+                done = next(as_completed(pending))
+                pending.remove(done)
+                yield from done.result()
+        if chunk:
+            pending.add(executor.submit(_solve_chunk, chunk, mode))
+        for done in as_completed(pending):
+            yield from done.result()
+
+def _open_writer(path):
+    """Retorna (escribir_fila, cerrar) para salida CSV o JSONL (stdout si path es None)"""
+    if path is None:
+        f = sys.stdout
+    else:
+        f = open(path, "w", newline="", encoding="utf-8")
+    if path is not None and Path(path).suffix.lower() == ".csv":
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        write = writer.writerow
+    else:
+        write = lambda result: f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    close = (lambda: None) if path is None else f.close
+    return write, close
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Resuelve planes de muestreo de Bernoulli por lotes desde un archivo CSV o JSONL."
+    )
+    parser.add_argument("entrada", help="Archivo .csv o .jsonl con columnas p0, alpha, p1, beta[, case, id]")
+    parser.add_argument("-o", "--salida", help="Archivo .csv o .jsonl de salida (stdout en JSONL si se omite)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Procesos a usar (todos los núcleos por defecto)")
+    parser.add_argument("--modo", choices=["heuristica", "minimo"], default="heuristica",
+                        help="Búsqueda a usar para cada plan")
+    args = parser.parse_args(argv)
+
+    write, close = _open_writer(args.salida)
+    start = time.perf_counter()
+    count = 0
+    try:
+        for result in solve_batch(read_parameter_rows(args.entrada), args.workers, args.modo):
+            write(result)
+            count += 1
+    finally:
+        close()
+    elapsed = time.perf_counter() - start
+    print(f"{count:,} planes en {elapsed:.2f} s ({count / elapsed:,.1f} planes/s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import functools
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy.optimize import minimize
+from scipy.special import betainc, betaln, gammaln
+
+from sampling_plan import find_minimal_solution
+
+# Tablas beta-binomiales sueltas recordadas (una por n y previa), para consultas de un solo n
+_TABLE_CACHE_SIZE = 256
+
+# Cada cuántos n el recorrido incremental recalcula las probabilidades posteriores con betainc
+_RESYNC_STEPS = 256
+
+@functools.lru_cache(maxsize=_TABLE_CACHE_SIZE)
+def _log_binomial(n):
+    """log C(n, x) para x = 0..n; no depende de la previa"""
+    x = np.arange(n + 1)
+    values = gammaln(n + 1) - gammaln(x + 1) - gammaln(n - x + 1)
+    values.setflags(write=False)
+    return values
+
+def _cumulative_tables(pmf, good, bad):
+    """Sumas acumuladas de P(X = x), P(X = x, p ≤ p₀) y P(X = x, p ≥ p₁)"""
+    tables = {
+        "upper_all": np.cumsum(pmf[::-1])[::-1],
+        "upper_good": np.cumsum(good[::-1])[::-1],
+        "lower_all": np.cumsum(pmf),
+        "lower_bad": np.cumsum(bad),
+    }
+    for table in tables.values():
+        table.setflags(write=False)
+    return tables
+
+@functools.lru_cache(maxsize=_TABLE_CACHE_SIZE)
+def beta_binomial_tables(n, a, b, p0, p1):
+    """
+    Tablas acumuladas de la beta-binomial de una muestra de n con previa
+    Beta(a, b) sobre p, para x = 0..n:
+
+    - upper_all[k]  = P(X ≥ k)
+    - upper_good[k] = P(X ≥ k, p ≤ p₀)
+    - lower_all[k]  = P(X ≤ k)
+    - lower_bad[k]  = P(X ≤ k, p ≥ p₁)
+
+    P(X = x, p ≤ p₀) es la beta-binomial por la probabilidad posterior
+    I_p₀(a + x, b + n - x). Con las sumas acumuladas cada riesgo posterior
+    de un plan (n, r) es un cociente de dos lecturas. Calcula un solo n
+    desde cero; para recorrer n = 1, 2, ... ver beta_binomial_walk.
+    """
+    x = np.arange(n + 1)
+    pmf = np.exp(_log_binomial(n) + betaln(a + x, b + n - x) - betaln(a, b))
+    good = pmf * betainc(a + x, b + n - x, p0)
+    # 1 - I_p₁(a + x, b + n - x) sin restar de 1
+    bad = pmf * betainc(b + n - x, a + x, 1 - p1)
+    return _cumulative_tables(pmf, good, bad)
+
+def beta_binomial_walk(a, b, p0, p1, n_max, stats=None):
+    """
+    Genera (n, tablas) para n = 1..n_max (mismas tablas que
+    beta_binomial_tables), actualizando cada n desde el anterior sin
+    funciones especiales por celda:
+
+    - pmf por la urna de Pólya:
+      P_{n+1}(x) = [P_n(x)·(b + n - x) + P_n(x - 1)·(a + x - 1)] / (a + b + n)
+    - posteriores I_p(a + x, b + n - x) con I_z(α, β + 1) = I_z(α, β) +
+      z^α (1 - z)^β / (β B(α, β)), con log B actualizado por
+      B(α, β + 1) = B(α, β)·β / (α + β); solo la celda nueva x = n + 1 usa
+      betainc
+
+    Cada _RESYNC_STEPS valores de n las posteriores se recalculan con
+    betainc para acotar el error acumulado. En `stats` se cuentan las
+    tablas actualizadas y las recalculadas.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('tablas_incrementales', 0)
+    stats.setdefault('tablas_exactas', 0)
+    a, b = float(a), float(b)
+    log_p0, log_q0 = np.log(p0), np.log1p(-p0)
+    log_p1, log_q1 = np.log(p1), np.log1p(-p1)
+    pmf = np.ones(1)
+    log_beta = np.array([betaln(a, b)])
+    good_post = np.array([betainc(a, b, p0)])
+    # 1 - I_p₁ sin restar de 1
+    bad_post = np.array([betainc(b, a, 1 - p1)])
+    for n in range(int(n_max)):
+        x = np.arange(n + 1)
+        alpha_x, beta_x = a + x, b + n - x
+        log_scale = -np.log(beta_x) - log_beta
+        good_post = np.minimum(good_post + np.exp(alpha_x * log_p0 + beta_x * log_q0 + log_scale), 1.0)
+        bad_post = np.maximum(bad_post - np.exp(alpha_x * log_p1 + beta_x * log_q1 + log_scale), 0.0)
+        log_beta = np.append(log_beta + np.log(beta_x) - np.log(a + b + n), betaln(a + n + 1, b))
+        good_post = np.append(good_post, betainc(a + n + 1, b, p0))
+        bad_post = np.append(bad_post, betainc(b, a + n + 1, 1 - p1))
+        pmf = (np.append(pmf * beta_x, 0.0) + np.insert(pmf * alpha_x, 0, 0.0)) / (a + b + n)
+        if (n + 1) % _RESYNC_STEPS == 0:
+            x = np.arange(n + 2)
+            good_post = betainc(a + x, b + n + 1 - x, p0)
+            bad_post = betainc(b + n + 1 - x, a + x, 1 - p1)
+            stats['tablas_exactas'] += 1
+        else:
+            stats['tablas_incrementales'] += 1
+        yield n + 1, _cumulative_tables(pmf, pmf * good_post, pmf * bad_post)
+
+def _ratio(numerator, denominator):
+    """Cociente con 0 donde el evento condicionante tiene probabilidad nula"""
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+def _risks_from_tables(n, tables):
+    """(r, productor, consumidor) del caso 1 a partir de las tablas acumuladas de n"""
+    zero = np.zeros(1)
+    # Se rechaza H₀ si X ≥ r: r = n + 1 nunca rechaza y r = 0 siempre rechaza
+    upper_all = np.concatenate([tables["upper_all"], zero])
+    upper_good = np.concatenate([tables["upper_good"], zero])
+    lower_all = np.concatenate([zero, tables["lower_all"]])
+    lower_bad = np.concatenate([zero, tables["lower_bad"]])
+    return np.arange(n + 2), _ratio(upper_good, upper_all), _ratio(lower_bad, lower_all)
+
+def _flip_risks(n, rs, producer, consumer):
+    """Riesgos del caso 1 sobre los fracasos → caso 2: rechazar si X ≤ r equivale a rechazar si Y ≥ n - r"""
+    return (n - rs)[::-1], producer[::-1], consumer[::-1]
+
+def posterior_risks(n, a, b, p0, p1, case=1):
+    """
+    Riesgos posteriores de todos los planes (n, r) con r = 0..n+1 (caso 1)
+    o r = -1..n (caso 2), con las mismas reglas que el plan clásico:
+
+    - Riesgo del productor: P(p en H₀ | se rechaza H₀)
+    - Riesgo del consumidor: P(p en H₁ | no se rechaza H₀), con H₁ en p₁ o más allá
+
+    El caso 2 se resuelve como el caso 1 sobre los fracasos: Y = n - X con
+    previa Beta(b, a) sobre 1 - p. Retorna (r, productor, consumidor).
+    """
+    if case == 2:
+        return _flip_risks(n, *posterior_risks(n, b, a, 1 - p0, 1 - p1, 1))
+    tables = beta_binomial_tables(int(n), float(a), float(b), float(p0), float(p1))
+    return _risks_from_tables(n, tables)
+
+def find_bayesian_plan(a, b, p0, alpha, p1, beta, case=1, n_max=None, stats=None):
+    """
+    Plan (n, r) de menor n cuyos riesgos posteriores con previa Beta(a, b)
+    no superan α (productor) y β (consumidor).
+
+    La factibilidad no es monótona en n, así que se recorre n = 1, 2, ...
+    hasta `n_max` (por defecto, el doble del n clásico más 50) con
+    beta_binomial_walk: las tablas de cada n salen de las del anterior. En
+    cada n se evalúan todos los r a la vez y se elige el r con los riesgos
+    lo más cerca posible de los límites, como en el plan clásico. En
+    `stats` se informan los n evaluados y las tablas actualizadas y
+    recalculadas.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(n_evaluados=0, tablas_incrementales=0, tablas_exactas=0)
+    if n_max is None:
+        classical = find_minimal_solution(p0, alpha, p1, beta, case)
+        n_max = 2 * classical[0] + 50 if classical else 10000
+    # El caso 2 recorre los fracasos: previa Beta(b, a) sobre 1 - p
+    walk = (beta_binomial_walk(a, b, p0, p1, n_max, stats) if case == 1 else
+            beta_binomial_walk(b, a, 1 - p0, 1 - p1, n_max, stats))
+    for n, tables in walk:
+        stats['n_evaluados'] += 1
+        rs, producer, consumer = _risks_from_tables(n, tables)
+        if case == 2:
+            rs, producer, consumer = _flip_risks(n, rs, producer, consumer)
+        valid = np.flatnonzero((producer <= alpha) & (consumer <= beta))
+        if valid.size:
+            best = valid[np.argmin((alpha - producer[valid])**2 + (beta - consumer[valid])**2)]
+            return n, int(rs[best]), float(producer[best]), float(consumer[best])
+    return None
+
+def fit_beta_prior(sizes, defects):
+    """
+    Previa Beta(a, b) ajustada por máxima verosimilitud beta-binomial a los
+    resultados de lotes anteriores (unidades inspeccionadas y defectuosas
+    de cada lote), partiendo de la estimación por momentos.
+    """
+    sizes = np.asarray(sizes, dtype=float)
+    defects = np.asarray(defects, dtype=float)
+    rates = defects / sizes
+    mean = np.clip(defects.sum() / sizes.sum(), 1e-6, 1 - 1e-6)
+    # Momentos: var(tasas) ≈ m(1-m)/(a+b+1) descontando el ruido binomial
+    excess = rates.var() - mean * (1 - mean) * np.mean(1 / sizes)
+    strength = mean * (1 - mean) / excess - 1 if excess > 0 else 1000.0
+    strength = float(np.clip(strength, 1.0, 1e5))
+
+    def negative_log_likelihood(log_params):
+        a, b = np.exp(log_params)
+        return -np.sum(betaln(a + defects, b + sizes - defects) - betaln(a, b))
+
+    start = np.log([mean * strength, (1 - mean) * strength])
+    # Sin sobredispersión la verosimilitud crece hacia a + b → ∞: se acota
+    bounds = [(np.log(1e-3), np.log(1e5))] * 2
+    result = minimize(negative_log_likelihood, start, method="L-BFGS-B", bounds=bounds)
+    a, b = np.exp(result.x if result.success else start)
+    return float(a), float(b)
+
+# Lotes anteriores de ejemplo para la tabla editable
+_EXAMPLE_LOTS = pd.DataFrame({
+    "Inspeccionadas": [200, 200, 150, 250, 200, 180, 220, 200],
+    "Defectuosas": [4, 15, 3, 18, 9, 2, 13, 6],
+})
+
+def show_bayesian_section(case, p0, p1, alpha, beta):
+    """Sección de la página para el plan bayesiano con previa beta"""
+    with st.expander("🧠 Plan bayesiano (previa beta ajustada al historial del proveedor)"):
+        st.markdown(
+            "Con una previa Beta(a, b) sobre p, los riesgos se miden **después** de observar la muestra: "
+            "el del productor es P(p ≤ p₀ | se rechaza) y el del consumidor P(p ≥ p₁ | no se rechaza) "
+            "(en el Caso 2, con las desigualdades invertidas). El historial del proveedor reduce el n necesario."
+        )
+        lots = st.data_editor(_EXAMPLE_LOTS, num_rows="dynamic", key="bayes_lots")
+        lots = lots.dropna()
+        lots = lots[(lots["Inspeccionadas"] > 0) & (lots["Defectuosas"] >= 0)
+                    & (lots["Defectuosas"] <= lots["Inspeccionadas"])]
+        if len(lots) < 2:
+            st.info("Ingresa al menos dos lotes anteriores para ajustar la previa")
+            return
+        fitted = fit_beta_prior(lots["Inspeccionadas"], lots["Defectuosas"])
+        st.caption(f"Previa ajustada: Beta(a = {fitted[0]:.3f}, b = {fitted[1]:.3f}) · "
+                   f"media {fitted[0] / sum(fitted):.4f}")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            prior_a = st.number_input("a (previa)", min_value=0.01, value=round(fitted[0], 2), step=0.5)
+        with col2:
+            prior_b = st.number_input("b (previa)", min_value=0.01, value=round(fitted[1], 2), step=0.5)
+        if not st.toggle("Calcular plan bayesiano", value=False):
+            return
+
+        stats = {}
+        start = time.perf_counter()
+        classical = find_minimal_solution(p0, alpha, p1, beta, case)
+        plan = find_bayesian_plan(prior_a, prior_b, p0, alpha, p1, beta, case, stats=stats)
+        elapsed = time.perf_counter() - start
+        st.caption(f"{stats['n_evaluados']:,} valores de n · {stats['tablas_incrementales']:,} tablas actualizadas "
+                   f"de n a n + 1 y {stats['tablas_exactas']:,} recalculadas · {elapsed * 1000:.0f} ms")
+        if plan is None:
+            st.warning("No hay un plan con riesgos posteriores dentro de α y β en el rango recorrido")
+            return
+
+        n, r, producer, consumer = plan
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("📏 n bayesiano", f"{n:,}")
+        with col2:
+            st.metric("🎯 r crítico", f"{r:,}")
+        with col3:
+            st.metric("Riesgo del productor", f"{producer:.6f}", delta=f"Objetivo: {alpha}", delta_color="off")
+        with col4:
+            st.metric("Riesgo del consumidor", f"{consumer:.6f}", delta=f"Objetivo: {beta}", delta_color="off")
+        if not 0 <= r <= n - (case == 2):
+            st.caption("Con esta previa la muestra nunca lleva a rechazar H₀: los riesgos ya se cumplen con lo que "
+                       "se sabe del proveedor")
+        if classical:
+            reduction = classical[0] - n
+            st.info(f"Plan clásico para los mismos p₀/p₁: n = {classical[0]:,}, r = {classical[1]:,} · "
+                    f"el plan bayesiano usa {reduction:,} unidades menos ({reduction / classical[0]:.1%})"
+                    if reduction >= 0 else
+                    f"Plan clásico para los mismos p₀/p₁: n = {classical[0]:,}, r = {classical[1]:,} · "
+                    f"con esta previa el plan bayesiano necesita {-reduction:,} unidades más")
@@ -0,0 +1,113 @@
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy.stats import binom, nbinom
+
+# Puntos de la curva ASN en (0, 1)
+_CURVE_POINTS = 1001
+
+def _oriented(n, r, case):
+    """
+    Umbral de rechazo sobre los conteos que suben hacia el rechazo: en el
+    caso 1 se rechaza al ver r defectos; en el caso 2 (se rechaza si X ≤ r)
+    se rechaza al ver n - r unidades sin defecto, que es el caso 1 sobre
+    Y = n - X con probabilidad 1 - p.
+    """
+    return (r, False) if case == 1 else (n - r, True)
+
+def curtailed_asn(n, r, p, case=1):
+    """
+    Número medio de unidades inspeccionadas con inspección truncada: se
+    detiene al alcanzar r defectos (rechazo seguro) o al alcanzar
+    n - r + 1 unidades sin defecto (aceptación segura), caso 1.
+
+    Con T_k el ensayo del k-ésimo defecto (binomial negativa), la suma de
+    la cola truncada tiene forma cerrada:
+    E[T_r; T_r ≤ n] = (r/p)·P(Bin(n+1, p) ≥ r+1), y lo mismo para las
+    unidades sin defecto con g = n - r + 1 y 1 - p. Vectorizado sobre p.
+    """
+    k, flip = _oriented(n, r, case)
+    p = np.asarray(p, dtype=float)
+    q = 1 - p if flip else p
+    g = n - k + 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        reject_part = np.where(q > 0, k / q * binom.sf(k, n + 1, q), 0.0)
+        accept_part = np.where(q < 1, g / (1 - q) * binom.cdf(k - 1, n + 1, q), 0.0)
+    return reject_part + accept_part
+
+def curtailed_distribution(n, r, p, case=1):
+    """
+    Distribución del número de unidades inspeccionadas M con inspección
+    truncada, para m = 1..n: P(M = m) separada en detención por rechazo y
+    por aceptación (dos pmf de la binomial negativa desplazadas).
+    """
+    k, flip = _oriented(n, r, case)
+    q = 1 - p if flip else p
+    g = n - k + 1
+    m = np.arange(1, n + 1)
+    # El k-ésimo defecto en el ensayo m: m - k ensayos sin defecto antes
+    reject = np.where(m >= k, nbinom.pmf(m - k, k, q), 0.0)
+    # La g-ésima unidad sin defecto en el ensayo m: m - g defectos antes
+    accept = np.where(m >= g, nbinom.pmf(m - g, g, 1 - q), 0.0)
+    return m, reject, accept
+
+def _percentile(m, pmf, level):
+    """Menor m con P(M ≤ m) ≥ level"""
+    return int(m[min(np.searchsorted(np.cumsum(pmf), level - 1e-12), len(m) - 1)])
+
+def show_curtailed_section(n, r, case, p0, p1):
+    """Análisis de la inspección truncada del plan (n, r)"""
+    k, _ = _oriented(n, r, case)
+    if not 1 <= k <= n:
+        return
+    with st.expander("✂️ Inspección truncada: unidades esperadas (ASN)"):
+        if case == 1:
+            st.markdown(
+                f"La inspección puede detenerse en cuanto se ven **{r:,} defectos** (se rechaza H₀) o "
+                f"**{n - r + 1:,} unidades sin defecto** (ya no se puede llegar a {r:,} defectos)."
+            )
+        else:
+            st.markdown(
+                f"La inspección puede detenerse en cuanto se ven **{n - r:,} unidades sin defecto** "
+                f"(se rechaza H₀) o **{r + 1:,} defectos** (ya no se puede rechazar)."
+            )
+        st.caption("La decisión es exactamente la del plan completo: α y β no cambian")
+
+        rows = []
+        frames = []
+        for label, p in (("p₀", p0), ("p₁", p1)):
+            asn = float(curtailed_asn(n, r, p, case))
+            m, reject, accept = curtailed_distribution(n, r, p, case)
+            pmf = reject + accept
+            rows.append({
+                "p": f"{label} = {p}",
+                "ASN": asn,
+                "Ahorro": f"{1 - asn / n:.1%}",
+                "P(detener por rechazo)": reject.sum(),
+                "Mediana": _percentile(m, pmf, 0.5),
+                "Percentil 95": _percentile(m, pmf, 0.95),
+            })
+            frames.append(pd.DataFrame({"m": m, "P(M ≤ m)": np.minimum(np.cumsum(pmf), 1.0),
+                                        "p": f"{label} = {p}"}))
+        st.dataframe(pd.DataFrame(rows), hide_index=True)
+
+        p = np.linspace(0, 1, _CURVE_POINTS + 2)[1:-1]
+        curve = pd.DataFrame({"p": p, "ASN": curtailed_asn(n, r, p, case)})
+        tab_asn, tab_dist = st.tabs(["ASN vs p", "Distribución de unidades inspeccionadas"])
+        with tab_asn:
+            line = alt.Chart(curve).mark_line().encode(
+                x=alt.X("p:Q", title="p"),
+                y=alt.Y("ASN:Q", title="Unidades inspeccionadas (media)"),
+                tooltip=[alt.Tooltip("p:Q", format=".4f"), alt.Tooltip("ASN:Q", format=",.1f")]
+            )
+            full = alt.Chart(pd.DataFrame({"n": [n]})).mark_rule(strokeDash=[4, 4]).encode(y="n:Q")
+            st.altair_chart((line + full).interactive(), width="stretch")
+        with tab_dist:
+            chart = alt.Chart(pd.concat(frames, ignore_index=True)).mark_line().encode(
+                x=alt.X("m:Q", title="Unidades inspeccionadas m"),
+                y=alt.Y("P(M ≤ m):Q", title="P(M ≤ m)"),
+                color=alt.Color("p:N"),
+                tooltip=["p", "m", alt.Tooltip("P(M ≤ m):Q", format=".4f")]
+            ).interactive()
+            st.altair_chart(chart, width="stretch")
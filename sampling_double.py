@@ -0,0 +1,456 @@
+import functools
+import math
+import time
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy.stats import binom
+from scipy.special import gammaln, xlogy, xlog1py
+
+from sampling_plan import certified_lower_bound, find_minimal_solution, oriented_proportions
+
+# Probabilidad despreciable usada para recortar las grillas de umbrales
+_TAIL_EPS = 1e-12
+
+# Valores de n₁ evaluados en la pasada gruesa que fija la primera cota de ASN
+_COARSE_STEPS = 48
+
+# Factores sobre las distancias de Wald (h_a, h_r) probados en planes múltiples
+_BOUNDARY_FACTORS = np.linspace(0.3, 1.2, 10)
+
+@functools.lru_cache(maxsize=512)
+def stage_tables(m, p):
+    """
+    Tablas (pmf, cdf) de Bin(m, p) para x = 0..m (pmf con log-gamma y cdf
+    como su suma acumulada, más rápido que binom.pmf/cdf en toda la grilla).
+
+    Se cachean por (m, p): todas las etapas y planes candidatos con el mismo
+    tamaño de etapa comparten las mismas tablas.
+    """
+    x = np.arange(m + 1)
+    log_pmf = gammaln(m + 1) - gammaln(x + 1) - gammaln(m - x + 1) + xlogy(x, p) + xlog1py(m - x, -p)
+    pmf = np.exp(log_pmf)
+    cdf = np.minimum(np.cumsum(pmf), 1.0)
+    pmf.setflags(write=False)
+    cdf.setflags(write=False)
+    return pmf, cdf
+
+def _cdf_at(cdf, k):
+    """F(k) leída de la tabla, con F(k) = 0 si k < 0 y F(k) = 1 si k ≥ m"""
+    k = np.asarray(k)
+    return np.where(k < 0, 0.0, cdf[np.clip(k, 0, len(cdf) - 1)])
+
+def _flip(sizes, acceptance, rejection):
+    """Umbrales sobre los fracasos acumulados ↔ umbrales sobre los éxitos acumulados"""
+    cumulative = np.cumsum(sizes)
+    return cumulative - np.asarray(acceptance), cumulative - np.asarray(rejection)
+
+def _stage_probabilities(sizes, acceptance, rejection, p):
+    """
+    P(no rechazar H₀) y ASN de un plan por etapas orientado como el caso 1:
+    en la etapa j se no rechaza H₀ si el acumulado D_j ≤ acceptance[j], se
+    rechaza si D_j ≥ rejection[j] y en otro caso se toma la etapa siguiente.
+
+    Programación dinámica sobre la distribución de D_j restringida a la
+    banda de continuación, con las tablas cacheadas de cada etapa.
+    """
+    values, weights = np.zeros(1, dtype=np.int64), np.ones(1)
+    accept, asn, n_cum = 0.0, 0.0, 0
+    for m, ac, re in zip(sizes, acceptance, rejection):
+        if len(values) == 0:
+            break
+        pmf, cdf = stage_tables(int(m), p)
+        n_cum += m
+        asn += m * weights.sum()
+        accept += weights @ _cdf_at(cdf, ac - values)
+        cont = np.arange(max(ac + 1, 0), min(re, n_cum + 1))
+        diff = cont[:, None] - values[None, :]
+        inside = (diff >= 0) & (diff <= m)
+        weights = np.where(inside, pmf[np.clip(diff, 0, m)], 0.0) @ weights
+        values = cont
+    return float(accept), float(asn)
+
+def plan_characteristics(plan, p):
+    """
+    (P(no rechazar H₀ | p), ASN(p)) de un plan doble o múltiple.
+
+    `plan` es un dict con "case", "sizes" (tamaño de cada etapa),
+    "acceptance" y "rejection" (umbrales sobre los éxitos acumulados):
+    - Caso 1: no se rechaza H₀ si X ≤ acceptance[j]; se rechaza si X ≥ rejection[j]
+    - Caso 2: no se rechaza H₀ si X ≥ acceptance[j]; se rechaza si X ≤ rejection[j]
+    """
+    sizes, acceptance, rejection = plan["sizes"], plan["acceptance"], plan["rejection"]
+    if plan["case"] == 2:
+        acceptance, rejection = _flip(sizes, acceptance, rejection)
+        p = 1 - p
+    return _stage_probabilities(sizes, acceptance, rejection, p)
+
+def _make_plan(case, sizes, acceptance, rejection, q0, q1):
+    """Plan en la orientación del caso pedido, verificado con la programación dinámica"""
+    accept0, asn0 = _stage_probabilities(sizes, acceptance, rejection, q0)
+    accept1, asn1 = _stage_probabilities(sizes, acceptance, rejection, q1)
+    if case == 2:
+        acceptance, rejection = _flip(sizes, acceptance, rejection)
+    return {
+        "case": case,
+        "sizes": [int(m) for m in sizes],
+        "acceptance": [int(a) for a in acceptance],
+        "rejection": [int(r) for r in rejection],
+        "alpha_real": 1 - accept0,
+        "beta_real": accept1,
+        "asn_p0": asn0,
+        "asn_p1": asn1,
+    }
+
+def _asn_lower_bounds(n1s, n2s, q0, alpha, q1, beta):
+    """
+    Cota inferior de max(ASN(p₀), ASN(p₁)) de todo plan doble factible con
+    primera etapa n₁, vectorizada sobre n₁.
+
+    La aceptación en la primera etapa {X₁ ≤ c₁} cumple P₁(X₁ ≤ c₁) ≤ β, así que
+    P₀(X₁ ≤ c₁) no supera a la del test UMP (acotada con un umbral más);
+    igual para el rechazo. Lo que no se decide en la etapa 1 paga n₂.
+    """
+    c_star = binom.ppf(beta, n1s, q1)
+    accept0_max = binom.cdf(c_star + 1, n1s, q0)
+    r_star = binom.isf(alpha, n1s, q0)
+    reject1_max = binom.sf(r_star - 2, n1s, q1)
+    continue0 = np.clip(1 - alpha - accept0_max, 0, 1)
+    continue1 = np.clip(1 - beta - reject1_max, 0, 1)
+    return n1s + n2s * np.maximum(continue0, continue1)
+
+def _best_double_plan(n1, n2, q0, alpha, q1, beta, bound, stats):
+    """
+    Mejor plan doble (c₁, r₁, c₂) para n₁ y n₂ fijos con ASN menor que
+    `bound`, o None.
+
+    Se podan antes de evaluar:
+    - c₁ con P₁(X₁ ≤ c₁) > β y r₁ con P₀(X₁ ≥ r₁) > α (ya violan un riesgo);
+    - pares (c₁, r₁) cuyo ASN ya alcanza `bound`;
+    - para cada (c₁, c₂), todo r₁ salvo el menor que cumple α: α baja y β y
+      el ASN suben con r₁, así que los demás quedan dominados.
+    El menor r₁ se obtiene para todos los pares (c₁, c₂) con una única
+    búsqueda binaria sobre sumas acumuladas de pmf₁(d)·F₂(c₂ - d).
+    """
+    pmf1_0, cdf1_0 = stage_tables(n1, q0)
+    pmf1_1, cdf1_1 = stage_tables(n1, q1)
+    c1_max = int(np.searchsorted(cdf1_1, beta, side="right")) - 1
+    r1_min = int(np.searchsorted(cdf1_0, 1 - alpha)) + 1
+    c1 = np.arange(max(int(binom.ppf(_TAIL_EPS, n1, q0)), 0), c1_max + 1)
+    if len(c1) == 0 or r1_min > n1:
+        return None
+
+    # r₁ más chico y más grande con ASN < bound para cada c₁
+    r1_low = np.maximum(c1 + 2, r1_min)
+    slack = (bound - n1) / n2
+    r1_high = np.minimum.reduce([
+        np.searchsorted(cdf1_0, cdf1_0[c1] + slack),
+        np.searchsorted(cdf1_1, cdf1_1[c1] + slack),
+        np.full(len(c1), n1 + 1),
+    ])
+    keep = r1_low <= r1_high
+    c1, r1_low, r1_high = c1[keep], r1_low[keep], r1_high[keep]
+    if len(c1) == 0:
+        return None
+
+    lo, hi = int(c1[0]), int(r1_high.max()) - 1
+    d = np.arange(lo, hi + 1)
+    lo2 = max(r1_min - 1, int(binom.ppf(_TAIL_EPS, n1 + n2, q0)))
+    hi2 = min(n1 + n2, int(binom.isf(_TAIL_EPS, n1 + n2, q1)) + 1)
+    c2 = np.arange(lo2, hi2 + 1)
+    if len(c2) == 0:
+        return None
+    stats['celdas'] += len(d) * len(c2)
+
+    partials = []
+    for q, pmf1 in ((q0, pmf1_0), (q1, pmf1_1)):
+        _, cdf2 = stage_tables(n2, q)
+        # S[j, c₂] = Σ_{lo ≤ d < lo + j} pmf₁(d)·F₂(c₂ - d)
+        terms = pmf1[d][:, None] * _cdf_at(cdf2, c2[None, :] - d[:, None])
+        partials.append(np.vstack([np.zeros(len(c2)), np.cumsum(terms, axis=0)]))
+    partial0, partial1 = partials
+
+    # Menor j (r₁ = lo + j) con P₀(no rechazar) ≥ 1 - α para cada (c₁, c₂);
+    # cada columna se desplaza en 2 para resolver todas en un searchsorted
+    rows = c1 - lo
+    columns = np.arange(len(c2))
+    offsets = 2.0 * columns
+    target = 1 - alpha - cdf1_0[c1][:, None] + partial0[rows + 1, :]
+    flat = (partial0 + offsets).T.ravel()
+    pos = np.searchsorted(flat, (target + offsets).T.ravel()).reshape(len(c2), len(c1)).T
+    j = np.maximum(pos - columns * (len(d) + 1), (r1_low - lo)[:, None])
+
+    valid = (c2[None, :] > c1[:, None]) & (j <= np.minimum(r1_high[:, None], c2[None, :] + 1) - lo)
+    if not valid.any():
+        return None
+    i_idx, col_idx = np.nonzero(valid)
+    j = j[i_idx, col_idx]
+    beta_real = cdf1_1[c1[i_idx]] + partial1[j, col_idx] - partial1[rows[i_idx] + 1, col_idx]
+    feasible = beta_real <= beta
+    if not feasible.any():
+        return None
+    i_idx, col_idx, j = i_idx[feasible], col_idx[feasible], j[feasible]
+
+    # ASN(p) = n₁ + n₂·P(c₁ < X₁ < r₁)
+    best_c1, best_r1 = c1[i_idx], lo + j
+    asn0 = n1 + n2 * (cdf1_0[best_r1 - 1] - cdf1_0[best_c1])
+    asn1 = n1 + n2 * (cdf1_1[best_r1 - 1] - cdf1_1[best_c1])
+    objective = np.maximum(asn0, asn1)
+    best = np.argmin(objective)
+    return float(objective[best]), int(best_c1[best]), int(best_r1[best]), int(c2[col_idx[best]])
+
+def find_double_plan(p0, alpha, p1, beta, case=1, ratios=(1, 2), progress_callback=None, stats=None):
+    """
+    Plan doble (n₁, c₁, r₁, n₂, c₂) que minimiza max(ASN(p₀), ASN(p₁)) con
+    α_real ≤ α y β_real ≤ β, con n₂ = k·n₁ para cada k de `ratios`.
+
+    - n₁ va desde la cota certificada del plan simple dividida por (1 + k)
+      (un plan con n₁ + n₂ observaciones no supera al test UMP de ese tamaño)
+      hasta que n₁ alcanza el mejor ASN encontrado.
+    - Los n₁ cuya cota inferior de ASN (_asn_lower_bounds) no mejora al mejor
+      plan se descartan sin evaluar; una pasada gruesa fija pronto esa cota.
+    - Para cada n₁ se evalúan a la vez todos los (c₁, c₂), con r₁ mínimo.
+
+    Retorna un dict como el de plan_characteristics, más "n_simple" (n del
+    plan simple mínimo), o None si ningún plan doble mejora al simple.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(n1_evaluados=0, n1_podados=0, celdas=0)
+    q0, q1 = oriented_proportions(p0, p1, case)
+    single = find_minimal_solution(p0, alpha, p1, beta, case)
+    if single is None:
+        return None
+    n_single = single[0]
+    n_lb = certified_lower_bound(p0, alpha, p1, beta, case)
+
+    best = (n_single, None)
+    for index, ratio in enumerate(ratios):
+        n1s = np.arange(max(1, math.ceil(n_lb / (1 + ratio))), n_single)
+        if len(n1s) == 0:
+            continue
+        bounds = _asn_lower_bounds(n1s, ratio * n1s, q0, alpha, q1, beta)
+        coarse = n1s[::max(1, len(n1s) // _COARSE_STEPS)]
+        for phase in (coarse, n1s):
+            for n1 in phase:
+                if n1 >= best[0]:
+                    break
+                if bounds[n1 - n1s[0]] >= best[0]:
+                    stats['n1_podados'] += 1
+                    continue
+                stats['n1_evaluados'] += 1
+                candidate = _best_double_plan(int(n1), int(ratio * n1), q0, alpha, q1, beta, best[0], stats)
+                if candidate and candidate[0] < best[0]:
+                    best = (candidate[0], (int(n1), int(ratio * n1)) + candidate[1:])
+        if progress_callback:
+            progress_callback(int(100 * (index + 1) / len(ratios)))
+
+    if best[1] is None:
+        return None
+    n1, n2, c1, r1, c2 = best[1]
+    plan = _make_plan(case, [n1, n2], [c1, c2], [r1, c2 + 1], q0, q1)
+    plan["n_simple"] = n_single
+    return plan
+
+def _wald_boundaries(m, stages, slope, h_accept, h_reject):
+    """Umbrales sobre rectas paralelas de pendiente s; la última etapa siempre decide"""
+    cumulative = m * np.arange(1, stages + 1)
+    acceptance = np.floor(slope * cumulative - h_accept).astype(np.int64)
+    rejection = np.ceil(slope * cumulative + h_reject).astype(np.int64)
+    rejection = np.maximum(rejection, acceptance + 1)
+    acceptance[-1] = math.floor(slope * cumulative[-1] + (h_reject - h_accept) / 2)
+    rejection[-1] = acceptance[-1] + 1
+    return acceptance, rejection
+
+def find_multiple_plan(p0, alpha, p1, beta, case=1, stages=7, progress_callback=None, stats=None):
+    """
+    Plan múltiple de `stages` etapas iguales de tamaño m que minimiza
+    max(ASN(p₀), ASN(p₁)) dentro de la familia de umbrales de Wald: rectas
+    paralelas de pendiente s y distancias h_a, h_r escaladas desde las del
+    SPRT, con decisión forzada en la última etapa.
+
+    Para cada par (h_a, h_r) se busca el menor m factible por bisección, con
+    m ≥ n_mínimo / etapas (cota certificada del plan simple) y m menor que el
+    mejor ASN encontrado (el ASN nunca es menor que m).
+    """
+    if stats is None:
+        stats = {}
+    stats.update(evaluaciones_pd=0, pares_h=0)
+    q0, q1 = oriented_proportions(p0, p1, case)
+    single = find_minimal_solution(p0, alpha, p1, beta, case)
+    if single is None:
+        return None
+    n_single = single[0]
+    n_lb = certified_lower_bound(p0, alpha, p1, beta, case)
+
+    log_ratio = math.log(q1 * (1 - q0) / (q0 * (1 - q1)))
+    slope = math.log((1 - q0) / (1 - q1)) / log_ratio
+    h_accept = math.log((1 - alpha) / beta) / log_ratio
+    h_reject = math.log((1 - beta) / alpha) / log_ratio
+
+    def evaluate(m, f_accept, f_reject):
+        acceptance, rejection = _wald_boundaries(m, stages, slope, f_accept * h_accept, f_reject * h_reject)
+        sizes = [m] * stages
+        accept0, asn0 = _stage_probabilities(sizes, acceptance, rejection, q0)
+        accept1, asn1 = _stage_probabilities(sizes, acceptance, rejection, q1)
+        stats['evaluaciones_pd'] += 2
+        feasible = 1 - accept0 <= alpha and accept1 <= beta
+        return feasible, max(asn0, asn1), acceptance, rejection
+
+    m_lo = max(1, math.ceil(n_lb / stages))
+    best = (n_single, None)
+    pairs = [(fa, fr) for fa in _BOUNDARY_FACTORS for fr in _BOUNDARY_FACTORS]
+    for index, (f_accept, f_reject) in enumerate(pairs):
+        stats['pares_h'] += 1
+        m_hi = min(n_single, math.ceil(best[0]))
+        if m_lo >= m_hi or not evaluate(m_hi, f_accept, f_reject)[0]:
+            continue
+        lo, hi = m_lo - 1, m_hi
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if evaluate(mid, f_accept, f_reject)[0]:
+                hi = mid
+            else:
+                lo = mid
+        feasible, objective, acceptance, rejection = evaluate(hi, f_accept, f_reject)
+        if objective < best[0]:
+            best = (objective, (hi, acceptance, rejection))
+        if progress_callback:
+            progress_callback(int(100 * (index + 1) / len(pairs)))
+
+    if best[1] is None:
+        return None
+    m, acceptance, rejection = best[1]
+    plan = _make_plan(case, [m] * stages, acceptance, rejection, q0, q1)
+    plan["n_simple"] = n_single
+    return plan
+
+def plan_curves(plan, p):
+    """Curvas OC (P(no rechazar H₀)) y ASN del plan sobre los valores de p"""
+    rows = [plan_characteristics(plan, float(value)) for value in p]
+    accept, asn = map(np.array, zip(*rows))
+    return pd.DataFrame({"p": p, "Pa": accept, "ASN": asn})
+
+def _stage_table(plan):
+    """Tabla de etapas con la regla de decisión sobre los éxitos acumulados"""
+    le, ge = ("≤", "≥") if plan["case"] == 1 else ("≥", "≤")
+    rows = []
+    for j, (m, ac, re) in enumerate(zip(plan["sizes"], plan["acceptance"], plan["rejection"]), start=1):
+        cumulative = sum(plan["sizes"][:j])
+        rows.append({
+            "Etapa": j,
+            "n etapa": m,
+            "n acumulado": cumulative,
+            "No rechazar H₀ si X acumulado": f"{le} {ac}" if 0 <= ac <= cumulative else "—",
+            "Rechazar H₀ si X acumulado": f"{ge} {re}" if 0 <= re <= cumulative else "—",
+        })
+    return pd.DataFrame(rows)
+
+def show_double_sampling():
+    st.title("🧩 Muestreo Doble, Múltiple y Secuencial - Procesos de Bernoulli")
+    st.markdown("""
+    Planes por etapas con los mismos riesgos α y β que el plan simple, pero que
+    deciden antes cuando la muestra es clara. Se minimiza el **tamaño medio de
+    muestra (ASN)** en el peor de p₀ y p₁.
+    """)
+
+    case = st.radio(
+        "Seleccione el tipo de prueba de hipótesis:",
+        options=[1, 2],
+        format_func=lambda x: f"Caso {x}: H₀: p {'≤' if x == 1 else '≥'} p₀  vs  H₁: p {'>' if x == 1 else '<'} p₀",
+        horizontal=True
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        p0 = st.number_input("p₀ (Probabilidad bajo H₀)", min_value=0.0001, max_value=0.9999,
+                             value=0.05, step=0.01, format="%.4f")
+        p1 = st.number_input("p₁ (Probabilidad bajo H₁)", min_value=0.0001, max_value=0.9999,
+                             value=0.08 if case == 1 else 0.03, step=0.01, format="%.4f")
+    with col2:
+        alpha = st.number_input("α (Nivel de significancia)", min_value=0.0001, max_value=0.9999,
+                                value=0.05, step=0.01, format="%.4f")
+        beta = st.number_input("β (Error tipo II)", min_value=0.0001, max_value=0.9999,
+                               value=0.10, step=0.01, format="%.4f")
+
+    if case == 1 and p1 <= p0:
+        st.error("⚠️ Para el Caso 1, p₁ debe ser mayor que p₀")
+        return
+    if case == 2 and p1 >= p0:
+        st.error("⚠️ Para el Caso 2, p₁ debe ser menor que p₀")
+        return
+
+    plan_type = st.radio("Tipo de plan:", ["Doble", "Múltiple", "Secuencial (SPRT)"], horizontal=True)
+    if plan_type == "Secuencial (SPRT)":
+        from sampling_sprt import show_sprt_section
+        show_sprt_section(case, p0, p1, alpha, beta)
+        return
+    if plan_type == "Doble":
+        ratios = st.multiselect("Tamaño de la segunda etapa:", options=[1, 2], default=[1, 2],
+                                format_func=lambda k: "n₂ = n₁" if k == 1 else f"n₂ = {k}·n₁")
+        options = tuple(ratios)
+    else:
+        stages = st.slider("Cantidad de etapas:", min_value=3, max_value=10, value=7)
+        options = stages
+
+    inputs = (case, p0, p1, alpha, beta, plan_type, options)
+    if st.button("Diseñar plan", type="primary", disabled=plan_type == "Doble" and not options):
+        progress_bar = st.progress(0)
+        stats = {}
+        start = time.perf_counter()
+        if plan_type == "Doble":
+            plan = find_double_plan(p0, alpha, p1, beta, case, options, progress_bar.progress, stats)
+        else:
+            plan = find_multiple_plan(p0, alpha, p1, beta, case, options, progress_bar.progress, stats)
+        elapsed = time.perf_counter() - start
+        progress_bar.empty()
+        st.session_state.double_result = {"inputs": inputs, "plan": plan, "stats": stats, "elapsed": elapsed}
+
+    stored = st.session_state.get("double_result")
+    if not stored or stored["inputs"] != inputs:
+        return
+    plan = stored["plan"]
+    st.caption(f"Búsqueda: {stored['elapsed']:.2f} s · " + " · ".join(
+        f"{key.replace('_', ' ')}: {value:,}" for key, value in stored["stats"].items()))
+    if plan is None:
+        st.warning("Ningún plan de este tipo mejora el ASN del plan simple de n mínimo")
+        return
+
+    st.markdown("## 🎯 Plan Encontrado")
+    worst_asn = max(plan["asn_p0"], plan["asn_p1"])
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("ASN(p₀)", f"{plan['asn_p0']:,.1f}")
+    with col2:
+        st.metric("ASN(p₁)", f"{plan['asn_p1']:,.1f}")
+    with col3:
+        st.metric("n del plan simple", f"{plan['n_simple']:,}",
+                  delta=f"{worst_asn / plan['n_simple'] - 1:.1%} ASN", delta_color="inverse")
+    st.dataframe(_stage_table(plan), hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        check = "✅" if plan["alpha_real"] <= alpha else "❌"
+        st.write(f"{check} α_real = {plan['alpha_real']:.10f} ≤ {alpha}")
+    with col2:
+        check = "✅" if plan["beta_real"] <= beta else "❌"
+        st.write(f"{check} β_real = {plan['beta_real']:.10f} ≤ {beta}")
+
+    p_max = min(1.0, 2 * max(p0, p1))
+    curves = plan_curves(plan, np.linspace(0, p_max, 201))
+    tab_oc, tab_asn = st.tabs(["OC", "ASN"])
+    with tab_oc:
+        chart = alt.Chart(curves).mark_line().encode(
+            x=alt.X("p:Q", title="p"), y=alt.Y("Pa:Q", title="P(no rechazar H₀ | p)"),
+            tooltip=[alt.Tooltip("p:Q", format=".4f"), alt.Tooltip("Pa:Q", format=".6f")]
+        ).interactive()
+        st.altair_chart(chart, width="stretch")
+    with tab_asn:
+        chart = alt.Chart(curves).mark_line().encode(
+            x=alt.X("p:Q", title="p"), y=alt.Y("ASN:Q", title="Tamaño medio de muestra"),
+            tooltip=[alt.Tooltip("p:Q", format=".4f"), alt.Tooltip("ASN:Q", format=",.1f")]
+        ).interactive()
+        rule = alt.Chart(pd.DataFrame({"n": [plan["n_simple"]]})).mark_rule(strokeDash=[4, 4]).encode(y="n:Q")
+        st.altair_chart(chart + rule, width="stretch")
+        st.caption("La línea punteada es el n del plan simple de n mínimo")
@@ -0,0 +1,261 @@
+import functools
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy.special import gammaln
+from scipy.stats import hypergeom
+
+from sampling_plan import find_minimal_solution
+
+# Valores de n evaluados juntos en cada grilla (n × x)
+_BLOCK_ROWS = 64
+
+@functools.lru_cache(maxsize=16)
+def log_factorial_table(N):
+    """
+    Tabla log(k!) para k = 0..N, calculada una sola vez por tamaño de lote.
+
+    Con ella cada pmf hipergeométrica es una combinación de seis lecturas de
+    la tabla, sin volver a evaluar funciones especiales.
+    """
+    table = gammaln(np.arange(N + 1) + 1.0)
+    table.setflags(write=False)
+    return table
+
+def _log_comb(table, a, b):
+    """log C(a, b) leído de la tabla (b fuera de 0..a se recorta; se enmascara aparte)"""
+    b = np.clip(b, 0, a)
+    return table[a] - table[b] - table[a - b]
+
+def hypergeom_tables(N, D, ns, width):
+    """
+    CDF P(X ≤ x) y cola superior P(X ≥ x) de la hipergeométrica (lote N con D
+    defectuosos, muestra n sin reemplazo) para cada n de `ns` (filas) y
+    x = 0..width-1 (columnas).
+
+    La pmf sale de la tabla de log-factoriales y las dos colas de sus sumas
+    acumuladas en ambos sentidos (la cola superior no pierde precisión por
+    restar de 1), así cada probabilidad de error de la búsqueda es una
+    lectura O(1).
+    """
+    table = log_factorial_table(N)
+    ns = np.asarray(ns, dtype=np.int64)[:, None]
+    x = np.arange(width)[None, :]
+    support = (x <= np.minimum(ns, D)) & (ns - x <= N - D)
+    log_pmf = (_log_comb(table, D, x) + _log_comb(table, N - D, np.clip(ns - x, 0, N - D))
+               - _log_comb(table, N, ns))
+    # Fuera del soporte los log C(·) recortados no significan nada: se anulan antes de exponenciar
+    pmf = np.exp(np.where(support, log_pmf, -np.inf))
+    cdf = np.minimum(np.cumsum(pmf, axis=1), 1.0)
+    sf = np.minimum(np.cumsum(pmf[:, ::-1], axis=1)[:, ::-1], 1.0)
+    return cdf, sf
+
+def error_probabilities_hypergeom(N, n, r, D0, D1, case=1):
+    """
+    Probabilidades de error (α_real, β_real) del plan (n, r) en un lote de N
+    unidades, con las mismas reglas que el plan binomial:
+
+    Caso 1 (D₁ > D₀): α = P(X ≥ r | D₀), β = P(X ≤ r-1 | D₁)
+    Caso 2 (D₁ < D₀): α = P(X ≤ r | D₀), β = P(X ≥ r+1 | D₁)
+    """
+    width = n + 2
+    cdf0, sf0 = hypergeom_tables(N, D0, [n], width)
+    cdf1, sf1 = hypergeom_tables(N, D1, [n], width)
+    r = np.clip(np.asarray(r), -1, n + 1)
+    if case == 1:
+        return sf0[0, np.maximum(r, 0)], np.where(r >= 1, cdf1[0, r - 1], 0.0)
+    return np.where(r >= 0, cdf0[0, r], 0.0), sf1[0, np.minimum(r + 1, n + 1)]
+
+def find_hypergeom_plan(N, D0, alpha, D1, beta, case=1, stats=None):
+    """
+    Plan (n, r) de menor n para un lote finito de N unidades, con D₀
+    defectuosos bajo H₀ y D₁ bajo H₁.
+
+    Recorre n = 1..N por bloques de filas. En cada bloque las colas de D₀ y
+    D₁ se construyen de una vez con hypergeom_tables y el intervalo de r
+    factibles de cada n se obtiene contando celdas (α_real y β_real son
+    monótonos en r). La factibilidad no es monótona en n, así que el primer
+    n con algún r factible es el mínimo exacto. En ese n, r se elige con el
+    mismo criterio que el plan binomial (α_real y β_real lo más cerca posible
+    de los límites).
+
+    En `stats` se informan los n evaluados y las lecturas de colas.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(n_evaluados=0, consultas_cola=0)
+    # Las colas son nulas pasado el mayor número de defectuosos posible
+    width = max(D0, D1) + 2
+    for start in range(1, N + 1, _BLOCK_ROWS):
+        ns = np.arange(start, min(start + _BLOCK_ROWS, N + 1))
+        cdf0, sf0 = hypergeom_tables(N, D0, ns, width)
+        cdf1, sf1 = hypergeom_tables(N, D1, ns, width)
+        stats['consultas_cola'] += 2 * cdf0.size
+        if case == 1:
+            # α(r) = P(X ≥ r | D₀) baja con r; β(r) = P(X ≤ r-1 | D₁) sube con r
+            r_lo = (sf0 > alpha).sum(axis=1)
+            r_hi = (cdf1 <= beta).sum(axis=1)
+        else:
+            # α(r) = P(X ≤ r | D₀) sube con r; β(r) = P(X ≥ r+1 | D₁) baja con r
+            r_hi = (cdf0 <= alpha).sum(axis=1) - 1
+            r_lo = np.maximum((sf1 > beta).sum(axis=1) - 1, 0)
+        feasible = np.flatnonzero(r_lo <= r_hi)
+        if feasible.size == 0:
+            stats['n_evaluados'] += len(ns)
+            continue
+
+        row = feasible[0]
+        stats['n_evaluados'] += row + 1
+        n = int(ns[row])
+        rs = np.arange(r_lo[row], r_hi[row] + 1)
+        prob_type1, prob_type2 = error_probabilities_hypergeom(N, n, rs, D0, D1, case)
+        best = int(np.argmin((alpha - prob_type1)**2 + (beta - prob_type2)**2))
+        return n, int(rs[best]), float(prob_type1[best]), float(prob_type2[best])
+    return None
+
+def _scipy_reference_plan(N, D0, alpha, D1, beta, case=1):
+    """
+    La misma búsqueda que find_hypergeom_plan, pero evaluando las colas de
+    cada n con scipy.stats.hypergeom (usada como referencia de rendimiento).
+    """
+    for n in range(1, N + 1):
+        x = np.arange(min(n, max(D0, D1)) + 2)
+        if case == 1:
+            prob_type1 = hypergeom.sf(x - 1, N, D0, n)
+            prob_type2 = hypergeom.cdf(x - 1, N, D1, n)
+        else:
+            prob_type1 = hypergeom.cdf(x, N, D0, n)
+            prob_type2 = hypergeom.sf(x, N, D1, n)
+        valid = (prob_type1 <= alpha) & (prob_type2 <= beta)
+        if valid.any():
+            rs = np.flatnonzero(valid)
+            best = int(np.argmin((alpha - prob_type1[rs])**2 + (beta - prob_type2[rs])**2))
+            return n, int(rs[best]), float(prob_type1[rs[best]]), float(prob_type2[rs[best]])
+    return None
+
+def benchmark_against_scipy(N, D0, alpha, D1, beta, case=1):
+    """
+    Compara find_hypergeom_plan con la búsqueda equivalente sobre
+    scipy.stats.hypergeom: tiempos de ambas y si llegan al mismo plan.
+    """
+    log_factorial_table.cache_clear()
+    start = time.perf_counter()
+    plan = find_hypergeom_plan(N, D0, alpha, D1, beta, case)
+    table_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    reference = _scipy_reference_plan(N, D0, alpha, D1, beta, case)
+    scipy_seconds = time.perf_counter() - start
+    same_plan = (plan is None and reference is None) or (
+        plan is not None and reference is not None and plan[:2] == reference[:2])
+    return {
+        "plan": plan,
+        "plan_scipy": reference,
+        "mismo_plan": same_plan,
+        "segundos_tablas": table_seconds,
+        "segundos_scipy": scipy_seconds,
+    }
+
+def show_hypergeom_plan():
+    st.title("🏭 Plan de Muestreo - Lote Finito (Hipergeométrica)")
+    st.markdown("""
+    Para lotes pequeños (cientos o pocos miles de unidades) la muestra se toma
+    **sin reemplazo** y el número de defectuosos en la muestra sigue una
+    distribución **hipergeométrica**. El modelo binomial sobreestima el tamaño
+    de muestra necesario cuando n es una fracción apreciable del lote.
+    """)
+
+    case = st.radio(
+        "Seleccione el tipo de prueba de hipótesis:",
+        options=[1, 2],
+        format_func=lambda x: f"Caso {x}: H₀: D {'≤' if x == 1 else '≥'} D₀  vs  H₁: D {'>' if x == 1 else '<'} D₀",
+        horizontal=True
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        lot_size = st.number_input("Tamaño del lote (N)", min_value=2, max_value=200000, value=1000, step=100)
+        d0 = st.number_input("D₀ (defectuosos en el lote bajo H₀)", min_value=0, max_value=int(lot_size),
+                             value=min(20, int(lot_size)), step=1)
+        d1 = st.number_input("D₁ (defectuosos en el lote bajo H₁)", min_value=0, max_value=int(lot_size),
+                             value=min(60 if case == 1 else 5, int(lot_size)), step=1)
+    with col2:
+        alpha = st.number_input("α (Nivel de significancia)", min_value=0.0001, max_value=0.9999,
+                                value=0.05, step=0.01, format="%.4f")
+        beta = st.number_input("β (Error tipo II)", min_value=0.0001, max_value=0.9999,
+                               value=0.10, step=0.01, format="%.4f")
+
+    if case == 1 and d1 <= d0:
+        st.error("⚠️ Para el Caso 1, D₁ debe ser mayor que D₀")
+        return
+    if case == 2 and d1 >= d0:
+        st.error("⚠️ Para el Caso 2, D₁ debe ser menor que D₀")
+        return
+    st.caption(f"Proporciones equivalentes: p₀ = {d0 / lot_size:.4f}, p₁ = {d1 / lot_size:.4f}")
+    compare = st.checkbox("Comparar el tiempo con scipy.stats.hypergeom", value=False)
+
+    inputs = (case, lot_size, d0, d1, alpha, beta, compare)
+    if st.button("Calcular Plan de Muestreo", type="primary"):
+        stats = {}
+        with st.spinner("Buscando el menor n..."):
+            start = time.perf_counter()
+            plan = find_hypergeom_plan(int(lot_size), int(d0), alpha, int(d1), beta, case, stats)
+            elapsed = time.perf_counter() - start
+            binomial = find_minimal_solution(d0 / lot_size, alpha, d1 / lot_size, beta, case)
+            benchmark = None
+            if compare:
+                benchmark = benchmark_against_scipy(int(lot_size), int(d0), alpha, int(d1), beta, case)
+        st.session_state.hypergeom_result = {
+            "inputs": inputs, "plan": plan, "binomial": binomial,
+            "stats": stats, "elapsed": elapsed, "benchmark": benchmark,
+        }
+
+    stored = st.session_state.get("hypergeom_result")
+    if not stored or stored["inputs"] != inputs:
+        return
+    plan, binomial, stats = stored["plan"], stored["binomial"], stored["stats"]
+    st.caption(f"{stats['n_evaluados']:,} valores de n y {stats['consultas_cola']:,} lecturas de colas "
+               f"en {stored['elapsed']:.3f} s")
+    if plan is None:
+        st.error("❌ Ningún tamaño de muestra cumple α y β en este lote")
+        return
+
+    n, r, actual_alpha, actual_beta = plan
+    st.markdown("## 🎯 Plan de Muestreo Óptimo (Lote Finito)")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("📏 Tamaño de muestra (n)", f"{n:,}")
+    with col2:
+        st.metric("🎯 r crítico", f"{r:,}")
+    with col3:
+        st.metric("α real", f"{actual_alpha:.6f}", delta=f"Objetivo: {alpha}", delta_color="off")
+    with col4:
+        st.metric("β real", f"{actual_beta:.6f}", delta=f"Objetivo: {beta}", delta_color="off")
+    if case == 1:
+        st.success(f"✅ Inspeccionar {n:,} unidades del lote de {lot_size:,}: si se encuentran {r:,} o más "
+                   f"defectuosas → Rechazar H₀ (el lote tiene más de {d0:,} defectuosas)")
+    else:
+        st.success(f"✅ Inspeccionar {n:,} unidades del lote de {lot_size:,}: si se encuentran {r:,} o menos "
+                   f"defectuosas → Rechazar H₀ (el lote tiene menos de {d0:,} defectuosas)")
+
+    if binomial:
+        saving = binomial[0] - n
+        st.markdown("### Comparación con el modelo binomial")
+        st.dataframe(pd.DataFrame([
+            {"Modelo": "Hipergeométrico (lote finito)", "n": n, "r": r,
+             "α real": actual_alpha, "β real": actual_beta},
+            {"Modelo": "Binomial (p₀ = D₀/N, p₁ = D₁/N)", "n": binomial[0], "r": binomial[1],
+             "α real": binomial[2], "β real": binomial[3]},
+        ]), hide_index=True)
+        if saving > 0:
+            st.info(f"El modelo de lote finito ahorra {saving:,} unidades ({saving / binomial[0]:.1%} de la muestra binomial)")
+
+    benchmark = stored["benchmark"]
+    if benchmark:
+        st.markdown("### Rendimiento frente a scipy.stats.hypergeom")
+        speedup = benchmark["segundos_scipy"] / max(benchmark["segundos_tablas"], 1e-9)
+        st.caption(
+            f"Tablas de log-factoriales: {benchmark['segundos_tablas']:.3f} s · "
+            f"scipy.stats.hypergeom: {benchmark['segundos_scipy']:.3f} s · {speedup:,.1f}× más rápido · "
+            + ("mismo plan ✓" if benchmark["mismo_plan"] else f"plan de scipy: {benchmark['plan_scipy']}")
+        )
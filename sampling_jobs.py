@@ -0,0 +1,59 @@
+import threading
+
+class SearchCancelled(Exception):
+    """La búsqueda se canceló antes de terminar"""
+
+def start_job(inputs, search, **context):
+    """
+    Ejecuta `search` en un hilo de fondo y retorna el diccionario del trabajo.
+
+    `search(progress_callback, improvement_callback, stats)` recibe:
+    - progress_callback(valor): informa el avance (0-100) y, si el trabajo
+      fue cancelado, lanza SearchCancelled para cortar la búsqueda en el acto.
+    - improvement_callback(plan): informa el mejor plan encontrado hasta ahora.
+    - stats: diccionario de estadísticas que la página puede leer en vivo.
+
+    El hilo nunca llama a Streamlit: sólo escribe en el diccionario, que la
+    página consulta periódicamente. `inputs` identifica los parámetros de la
+    búsqueda y `context` guarda datos que la página necesita al terminar.
+    """
+    job = {
+        "inputs": inputs,
+        "context": context,
+        "cancel": threading.Event(),
+        "progress": 0,
+        "best": None,
+        "stats": {},
+        "result": None,
+        "error": None,
+        "done": False,
+    }
+
+    def progress_callback(value):
+        if job["cancel"].is_set():
+            raise SearchCancelled()
+        job["progress"] = value
+
+    def improvement_callback(plan):
+        job["best"] = plan
+
+    def run():
+        try:
+            job["result"] = search(progress_callback, improvement_callback, job["stats"])
+        except SearchCancelled:
+            pass
+        except Exception as exc:
+            job["error"] = exc
+        finally:
+            job["done"] = True
+
+    job["thread"] = threading.Thread(target=run, name="busqueda-plan", daemon=True)
+    job["thread"].start()
+    return job
+
+def cancel_job(job):
+    """
+    Marca el trabajo como cancelado. El hilo se detiene en su próximo aviso
+    de progreso; la página puede descartar el trabajo sin esperarlo.
+    """
+    job["cancel"].set()
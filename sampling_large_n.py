@@ -0,0 +1,190 @@
+import math
+from scipy.stats import binom, norm, poisson
+from scipy.special import gammaln
+
+from sampling_plan import certified_lower_bound, scan_minimal_plan
+
+# Constante de Berry-Esseen para sumas de variables iid (Shevtsova, 2011)
+_BERRY_ESSEEN_C = 0.4748
+
+# Margen numérico para aceptar una decisión tomada con una aproximación
+_DECISION_MARGIN = 1e-12
+
+# Ancho de horquilla desde el cual se camina n → n+1 con la recurrencia
+_WALK_WIDTH = 64
+
+def _new_stats(stats):
+    """Inicializa los contadores del motor en el diccionario de estadísticas"""
+    if stats is None:
+        stats = {}
+    for key in ('evaluaciones_cdf', 'evaluaciones_exactas', 'decisiones_poisson',
+                'decisiones_normal', 'pasos_recurrencia', 'umbrales_k'):
+        stats.setdefault(key, 0)
+    return stats
+
+def approximation_error_bounds(n, p):
+    """
+    Cotas uniformes del error de aproximar la CDF binomial B(n, p).
+
+    - Poisson(np): distancia en variación total ≤ (1 - e^{-np})·p (Barbour-Hall)
+    - Normal con corrección de continuidad: ≤ C·(p² + q²)/√(npq) (Berry-Esseen)
+    """
+    q = 1 - p
+    poisson_bound = -math.expm1(-n * p) * p
+    normal_bound = _BERRY_ESSEEN_C * (p * p + q * q) / math.sqrt(n * p * q)
+    return poisson_bound, normal_bound
+
+def log_binom_pmf(k, n, p):
+    """log P(X = k | n, p) calculado con log-gamma, sin riesgo de underflow"""
+    return (gammaln(n + 1) - gammaln(k + 1) - gammaln(n - k + 1)
+            + k * math.log(p) + (n - k) * math.log1p(-p))
+
+def _approximate_cdf(k, n, p, tol, stats):
+    """
+    CDF aproximada P(X ≤ k) y su cota de error, o None si ninguna
+    aproximación tiene una cota de error menor o igual a `tol`.
+    """
+    poisson_bound, normal_bound = approximation_error_bounds(n, p)
+    if min(poisson_bound, normal_bound) > tol:
+        return None
+    if poisson_bound <= normal_bound:
+        stats['decisiones_poisson'] += 1
+        return poisson.cdf(k, n * p), poisson_bound
+    stats['decisiones_normal'] += 1
+    return norm.cdf((k + 0.5 - n * p) / math.sqrt(n * p * (1 - p))), normal_bound
+
+def _lower_tail_at_most(n, k, p, threshold, tol, stats):
+    """
+    Decide si P(X ≤ k | n, p) ≤ threshold.
+
+    Si una aproximación de Poisson o normal deja la decisión fuera de duda
+    (distancia al umbral mayor que su cota de error) se usa esa; si no, se
+    evalúa la binomial exacta en espacio logarítmico.
+    """
+    approximation = _approximate_cdf(k, n, p, tol, stats)
+    if approximation is not None:
+        value, bound = approximation
+        if abs(value - threshold) > bound + _DECISION_MARGIN:
+            return value < threshold
+    stats['evaluaciones_exactas'] += 1
+    stats['evaluaciones_cdf'] += 1
+    return binom.logcdf(k, n, p) <= math.log(threshold)
+
+def _upper_tail_at_most(n, k, p, threshold, tol, stats):
+    """Decide si P(X > k | n, p) ≤ threshold (mismo criterio que la cola inferior)"""
+    approximation = _approximate_cdf(k, n, p, tol, stats)
+    if approximation is not None:
+        value, bound = approximation
+        if abs((1 - value) - threshold) > bound + _DECISION_MARGIN:
+            return 1 - value < threshold
+    stats['evaluaciones_exactas'] += 1
+    stats['evaluaciones_cdf'] += 1
+    return binom.logsf(k, n, p) <= math.log(threshold)
+
+def _walk_lower_tail(k, lo, hi, p, threshold, stats):
+    """
+    Primer n en (lo, hi] con P(X ≤ k | n, p) ≤ threshold, avanzando de n a n+1
+    con la recurrencia en espacio logarítmico en lugar de recalcular:
+
+        F(k | n+1) = F(k | n) - p·f(k | n)
+        f(k | n+1) = f(k | n)·(n+1)(1-p)/(n+1-k)
+    """
+    log_threshold = math.log(threshold)
+    log_q = math.log1p(-p)
+    log_pmf = log_binom_pmf(k, lo, p)
+    log_cdf = binom.logcdf(k, lo, p)
+    stats['evaluaciones_exactas'] += 1
+    stats['evaluaciones_cdf'] += 2
+    for n in range(lo, hi):
+        log_cdf += math.log1p(-p * math.exp(log_pmf - log_cdf))
+        log_pmf += math.log(n + 1) - math.log(n + 1 - k) + log_q
+        stats['pasos_recurrencia'] += 1
+        if log_cdf <= log_threshold + _DECISION_MARGIN:
+            # Confirmar con la binomial exacta los casos en el borde del umbral
+            if log_cdf < log_threshold - _DECISION_MARGIN or binom.cdf(k, n + 1, p) <= threshold:
+                return n + 1
+    return hi
+
+def _first_n_lower_tail_below(k, n_from, p, threshold, tol, stats):
+    """
+    Menor n ≥ n_from con P(X ≤ k | n, p) ≤ threshold.
+
+    La cola inferior decrece con n: horquillado exponencial, bisección hasta
+    una horquilla angosta y caminata final con la recurrencia.
+    """
+    n_from = max(n_from, k + 1)
+    if _lower_tail_at_most(n_from, k, p, threshold, tol, stats):
+        return n_from
+    lo, step = n_from, 1
+    while not _lower_tail_at_most(lo + step, k, p, threshold, tol, stats):
+        lo, step = lo + step, 2 * step
+    hi = lo + step
+    while hi - lo > _WALK_WIDTH:
+        mid = (lo + hi) // 2
+        if _lower_tail_at_most(mid, k, p, threshold, tol, stats):
+            hi = mid
+        else:
+            lo = mid
+    return _walk_lower_tail(k, lo, hi, p, threshold, stats)
+
+def find_large_n_solution(p0, alpha, p1, beta, case=1, tol=1e-3, progress_callback=None,
+                          stats=None, n_limit=10**9):
+    """
+    Plan (n, r) de n mínimo para procesos con defectos raros (n en millones).
+
+    En lugar de recorrer n, recorre el umbral k sobre el número de defectos:
+    para un k fijo, la cola que controla un riesgo crece con n y la otra
+    decrece, así que el menor n que cumple la segunda (N(k)) se halla por
+    horquillado y bisección, y el plan con umbral k es factible sólo si en N(k)
+    se cumple también la primera. El primer k factible da el n mínimo.
+
+    - La cota aleatorizada de sampling_plan acota k por debajo.
+    - Las decisiones usan Poisson o normal cuando su cota de error
+      (≤ `tol`) deja la decisión fuera de duda, y la binomial exacta en
+      espacio logarítmico en caso contrario.
+    - Los últimos pasos en n se recorren con la recurrencia n → n+1.
+
+    El resultado se verifica con las mismas fórmulas que find_exact_solution
+    y r se elige con su mismo criterio.
+    """
+    stats = _new_stats(stats)
+    stats['bloques'] = 0
+
+    n_lb = certified_lower_bound(p0, alpha, p1, beta, case, None, stats, n_limit)
+    if n_lb is None:
+        return None
+    stats['n_cota_inferior'] = n_lb
+    if progress_callback:
+        progress_callback(50)
+
+    # Riesgo controlado por cada cola del número de defectos X con umbral k:
+    # caso 1 rechaza si X > k (k = r - 1), caso 2 rechaza si X ≤ k (k = r)
+    if case == 1:
+        p_low, risk_low, p_high, risk_high = p0, alpha, p1, beta
+    else:
+        p_low, risk_low, p_high, risk_high = p1, beta, p0, alpha
+
+    # Cotas inferiores de k (se resta 1 para cubrir el redondeo de ppf/isf):
+    # todo plan factible tiene n ≥ n_lb, luego F(k | n_lb - 1, p_high) > riesgo
+    # y P(X > k | n_lb, p_low) ≤ riesgo
+    k = int(max(binom.ppf(risk_high, max(n_lb - 1, 1), p_high),
+                binom.isf(risk_low, n_lb, p_low))) - 1
+    k = max(k, 0)
+    stats['evaluaciones_cdf'] += 2
+
+    n_from = n_lb
+    while True:
+        stats['umbrales_k'] += 1
+        if progress_callback:
+            # Un aviso por umbral permite cancelar la búsqueda entre umbrales
+            progress_callback(50)
+        n = _first_n_lower_tail_below(k, n_from, p_high, risk_high, tol, stats)
+        if n > n_limit:
+            return None
+        if _upper_tail_at_most(n, k, p_low, risk_low, tol, stats):
+            break
+        k, n_from = k + 1, n
+    if progress_callback:
+        progress_callback(90)
+
+    return scan_minimal_plan(n, p0, alpha, p1, beta, case, stats, n_limit)
@@ -0,0 +1,156 @@
+import functools
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy.stats import binom, beta as beta_dist
+
+# Puntos de la grilla uniforme en [0, 1] y de la grilla a lo largo de la curva
+_UNIFORM_POINTS = 1001
+_CURVE_POINTS = 1000
+
+# Máximo de planes recordados en la sesión para superponer
+MAX_PLANS = 8
+
+def acceptance_probability(n, r, p, case=1):
+    """
+    Curva OC: probabilidad de no rechazar H₀ (aceptar el lote) dado p.
+
+    Caso 1: Pa(p) = P(X ≤ r-1 | n, p)
+    Caso 2: Pa(p) = P(X ≥ r+1 | n, p)
+
+    n, r y p admiten arreglos con broadcasting. La potencia es 1 - Pa(p).
+    """
+    if case == 1:
+        return binom.cdf(r - 1, n, p)
+    return binom.sf(r, n, p)
+
+def average_outgoing_quality(p, pa, n, lot_size):
+    """
+    AOQ con inspección rectificadora (los lotes rechazados se inspeccionan
+    al 100% y se reemplazan los defectuosos): AOQ = p·Pa·(N - n)/N
+    """
+    return p * pa * (lot_size - n) / lot_size
+
+def average_total_inspection(pa, n, lot_size):
+    """ATI con inspección rectificadora: ATI = n + (1 - Pa)(N - n)"""
+    return n + (1 - pa) * (lot_size - n)
+
+@functools.lru_cache(maxsize=64)
+def plan_curve(n, r, case=1):
+    """
+    Curva OC de un plan sobre una grilla fija de p, cacheada por plan.
+
+    La grilla combina puntos uniformes en [0, 1] con puntos equiespaciados en
+    Pa (cuantiles de la beta, ya que Pa es una beta incompleta en p), así la
+    transición queda bien resuelta en cualquier rango del gráfico. Cambiar el
+    rango sólo recorta estos arreglos, sin volver a evaluar la binomial.
+    """
+    u = np.linspace(0, 1, _CURVE_POINTS + 2)[1:-1]
+    if case == 1 and 1 <= r <= n:
+        # Pa(p) = 1 - I_p(r, n - r + 1)
+        along_curve = beta_dist.ppf(u, r, n - r + 1)
+    elif case == 2 and 0 <= r < n:
+        # Pa(p) = I_p(r + 1, n - r)
+        along_curve = beta_dist.ppf(u, r + 1, n - r)
+    else:
+        along_curve = np.empty(0)
+    p = np.unique(np.concatenate([np.linspace(0, 1, _UNIFORM_POINTS), along_curve]))
+    pa = acceptance_probability(n, r, p, case)
+    p.setflags(write=False)
+    pa.setflags(write=False)
+    return p, pa
+
+def curves_in_range(n, r, case, p_min, p_max, lot_size=None):
+    """
+    Curvas OC, de potencia y (si se indica el tamaño de lote) AOQ y ATI del
+    plan en [p_min, p_max], a partir de la curva cacheada.
+    """
+    p, pa = plan_curve(int(n), int(r), int(case))
+    mask = (p >= p_min) & (p <= p_max)
+    p, pa = p[mask], pa[mask]
+    curves = pd.DataFrame({"p": p, "Pa": pa, "Potencia": 1 - pa})
+    if lot_size:
+        curves["AOQ"] = average_outgoing_quality(p, pa, n, lot_size)
+        curves["ATI"] = average_total_inspection(pa, n, lot_size)
+    return curves
+
+def remember_plan(n, r, case):
+    """Agrega un plan a la lista de la sesión usada para superponer curvas"""
+    plans = st.session_state.setdefault("oc_plans", [])
+    plan = (int(n), int(r), int(case))
+    if plan in plans:
+        plans.remove(plan)
+    plans.append(plan)
+    del plans[:-MAX_PLANS]
+
+def _plan_label(plan):
+    n, r, case = plan
+    return f"n={n:,}, r={r:,} (Caso {case})"
+
+def show_oc_section():
+    """Sección de la página con las curvas OC, potencia, AOQ y ATI superpuestas"""
+    plans = st.session_state.get("oc_plans", [])
+    if not plans:
+        return
+
+    st.markdown("---")
+    st.markdown("## 📈 Curvas OC, Potencia, AOQ y ATI")
+    selected = st.multiselect(
+        "Planes a superponer:",
+        options=plans,
+        default=plans[-1:],
+        format_func=_plan_label,
+        key="oc_selected"
+    )
+    if not selected:
+        st.info("Selecciona al menos un plan")
+        return
+
+    max_n = max(n for n, _, _ in selected)
+    default_max = min(1.0, round(3 * max(r / n for n, r, _ in selected), 3) or 1.0)
+    col1, col2 = st.columns(2)
+    with col1:
+        p_min, p_max = st.slider(
+            "Rango de p:",
+            min_value=0.0,
+            max_value=1.0,
+            value=(0.0, default_max),
+            step=0.001,
+            format="%.3f"
+        )
+    with col2:
+        lot_size = st.number_input(
+            "Tamaño del lote (N) para AOQ y ATI:",
+            min_value=max_n,
+            value=max(10 * max_n, 1000),
+            step=100
+        )
+
+    frames = []
+    for plan in selected:
+        curves = curves_in_range(*plan, p_min, p_max, lot_size)
+        curves["Plan"] = _plan_label(plan)
+        frames.append(curves)
+    data = pd.concat(frames, ignore_index=True)
+
+    def chart(column, title):
+        return alt.Chart(data).mark_line().encode(
+            x=alt.X("p:Q", title="p"),
+            y=alt.Y(f"{column}:Q", title=title),
+            color=alt.Color("Plan:N"),
+            tooltip=["Plan", alt.Tooltip("p:Q", format=".4f"), alt.Tooltip(f"{column}:Q", format=".6f")]
+        ).interactive()
+
+    tab_oc, tab_power, tab_aoq, tab_ati = st.tabs(["OC", "Potencia", "AOQ", "ATI"])
+    with tab_oc:
+        st.altair_chart(chart("Pa", "P(aceptar H₀ | p)"), width="stretch")
+    with tab_power:
+        st.altair_chart(chart("Potencia", "P(rechazar H₀ | p)"), width="stretch")
+    with tab_aoq:
+        st.altair_chart(chart("AOQ", "Calidad media de salida (AOQ)"), width="stretch")
+        aoql = data.groupby("Plan")["AOQ"].max()
+        st.caption(" · ".join(f"AOQL en el rango, {plan}: {value:.6f}" for plan, value in aoql.items()))
+    with tab_ati:
+        st.altair_chart(chart("ATI", "Inspección total media (ATI)"), width="stretch")
@@ -0,0 +1,158 @@
+import math
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from sampling_plan import (
+    error_probabilities,
+    find_minimal_solution,
+    certified_lower_bound,
+    _feasible_r_interval,
+    row_chunks,
+    BYTES_PER_CELL,
+)
+
+# Puntos por grupo en la comparación de dominancia todos contra todos
+_GROUP_POINTS = 1024
+
+def _staircase(alphas, betas):
+    """
+    Escalera de Pareto en (α, β): puntos no dominados ordenados por α
+    creciente con β estrictamente decreciente.
+    """
+    order = np.lexsort((betas, alphas))
+    alphas, betas = alphas[order], betas[order]
+    keep = np.ones(len(betas), dtype=bool)
+    keep[1:] = betas[1:] < np.minimum.accumulate(betas)[:-1]
+    return alphas[keep], betas[keep]
+
+def _merge_staircase(stair_alpha, stair_beta, alphas, betas):
+    """
+    Inserta en la escalera puntos que ella no domina y quita los que pasan a
+    quedar dominados, sin reordenar la escalera completa.
+    """
+    alphas, betas = _staircase(alphas, betas)
+    # Sólo los puntos con α' ≥ min(α) y β' ≥ min(β) pueden quedar dominados
+    first = np.searchsorted(stair_alpha, alphas[0])
+    last = np.searchsorted(-stair_beta, -betas[-1], side="right")
+    idx = np.searchsorted(alphas, stair_alpha[first:last], side="right") - 1
+    keep = np.ones(len(stair_alpha), dtype=bool)
+    keep[first:last] = betas[idx] > stair_beta[first:last]
+    stair_alpha, stair_beta = stair_alpha[keep], stair_beta[keep]
+    at = np.searchsorted(stair_alpha, alphas)
+    return np.insert(stair_alpha, at, alphas), np.insert(stair_beta, at, betas)
+
+def pareto_frontier(p0, alpha, p1, beta, case=1, n_max=None, memory_mb=64, stats=None):
+    """
+    Planes (n, r) Pareto-óptimos en (n, α_real, β_real) entre todos los
+    factibles con n ≤ n_max.
+
+    - La región factible de cada n es un intervalo de r (α_real y β_real son
+      monótonos en r), calculado para todos los n con binom.isf/ppf.
+    - Las colas binomiales de todas las celdas se evalúan en grillas 2D
+      (n × r) por bloques de filas, de modo que ninguna grilla supera
+      `memory_mb` megabytes aunque la región tenga millones de celdas.
+    - Los bloques se recorren en n creciente: un plan es Pareto-óptimo si
+      ningún plan con n menor tiene α_real y β_real menores o iguales. Cada
+      grupo de celdas se compara todos contra todos y contra una escalera de
+      Pareto en (α, β) con los grupos anteriores.
+
+    Por defecto n_max es 1.25 veces el n mínimo. Retorna un DataFrame con
+    columnas n, r, alpha_real y beta_real.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(celdas=0, bloques=0, celdas_por_bloque=0)
+
+    n_min = certified_lower_bound(p0, alpha, p1, beta, case)
+    if n_min is None:
+        return pd.DataFrame(columns=["n", "r", "alpha_real", "beta_real"])
+    if n_max is None:
+        minimal = find_minimal_solution(p0, alpha, p1, beta, case, n_hint=n_min)
+        n_max = math.ceil(1.25 * minimal[0]) if minimal else n_min
+    ns = np.arange(n_min, max(n_min, int(n_max)) + 1, dtype=np.int64)
+    r_lo, r_hi = _feasible_r_interval(ns, p0, alpha, p1, beta, case)
+    widths = np.maximum(r_hi - r_lo + 1, 0)
+
+    max_cells = max(1, int(memory_mb * 2**20 // BYTES_PER_CELL))
+    # Centinela (-∞, ∞): no domina a ningún punto y evita la escalera vacía
+    stair_alpha, stair_beta = np.array([-np.inf]), np.array([np.inf])
+    frontier = []  # arreglos (n, r, α_real, β_real) de cada grupo
+    for start, end, width in row_chunks(widths, max_cells):
+        if width == 0:
+            continue
+        block_ns = ns[start:end, None]
+        rs = r_lo[start:end, None] + np.arange(width)
+        feasible = rs <= r_hi[start:end, None]
+        prob_type1, prob_type2 = error_probabilities(block_ns, rs, p0, p1, case)
+        stats['celdas'] += rs.size
+        stats['bloques'] += 1
+        stats['celdas_por_bloque'] = max(stats['celdas_por_bloque'], rs.size)
+
+        # Celdas factibles del bloque en orden de n creciente
+        points = (np.broadcast_to(block_ns, rs.shape)[feasible], rs[feasible],
+                  prob_type1[feasible], prob_type2[feasible])
+        for first in range(0, len(points[0]), _GROUP_POINTS):
+            n_g, r_g, a_g, b_g = (values[first:first + _GROUP_POINTS] for values in points)
+            # Dominado por un n anterior a este grupo: el punto de la escalera
+            # con mayor α' ≤ α tiene β' ≤ β
+            idx = np.searchsorted(stair_alpha, a_g, side="right") - 1
+            keep = stair_beta[idx] > b_g
+            # Dominado dentro del grupo por un punto con n menor
+            dominated = ((n_g[:, None] < n_g) & (a_g[:, None] <= a_g) & (b_g[:, None] <= b_g)).any(axis=0)
+            keep &= ~dominated
+            if keep.any():
+                frontier.append((n_g[keep], r_g[keep], a_g[keep], b_g[keep]))
+                stair_alpha, stair_beta = _merge_staircase(stair_alpha, stair_beta, a_g[keep], b_g[keep])
+
+    columns = [np.concatenate(values) for values in zip(*frontier)] or [[], [], [], []]
+    return pd.DataFrame(dict(zip(["n", "r", "alpha_real", "beta_real"], columns)))
+
+# Máximo de puntos dibujados en el gráfico (límite por defecto de Altair)
+_MAX_CHART_POINTS = 5000
+
+def show_pareto_section(case, p0, p1, alpha, beta):
+    """Sección de la página para explorar la frontera de Pareto"""
+    with st.expander("🧭 Frontera de Pareto: n vs α_real vs β_real"):
+        st.markdown(
+            "Todos los planes factibles que ningún otro plan supera a la vez en n, α_real y β_real: "
+            "muestra cuánto baja α_real o β_real a cambio de un n algo mayor."
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            n_max = st.number_input("n máximo (0 = 1.25 × n mínimo)", min_value=0, value=0, step=100)
+        with col2:
+            memory_mb = st.number_input("Memoria máxima por bloque (MB)", min_value=1, value=64, step=16)
+        inputs = (case, p0, p1, alpha, beta, n_max)
+        if st.button("Calcular frontera de Pareto"):
+            stats = {}
+            with st.spinner("Evaluando la región factible..."):
+                frontier = pareto_frontier(p0, alpha, p1, beta, case, n_max or None, memory_mb, stats)
+            st.session_state.pareto_result = {"inputs": inputs, "frontier": frontier, "stats": stats}
+
+        stored = st.session_state.get("pareto_result")
+        if not stored or stored["inputs"] != inputs:
+            return
+        frontier, stats = stored["frontier"], stored["stats"]
+        st.caption(
+            f"{stats['celdas']:,} celdas (n, r) evaluadas en {stats['bloques']:,} bloques "
+            f"(máx. {stats['celdas_por_bloque']:,} celdas por bloque) · "
+            f"{len(frontier):,} planes Pareto-óptimos"
+        )
+        if frontier.empty:
+            st.warning("No hay planes factibles en el rango indicado")
+            return
+        shown = frontier
+        if len(frontier) > _MAX_CHART_POINTS:
+            shown = frontier.iloc[np.linspace(0, len(frontier) - 1, _MAX_CHART_POINTS).astype(int)]
+            st.caption(f"El gráfico muestra {_MAX_CHART_POINTS:,} planes equiespaciados en n; la tabla los incluye todos")
+        chart = alt.Chart(shown).mark_circle(size=40).encode(
+            x=alt.X("alpha_real:Q", title="α_real"),
+            y=alt.Y("beta_real:Q", title="β_real"),
+            color=alt.Color("n:Q", scale=alt.Scale(scheme="viridis")),
+            tooltip=["n", "r", alt.Tooltip("alpha_real:Q", format=".6f"), alt.Tooltip("beta_real:Q", format=".6f")]
+        ).interactive()
+        st.altair_chart(chart, width="stretch")
+        st.dataframe(frontier, hide_index=True)
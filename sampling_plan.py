@@ -1,7 +1,13 @@
+import functools
+
 import streamlit as st
 import numpy as np
 from scipy.stats import binom, norm
 
+from sampling_atlas import lookup_plan, append_plan
+from sampling_oc import remember_plan, show_oc_section
+from sampling_jobs import start_job, cancel_job
+
 def normal_approximation(p0, alpha, p1, beta, case=1):
     """Calcular aproximación inicial usando distribución normal"""
     z_alpha = norm.ppf(1 - alpha)
@@ -21,7 +27,93 @@ def normal_approximation(p0, alpha, p1, beta, case=1):
     
     return n_approx, r_approx
 
-def find_exact_solution(n_start, r_start, p0, alpha, p1, beta, case=1, progress_callback=None):
+def _r_bounds(ns, p0, p1, case=1):
+    """Rango de búsqueda de r para cada n (vectorizado sobre un arreglo de n)"""
+    if case == 1:
+        r_min = np.maximum(1, (ns * p0 * 0.6).astype(np.int64))
+        r_max = np.minimum(ns, (ns * p1 * 1.8).astype(np.int64))
+    else:
+        r_min = np.maximum(0, (ns * p1 * 0.2).astype(np.int64))
+        r_max = np.minimum(ns, (ns * p0 * 1.4).astype(np.int64))
+    return r_min, r_max
+
+def oriented_proportions(p0, p1, case=1):
+    """
+    (p₀, p₁) orientados como el caso 1. El caso 2 se resuelve como caso 1
+    sobre los fracasos: Y = n - X tiene probabilidad 1 - p y H₀: p ≥ p₀
+    equivale a H₀: 1 - p ≤ 1 - p₀.
+    """
+    return (p0, p1) if case == 1 else (1 - p0, 1 - p1)
+
+# Bytes por celda de las grillas (n, r) evaluadas por bloques (r, α, β, máscara y temporales de SciPy)
+BYTES_PER_CELL = 64
+
+def row_chunks(widths, max_cells):
+    """
+    Divide las filas (valores de n) en bloques contiguos cuya grilla
+    rectangular (filas × ancho máximo del bloque) no supere `max_cells`.
+    """
+    start = 0
+    while start < len(widths):
+        end, width = start, 0
+        while end < len(widths):
+            width_next = max(width, int(widths[end]))
+            if end > start and (end - start + 1) * width_next > max_cells:
+                break
+            width = width_next
+            end += 1
+        yield start, end, width
+        start = end
+
+def error_probabilities(n, r, p0, p1, case=1):
+    """
+    Probabilidades de error (α_real, β_real) del plan (n, r).
+    
+    Acepta escalares o arreglos de NumPy (con broadcasting) y evalúa todas las
+    combinaciones en una sola llamada a binom.cdf por probabilidad.
+    """
+    if case == 1:
+        # CASO 1: H₀: p ≤ p₀ vs H₁: p > p₀
+        # α = Gᵦ(r_crítico | n; p₀) = P(X ≥ r | p₀)
+        # β = Fᵦ(r_crítico - 1 | n; p₁) = P(X ≤ r-1 | p₁)
+        prob_type1 = 1 - binom.cdf(r - 1, n, p0)  # Gᵦ(r | n, p₀)
+        prob_type2 = binom.cdf(r - 1, n, p1)       # Fᵦ(r-1 | n, p₁)
+    else:
+        # CASO 2: H₀: p ≥ p₀ vs H₁: p < p₀
+        # α = Fᵦ(r_crítico | n; p₀) = P(X ≤ r | p₀)
+        # β = Gᵦ(r_crítico + 1 | n; p₁) = P(X ≥ r+1 | p₁)
+        prob_type1 = binom.cdf(r, n, p0)           # Fᵦ(r | n, p₀)
+        prob_type2 = 1 - binom.cdf(r, n, p1)       # Gᵦ(r+1 | n, p₁)
+    return prob_type1, prob_type2
+
+def _evaluate_block(ns, p0, alpha, p1, beta, case=1):
+    """
+    Evalúa en una sola pasada de NumPy todos los r candidatos de un bloque de n.
+    
+    Retorna la grilla de r (filas = n, columnas = r candidatos), las
+    probabilidades de error, y el score de cada celda (inf si no es válida).
+    """
+    r_min, r_max = _r_bounds(ns, p0, p1, case)
+    width = max(int((r_max - r_min).max()) + 1, 1)
+    rs = r_min[:, None] + np.arange(width)
+    in_band = rs <= r_max[:, None]
+    
+    prob_type1, prob_type2 = error_probabilities(ns[:, None], rs, p0, p1, case)
+    
+    valid = in_band & (prob_type1 <= alpha) & (prob_type2 <= beta)
+    # Calcular score: queremos minimizar n y maximizar cercanía a límites
+    # Penalizar fuertemente n más grande
+    # Recompensar estar cerca de los límites de α y β
+    score = (
+        ns[:, None] * 1000 +  # Penalización por tamaño de muestra (factor dominante)
+        (alpha - prob_type1)**2 * 1000 +  # Queremos α cercano al límite
+        (beta - prob_type2)**2 * 1000     # Queremos β cercano al límite
+    )
+    score = np.where(valid, score, np.inf)
+    return rs, prob_type1, prob_type2, score
+
+def find_exact_solution(n_start, r_start, p0, alpha, p1, beta, case=1, progress_callback=None,
+                        block_size=16, stats=None, improvement_callback=None):
     """
     Encontrar la solución óptima que minimiza n y maximiza el uso de α y β permitidos.
     
@@ -30,6 +122,16 @@ def find_exact_solution(n_start, r_start, p0, alpha, p1, beta, case=1, progress_
     2. Minimiza n (menor tamaño de muestra)
     3. Maximiza α_real y β_real (estar lo más cerca posible de los límites permitidos)
     
+    Todos los r candidatos de un bloque de `block_size` valores de n se evalúan
+    en una sola pasada vectorizada; el resultado es idéntico al de recorrer
+    cada par (n, r) por separado.
+    
+    Si se pasa un diccionario en `stats`, se acumula en 'evaluaciones_cdf' la
+    cantidad de valores de la distribución binomial calculados.
+    
+    `improvement_callback(plan)` recibe cada plan que mejora al mejor
+    encontrado hasta el momento, para mostrar resultados parciales.
+    
     case=1: H₀: p ≤ p₀ vs H₁: p > p₀ (upper-tailed)
     case=2: H₀: p ≥ p₀ vs H₁: p < p₀ (lower-tailed)
     """
@@ -44,59 +146,540 @@ def find_exact_solution(n_start, r_start, p0, alpha, p1, beta, case=1, progress_
     total_iterations = n_max - n_min
     
     # Buscar de menor a mayor n para encontrar el mínimo primero
-    for idx, n in enumerate(range(n_min, n_max + 1)):
-        # Actualizar progreso
-        if progress_callback and idx % 5 == 0:
-            progress = 30 + (idx / total_iterations) * 60
-            progress_callback(min(90, progress))
+    for block_start in range(n_min, n_max + 1, block_size):
+        ns = np.arange(block_start, min(block_start + block_size, n_max + 1), dtype=np.int64)
+        rs, prob_type1, prob_type2, score = _evaluate_block(ns, p0, alpha, p1, beta, case)
+        _count_evaluations(stats, 2 * rs.size)
+        
+        for row, n in enumerate(ns):
+            idx = n - n_min
+            # Actualizar progreso
+            if progress_callback and idx % 5 == 0:
+                progress = 30 + (idx / total_iterations) * 60
+                progress_callback(min(90, progress))
+            
+            # argmin retorna el primer mínimo: mismo desempate que el recorrido en orden de r
+            col = int(np.argmin(score[row]))
+            found_valid = np.isfinite(score[row, col])
+            
+            if found_valid and score[row, col] < best_score:
+                best_score = score[row, col]
+                best_solution = (int(n), int(rs[row, col]),
+                                 float(prob_type1[row, col]), float(prob_type2[row, col]))
+                if improvement_callback:
+                    improvement_callback(best_solution)
+            
+            # Si ya encontramos una solución válida y el siguiente n sería peor,
+            # podemos terminar (optimización)
+            if found_valid and best_solution and n > best_solution[0] + 5:
+                return best_solution
+    
+    return best_solution
+
+# Margen numérico para certificar que un n es infactible pese al redondeo
+_CERTIFICATE_MARGIN = 1e-9
+
+def _count_evaluations(stats, count):
+    """Acumula evaluaciones de la binomial en el diccionario de estadísticas"""
+    if stats is not None:
+        stats['evaluaciones_cdf'] = stats.get('evaluaciones_cdf', 0) + int(count)
+
+def randomized_beta_bound(ns, p0, alpha, p1, case=1, stats=None):
+    """
+    β de la prueba aleatorizada más potente de tamaño exactamente α.
+    
+    Por Neyman-Pearson ninguna regla (n, r) puede tener un β menor, y como la
+    prueba aleatorizada puede ignorar observaciones, esta cota es no creciente
+    en n. Si supera β para algún n, ningún tamaño de muestra ≤ n es factible.
+    """
+    ns = np.atleast_1d(np.asarray(ns, dtype=np.int64))
+    p0, p1 = oriented_proportions(p0, p1, case)
+    
+    # Punto de aleatorización c: P(X > c | p₀) ≤ α < P(X ≥ c | p₀)
+    c = binom.isf(alpha, ns, p0)
+    sf_c = binom.sf(c, ns, p0)
+    pmf_c = binom.pmf(c, ns, p0)
+    _count_evaluations(stats, 3 * ns.size)
+    # Corregir desplazamientos de isf por redondeo
+    c = np.where(sf_c > alpha, c + 1, np.where(sf_c + pmf_c <= alpha, c - 1, c))
+    sf_c = binom.sf(c, ns, p0)
+    pmf_c = binom.pmf(c, ns, p0)
+    _count_evaluations(stats, 2 * ns.size)
+    
+    gamma = np.clip(np.divide(alpha - sf_c, pmf_c, out=np.zeros_like(sf_c), where=pmf_c > 0), 0, 1)
+    bound = binom.cdf(c, ns, p1) - gamma * binom.pmf(c, ns, p1)
+    _count_evaluations(stats, 2 * ns.size)
+    return bound
+
+def _feasible_r_interval(ns, p0, alpha, p1, beta, case=1, stats=None):
+    """
+    Intervalo [r_lo, r_hi] de valores críticos factibles para cada n del bloque.
+    
+    α_real y β_real son monótonos en r, así que los extremos se obtienen
+    directamente con binom.isf/binom.ppf y se verifican con
+    error_probabilities. El n es infactible donde r_lo > r_hi.
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    if case == 1:
+        # α(r) = P(X ≥ r | p₀) decrece con r; β(r) = P(X ≤ r-1 | p₁) crece con r
+        r_lo = binom.isf(alpha, ns, p0).astype(np.int64) + 1
+        r_hi = binom.ppf(beta, ns, p1).astype(np.int64) + 1
+        r_floor = 1
+        lower_ok = lambda rs: error_probabilities(ns, rs, p0, p1, case)[0] <= alpha
+        upper_ok = lambda rs: error_probabilities(ns, rs, p0, p1, case)[1] <= beta
+    else:
+        # α(r) = P(X ≤ r | p₀) crece con r; β(r) = P(X ≥ r+1 | p₁) decrece con r
+        r_lo = binom.isf(beta, ns, p1).astype(np.int64)
+        r_hi = binom.ppf(alpha, ns, p0).astype(np.int64)
+        r_floor = 0
+        lower_ok = lambda rs: error_probabilities(ns, rs, p0, p1, case)[1] <= beta
+        upper_ok = lambda rs: error_probabilities(ns, rs, p0, p1, case)[0] <= alpha
+    _count_evaluations(stats, 2 * ns.size)
+    
+    r_lo = np.clip(r_lo, r_floor, ns + 1)
+    r_hi = np.clip(r_hi, r_floor - 1, ns)
+    
+    # Verificar los extremos con las mismas fórmulas que el resto del módulo
+    while True:
+        step_up = (r_lo <= ns) & ~lower_ok(r_lo)
+        step_down = ~step_up & (r_lo > r_floor) & lower_ok(r_lo - 1)
+        _count_evaluations(stats, 4 * ns.size)
+        if not (step_up.any() or step_down.any()):
+            break
+        r_lo = r_lo + step_up - step_down
+    while True:
+        step_down = (r_hi >= r_floor) & ~upper_ok(r_hi)
+        step_up = ~step_down & (r_hi < ns) & upper_ok(r_hi + 1)
+        _count_evaluations(stats, 4 * ns.size)
+        if not (step_up.any() or step_down.any()):
+            break
+        r_hi = r_hi + step_up - step_down
+    return r_lo, r_hi
+
+def certified_lower_bound(p0, alpha, p1, beta, case=1, n_hint=None, stats=None, n_limit=10**8,
+                          progress_callback=None):
+    """
+    Menor n que la cota aleatorizada no descarta: todo n menor es infactible.
+    
+    1. Horquillado exponencial de n sobre la cota aleatorizada (monótona en n),
+       partiendo de `n_hint` si se conoce una solución cercana.
+    2. Bisección dentro de la horquilla.
+    
+    Retorna None si no hay horquilla antes de `n_limit`. `progress_callback`
+    se llama en cada evaluación de la cota (avance hasta 65), así un trabajo
+    cancelado se detiene de inmediato.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('bloques', 0)
+    evaluated = 0
+    
+    def certified_infeasible(n):
+        nonlocal evaluated
+        evaluated += 1
+        if progress_callback:
+            progress_callback(min(65, evaluated))
+        stats['bloques'] += 1
+        return randomized_beta_bound(n, p0, alpha, p1, case, stats)[0] > beta + _CERTIFICATE_MARGIN
+    
+    # 1. Horquillado exponencial: lo es infactible con certeza (0 = sin cota), hi no.
+    #    El paso crece desde 1, así un n_hint cercano (p. ej. de una celda
+    #    vecina) deja una horquilla angosta
+    n = max(1, int(n_hint)) if n_hint else 1
+    step = 1
+    if certified_infeasible(n):
+        lo, hi = n, n + step
+        while certified_infeasible(hi):
+            if hi > n_limit:
+                return None
+            step *= 2
+            lo, hi = hi, hi + step
+    else:
+        lo, hi = n - step, n
+        while lo > 0 and not certified_infeasible(lo):
+            step *= 2
+            lo, hi = max(0, lo - step), lo
+    
+    # 2. Bisección sobre la cota monótona
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if certified_infeasible(mid):
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+def scan_minimal_plan(n_start, p0, alpha, p1, beta, case=1, stats=None, n_limit=10**8, progress_callback=None):
+    """
+    Primer n ≥ n_start con algún r factible, recorriendo bloques vectorizados
+    que duplican su tamaño.
+    
+    En ese n se elige r con el mismo criterio que find_exact_solution
+    (α_real y β_real lo más cerca posible de los límites). `progress_callback`
+    se llama en cada bloque (avance de 70 a 89).
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('bloques', 0)
+    
+    start, size, scanned = n_start, 16, 0
+    while start <= n_limit:
+        if progress_callback:
+            progress_callback(min(89, 70 + scanned))
+        scanned += 1
+        ns = np.arange(start, start + size, dtype=np.int64)
+        r_lo, r_hi = _feasible_r_interval(ns, p0, alpha, p1, beta, case, stats)
+        stats['bloques'] += 1
+        feasible = np.flatnonzero(r_lo <= r_hi)
+        if feasible.size:
+            i = feasible[0]
+            n, r_min, r_max = int(ns[i]), int(r_lo[i]), int(r_hi[i])
+            break
+        start, size = start + size, 2 * size
+    else:
+        return None
+    
+    rs = np.arange(r_min, r_max + 1)
+    prob_type1, prob_type2 = error_probabilities(n, rs, p0, p1, case)
+    _count_evaluations(stats, 2 * rs.size)
+    best = int(np.argmin((alpha - prob_type1)**2 + (beta - prob_type2)**2))
+    return n, int(rs[best]), float(prob_type1[best]), float(prob_type2[best])
+
+def find_minimal_solution(p0, alpha, p1, beta, case=1, n_hint=None, progress_callback=None,
+                          stats=None, n_limit=10**8):
+    """
+    Encontrar el plan (n, r) con el menor n factible, garantizado globalmente.
+    
+    La cota certificada (horquillado exponencial + bisección, ver
+    certified_lower_bound) descarta todo n menor; desde ella un barrido local
+    por bloques vectorizados encuentra el primer n con algún r factible.
+    
+    `n_hint` permite iniciar el horquillado cerca de una solución conocida.
+    En `stats` se informan las evaluaciones de la binomial (cada llamada a
+    isf/ppf cuenta como una), la cota inferior certificada y los bloques
+    evaluados.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('evaluaciones_cdf', 0)
+    stats['bloques'] = 0
+    
+    n_lb = certified_lower_bound(p0, alpha, p1, beta, case, n_hint, stats, n_limit, progress_callback)
+    if n_lb is None:
+        return None
+    stats['n_cota_inferior'] = n_lb
+    if progress_callback:
+        progress_callback(70)
+    
+    result = scan_minimal_plan(n_lb, p0, alpha, p1, beta, case, stats, n_limit, progress_callback)
+    if progress_callback:
+        progress_callback(90)
+    return result
+
+def _show_plan_result(case, p0, p1, alpha, beta, stored):
+    """Muestra el plan calculado (guardado en session_state) con su verificación"""
+    n_approx, r_approx = stored["approx"]
+    result = stored["result"]
+    
+    st.markdown("### Aproximación por Distribución Normal")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("n (aproximado)", f"{n_approx:,}")
+    with col2:
+        st.metric("r crítico (aproximado)", f"{r_approx:,}")
+    for note in stored["notes"]:
+        st.caption(note)
+    
+    if result:
+        n_exact, r_exact, actual_alpha, actual_beta = result
+        
+        st.markdown("---")
+        st.markdown("## 🎯 Plan de Muestreo Óptimo")
+        
+        # Métricas principales
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric(
+                "📏 Tamaño de muestra (n)", 
+                f"{n_exact:,}",
+                delta=f"{n_exact - n_approx:,} vs aproximación"
+            )
+        with col2:
+            st.metric(
+                "🎲 Valor crítico (r)", 
+                f"{r_exact:,}",
+                delta=f"{r_exact - r_approx:,} vs aproximación"
+            )
+        
+        # Regla de decisión
+        st.markdown("### 📋 Regla de Decisión")
+        if case == 1:
+            st.info(
+                f"**Se rechazará H₀** si al realizar **{n_exact:,} pruebas** "
+                f"se obtienen **{r_exact:,} o más éxitos**."
+            )
+        else:
+            st.info(
+                f"**Se rechazará H₀** si al realizar **{n_exact:,} pruebas** "
+                f"se obtienen **{r_exact:,} o menos éxitos**."
+            )
+        
+        # Probabilidades de error
+        st.markdown("### 📊 Probabilidades de Error")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric(
+                "Error Tipo I (α)",
+                f"{actual_alpha:.10f}",
+                delta=f"{actual_alpha - alpha:.2e}",
+                delta_color="inverse"
+            )
+            st.caption(f"Objetivo: {alpha}")
+            
+        with col2:
+            st.metric(
+                "Error Tipo II (β)",
+                f"{actual_beta:.10f}",
+                delta=f"{actual_beta - beta:.2e}",
+                delta_color="inverse"
+            )
+            st.caption(f"Objetivo: {beta}")
+        
+        # Fórmulas exactas con G y F binomial
+        st.markdown("### 📐 Valores Exactos Calculados")
+        if case == 1:
+            st.info(f"""
+**Fórmulas CASO 1 con los valores óptimos encontrados:**
+
+• **α = Gᵦ(rc={r_exact} | n={n_exact}, p₀={p0})** = {actual_alpha:.10f}  
+• **β = Fᵦ(rc-1={r_exact-1} | n={n_exact}, p₁={p1})** = {actual_beta:.10f}
+
+Donde:
+- **Gᵦ(r | n, p)** = 1 - Fᵦ(r-1 | n, p) = P(X ≥ r) = Probabilidad de rechazar H₀
+- **Fᵦ(r | n, p)** = P(X ≤ r) = Función de distribución acumulada binomial
+        """)
+        else:
+            st.info(f"""
+**Fórmulas CASO 2 con los valores óptimos encontrados:**
+
+• **α = Fᵦ(rc={r_exact} | n={n_exact}, p₀={p0})** = {actual_alpha:.10f}  
+• **β = Gᵦ(rc+1={r_exact+1} | n={n_exact}, p₁={p1})** = {actual_beta:.10f}
+
+Donde:
+- **Fᵦ(r | n, p)** = P(X ≤ r) = Función de distribución acumulada binomial
+- **Gᵦ(r | n, p)** = 1 - Fᵦ(r-1 | n, p) = P(X ≥ r) = Probabilidad de rechazar H₀
+        """)
+        
+        # Verificación
+        st.markdown("### ✓ Verificación")
         
-        # Rango de búsqueda para r (optimizado)
+        # Verificación usando G y F binomial (notación del profesor)
         if case == 1:
-            r_min = max(1, int(n * p0 * 0.6))
-            r_max = min(n, int(n * p1 * 1.8))
+            G_binomial = 1 - binom.cdf(r_exact - 1, n_exact, p0)
+            F_binomial = binom.cdf(r_exact - 1, n_exact, p1)
         else:
-            r_min = max(0, int(n * p1 * 0.2))
-            r_max = min(n, int(n * p0 * 1.4))
+            F_binomial_alpha = binom.cdf(r_exact, n_exact, p0)
+            G_binomial_beta = 1 - binom.cdf(r_exact, n_exact, p1)
         
-        found_valid = False
+        col1, col2 = st.columns(2)
+        with col1:
+            check1 = "✅" if actual_alpha <= alpha else "❌"
+            st.write(f"{check1} α calculado ≤ α objetivo: **{actual_alpha <= alpha}**")
+            if case == 1:
+                st.caption(f"P(X ≥ r | n, p₀) = Gᵦ(r | n, p₀) ≤ α")
+            else:
+                st.caption(f"P(X ≤ r | n, p₀) = Fᵦ(r | n, p₀) ≤ α")
+        with col2:
+            check2 = "✅" if actual_beta <= beta else "❌"
+            st.write(f"{check2} β calculado ≤ β objetivo: **{actual_beta <= beta}**")
+            if case == 1:
+                st.caption(f"P(X ≤ r-1 | n, p₁) = Fᵦ(r-1 | n, p₁) ≤ β")
+            else:
+                st.caption(f"P(X ≥ r+1 | n, p₁) = Gᵦ(r+1 | n, p₁) ≤ β")
         
-        for r in range(r_min, r_max + 1):
-            # Calcular probabilidades de error según el caso
+        # Información adicional con notación G y F
+        with st.expander("📐 Verificación Detallada (Notación G y F Binomial)"):
             if case == 1:
-                # CASO 1: H₀: p ≤ p₀ vs H₁: p > p₀
-                # α = Gᵦ(r_crítico | n; p₀) = P(X ≥ r | p₀)
-                # β = Fᵦ(r_crítico - 1 | n; p₁) = P(X ≤ r-1 | p₁)
-                prob_type1 = 1 - binom.cdf(r - 1, n, p0)  # Gᵦ(r | n, p₀)
-                prob_type2 = binom.cdf(r - 1, n, p1)       # Fᵦ(r-1 | n, p₁)
+                st.markdown(f"""
+            **CASO 1: H₀: p ≤ p₀ vs H₁: p > p₀ (Prueba de Cola Superior)**
+            
+            **Notación:**
+            - **F(k | n, p)** = P(X ≤ k) = Función de distribución acumulada
+            - **G(k | n, p)** = P(X ≥ k) = 1 - F(k-1 | n, p) = Función de supervivencia
+            
+            **Condiciones que debe cumplir el plan de muestreo:**
+            
+            1. **Error Tipo I (α):**
+               - α = P(rechazar H₀ | H₀ es cierto) = P(X ≥ r | n, p₀)
+               - α = Gᵦ(r | n, p₀) = 1 - Fᵦ(r-1 | n, p₀)
+               - α = {actual_alpha:.10f} ≤ {alpha} ✓
+            
+            2. **Error Tipo II (β):**
+               - β = P(no rechazar H₀ | H₁ es cierto) = P(X < r | n, p₁)
+               - β = P(X ≤ r-1 | n, p₁) = Fᵦ(r-1 | n, p₁)
+               - β = {actual_beta:.10f} ≤ {beta} ✓
+            
+            **Usando notación alternativa:**
+            - Gᵦ({r_exact} | {n_exact}, {p0}) = P(X ≥ {r_exact}) = {G_binomial:.10f}
+            - Fᵦ({r_exact-1} | {n_exact}, {p1}) = P(X ≤ {r_exact-1}) = {F_binomial:.10f}
+            
+            **Nota:** El algoritmo busca minimizar n mientras se mantiene lo más cerca
+            posible de los límites permitidos de α y β, aprovechando al máximo los
+            errores permitidos para obtener el plan de muestreo más eficiente.
+            """)
             else:
-                # CASO 2: H₀: p ≥ p₀ vs H₁: p < p₀
-                # α = Fᵦ(r_crítico | n; p₀) = P(X ≤ r | p₀)
-                # β = Gᵦ(r_crítico + 1 | n; p₁) = P(X ≥ r+1 | p₁)
-                prob_type1 = binom.cdf(r, n, p0)           # Fᵦ(r | n, p₀)
-                prob_type2 = 1 - binom.cdf(r, n, p1)       # Gᵦ(r+1 | n, p₁)
+                st.markdown(f"""
+            **CASO 2: H₀: p ≥ p₀ vs H₁: p < p₀ (Prueba de Cola Inferior)**
+            
+            **Notación:**
+            - **F(k | n, p)** = P(X ≤ k) = Función de distribución acumulada
+            - **G(k | n, p)** = P(X ≥ k) = 1 - F(k-1 | n, p) = Función de supervivencia
+            
+            **Condiciones que debe cumplir el plan de muestreo:**
+            
+            1. **Error Tipo I (α):**
+               - α = P(rechazar H₀ | H₀ es cierto) = P(X ≤ r | n, p₀)
+               - α = Fᵦ(r | n, p₀)
+               - α = {actual_alpha:.10f} ≤ {alpha} ✓
+            
+            2. **Error Tipo II (β):**
+               - β = P(no rechazar H₀ | H₁ es cierto) = P(X > r | n, p₁)
+               - β = P(X ≥ r+1 | n, p₁) = Gᵦ(r+1 | n, p₁) = 1 - Fᵦ(r | n, p₁)
+               - β = {actual_beta:.10f} ≤ {beta} ✓
+            
+            **Usando notación alternativa:**
+            - Fᵦ({r_exact} | {n_exact}, {p0}) = P(X ≤ {r_exact}) = {F_binomial_alpha:.10f}
+            - Gᵦ({r_exact+1} | {n_exact}, {p1}) = P(X ≥ {r_exact+1}) = {G_binomial_beta:.10f}
             
-            # Verificar que cumple las restricciones
-            if prob_type1 <= alpha and prob_type2 <= beta:
-                found_valid = True
-                # Calcular score: queremos minimizar n y maximizar cercanía a límites
-                # Penalizar fuertemente n más grande
-                # Recompensar estar cerca de los límites de α y β
-                score = (
-                    n * 1000 +  # Penalización por tamaño de muestra (factor dominante)
-                    (alpha - prob_type1)**2 * 1000 +  # Queremos α cercano al límite
-                    (beta - prob_type2)**2 * 1000     # Queremos β cercano al límite
-                )
-                
-                if score < best_score:
-                    best_score = score
-                    best_solution = (n, r, prob_type1, prob_type2)
+            **Nota:** El algoritmo busca minimizar n mientras se mantiene lo más cerca
+            posible de los límites permitidos de α y β, aprovechando al máximo los
+            errores permitidos para obtener el plan de muestreo más eficiente.
+            """)
         
-        # Si ya encontramos una solución válida y el siguiente n sería peor,
-        # podemos terminar (optimización)
-        if found_valid and best_solution and n > best_solution[0] + 5:
-            break
-    
-    return best_solution
+        
+        # Interpretación
+        with st.expander("ℹ️ Interpretación de Resultados"):
+            if case == 1:
+                st.markdown(f"""
+            **Interpretación del Plan de Muestreo (CASO 1):**
+            
+            - La probabilidad de **rechazar H₀ cuando es verdadera** (Error Tipo I) es de **{actual_alpha:.6f}**
+            - La probabilidad de **no rechazar H₀ cuando p = {p1}** (Error Tipo II) es de **{actual_beta:.6f}**
+            - La **potencia de la prueba** es de **{1-actual_beta:.6f}** (probabilidad de detectar p₁ = {p1})
+            
+            **Aplicación Práctica:**
+            
+            Para aplicar este plan de muestreo:
+            1. Realizar {n_exact:,} pruebas independientes
+            2. Contar el número de éxitos obtenidos
+            3. Si se obtienen {r_exact:,} o más éxitos → Rechazar H₀ (evidencia de que p > {p0})
+            4. Si se obtienen menos de {r_exact:,} éxitos → No rechazar H₀
+            """)
+            else:
+                st.markdown(f"""
+            **Interpretación del Plan de Muestreo (CASO 2):**
+            
+            - La probabilidad de **rechazar H₀ cuando es verdadera** (Error Tipo I) es de **{actual_alpha:.6f}**
+            - La probabilidad de **no rechazar H₀ cuando p = {p1}** (Error Tipo II) es de **{actual_beta:.6f}**
+            - La **potencia de la prueba** es de **{1-actual_beta:.6f}** (probabilidad de detectar p₁ = {p1})
+            
+            **Aplicación Práctica:**
+            
+            Para aplicar este plan de muestreo:
+            1. Realizar {n_exact:,} pruebas independientes
+            2. Contar el número de éxitos obtenidos
+            3. Si se obtienen {r_exact:,} o menos éxitos → Rechazar H₀ (evidencia de que p < {p0})
+            4. Si se obtienen más de {r_exact:,} éxitos → No rechazar H₀
+            """)
+        
+        # Inspección truncada del mismo plan
+        from sampling_curtailed import show_curtailed_section
+        show_curtailed_section(n_exact, r_exact, case, p0, p1)
+    else:
+        st.error("❌ No se pudo encontrar una solución válida. Intenta ajustar los parámetros.")
+
+# Modos de búsqueda disponibles en la interfaz
+SEARCH_MODES = {
+    "heuristica": "Heurística (±15% alrededor de la aproximación normal)",
+    "minimo": "Mínimo global garantizado",
+    "gran_n": "Gran escala (defectos raros, n en millones)",
+}
+
+# Intervalo (segundos) con que la página consulta la búsqueda en segundo plano
+_POLL_SECONDS = 0.5
+
+def _run_search(search_mode, case, p0, alpha, p1, beta, n_approx, r_approx,
+                progress_callback, improvement_callback, stats):
+    """Búsqueda del plan según el modo elegido (se ejecuta en el hilo de fondo)"""
+    if search_mode == "minimo":
+        return find_minimal_solution(p0, alpha, p1, beta, case,
+                                     progress_callback=progress_callback, stats=stats)
+    if search_mode == "gran_n":
+        from sampling_large_n import find_large_n_solution
+        return find_large_n_solution(p0, alpha, p1, beta, case,
+                                     progress_callback=progress_callback, stats=stats)
+    return find_exact_solution(n_approx, r_approx, p0, alpha, p1, beta, case, progress_callback,
+                               stats=stats, improvement_callback=improvement_callback)
+
+def _store_plan_result(inputs, approx, result, notes):
+    """Guarda el resultado para que sobreviva a las re-ejecuciones de la página"""
+    st.session_state.sampling_result = {
+        "inputs": inputs,
+        "approx": approx,
+        "result": result,
+        "notes": notes,
+    }
+    if result:
+        remember_plan(result[0], result[1], inputs[0])
+
+def _finish_search(job):
+    """Arma las notas del trabajo terminado, lo guarda en el atlas si se pidió y guarda el resultado"""
+    case, p0, p1, alpha, beta, search_mode = job["inputs"]
+    result, search_stats = job["result"], job["stats"]
+    if job["error"] is not None:
+        notes = [f"❌ Error durante la búsqueda: {job['error']}"]
+    else:
+        caption = f"Evaluaciones de la binomial: {search_stats.get('evaluaciones_cdf', 0):,}"
+        if 'n_cota_inferior' in search_stats:
+            caption += f" · Ningún n < {search_stats['n_cota_inferior']:,} es factible (cota certificada)"
+        if 'pasos_recurrencia' in search_stats:
+            approximated = search_stats['decisiones_poisson'] + search_stats['decisiones_normal']
+            caption += (f" · {approximated:,} decisiones por aproximación de Poisson/normal"
+                        f" · {search_stats['pasos_recurrencia']:,} pasos de recurrencia")
+        notes = [caption]
+
+    if result and job["context"]["save_to_atlas"]:
+        if append_plan(case, p0, p1, alpha, beta, result, search_mode):
+            notes.append("💾 Plan guardado en el atlas")
+        else:
+            notes.append("Los parámetros no caen en la grilla del atlas; el plan no se guardó")
+    _store_plan_result(job["inputs"], job["context"]["approx"], result, notes)
+
+@st.fragment(run_every=_POLL_SECONDS)
+def _show_running_search():
+    """Estado de la búsqueda en segundo plano, consultado periódicamente"""
+    job = st.session_state.get("sampling_job")
+    if job is None:
+        return
+    if job["done"]:
+        del st.session_state.sampling_job
+        _finish_search(job)
+        st.rerun()
+
+    st.progress(int(job["progress"]), text="🔄 Buscando valores exactos en segundo plano...")
+    best = job["best"]
+    if best:
+        n_best, r_best, alpha_best, beta_best = best
+        st.info(f"Mejor plan hasta ahora: n = {n_best:,}, r = {r_best:,} · "
+                f"α_real = {alpha_best:.6f} · β_real = {beta_best:.6f}")
+    elif 'n_cota_inferior' in job["stats"]:
+        st.info(f"Ningún n < {job['stats']['n_cota_inferior']:,} es factible (cota certificada); "
+                "buscando el primer n factible...")
+    if st.button("Cancelar búsqueda"):
+        cancel_job(job)
+        del st.session_state.sampling_job
+        st.rerun()
 
 def show_sampling_plan():
     st.title("📊 Plan de Muestreo - Procesos de Bernoulli")
@@ -173,240 +756,62 @@ def show_sampling_plan():
         st.error("⚠️ Para el Caso 2, p₁ debe ser menor que p₀")
         valid = False
     
+    search_mode = st.radio(
+        "Modo de búsqueda:",
+        options=list(SEARCH_MODES.keys()),
+        format_func=lambda x: SEARCH_MODES[x],
+        horizontal=True,
+        help="El modo mínimo garantizado certifica que ningún n menor es factible"
+    )
+    save_to_atlas = st.checkbox(
+        "Guardar en el atlas los planes calculados en vivo",
+        value=False,
+        help="Los planes de la grilla del atlas (resolución 0.0001) se responden al instante"
+    )
+    
+    inputs = (case, p0, p1, alpha, beta, search_mode)
+    
+    # Cambiar cualquier parámetro cancela la búsqueda en curso, que ya no aplica
+    job = st.session_state.get("sampling_job")
+    if job and job["inputs"] != inputs:
+        cancel_job(job)
+        del st.session_state.sampling_job
+    
     if valid and st.button("Calcular Plan de Muestreo", type="primary"):
-        # Barra de progreso
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        # Aproximación normal
-        status_text.text("Calculando aproximación normal...")
-        progress_bar.progress(10)
-        
         n_approx, r_approx = normal_approximation(p0, alpha, p1, beta, case)
         
-        st.markdown("### Aproximación por Distribución Normal")
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("n (aproximado)", f"{n_approx:,}")
-        with col2:
-            st.metric("r crítico (aproximado)", f"{r_approx:,}")
-        
-        # Búsqueda exacta
-        status_text.text("Buscando valores exactos...")
-        progress_bar.progress(30)
-        
-        def update_progress(value):
-            progress_bar.progress(int(value))
-        
-        result = find_exact_solution(n_approx, r_approx, p0, alpha, p1, beta, case, update_progress)
-        
-        progress_bar.progress(100)
-        status_text.text("✅ Cálculo completado")
-        
-        if result:
-            n_exact, r_exact, actual_alpha, actual_beta = result
-            
-            st.markdown("---")
-            st.markdown("## 🎯 Plan de Muestreo Óptimo")
-            
-            # Métricas principales
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric(
-                    "📏 Tamaño de muestra (n)", 
-                    f"{n_exact:,}",
-                    delta=f"{n_exact - n_approx:,} vs aproximación"
-                )
-            with col2:
-                st.metric(
-                    "🎲 Valor crítico (r)", 
-                    f"{r_exact:,}",
-                    delta=f"{r_exact - r_approx:,} vs aproximación"
-                )
-            
-            # Regla de decisión
-            st.markdown("### 📋 Regla de Decisión")
-            if case == 1:
-                st.info(
-                    f"**Se rechazará H₀** si al realizar **{n_exact:,} pruebas** "
-                    f"se obtienen **{r_exact:,} o más éxitos**."
-                )
-            else:
-                st.info(
-                    f"**Se rechazará H₀** si al realizar **{n_exact:,} pruebas** "
-                    f"se obtienen **{r_exact:,} o menos éxitos**."
-                )
-            
-            # Probabilidades de error
-            st.markdown("### 📊 Probabilidades de Error")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric(
-                    "Error Tipo I (α)",
-                    f"{actual_alpha:.10f}",
-                    delta=f"{actual_alpha - alpha:.2e}",
-                    delta_color="inverse"
-                )
-                st.caption(f"Objetivo: {alpha}")
-                
-            with col2:
-                st.metric(
-                    "Error Tipo II (β)",
-                    f"{actual_beta:.10f}",
-                    delta=f"{actual_beta - beta:.2e}",
-                    delta_color="inverse"
-                )
-                st.caption(f"Objetivo: {beta}")
-            
-            # Fórmulas exactas con G y F binomial
-            st.markdown("### 📐 Valores Exactos Calculados")
-            if case == 1:
-                st.info(f"""
-**Fórmulas CASO 1 con los valores óptimos encontrados:**
-
-• **α = Gᵦ(rc={r_exact} | n={n_exact}, p₀={p0})** = {actual_alpha:.10f}  
-• **β = Fᵦ(rc-1={r_exact-1} | n={n_exact}, p₁={p1})** = {actual_beta:.10f}
-
-Donde:
-- **Gᵦ(r | n, p)** = 1 - Fᵦ(r-1 | n, p) = P(X ≥ r) = Probabilidad de rechazar H₀
-- **Fᵦ(r | n, p)** = P(X ≤ r) = Función de distribución acumulada binomial
-            """)
-            else:
-                st.info(f"""
-**Fórmulas CASO 2 con los valores óptimos encontrados:**
-
-• **α = Fᵦ(rc={r_exact} | n={n_exact}, p₀={p0})** = {actual_alpha:.10f}  
-• **β = Gᵦ(rc+1={r_exact+1} | n={n_exact}, p₁={p1})** = {actual_beta:.10f}
-
-Donde:
-- **Fᵦ(r | n, p)** = P(X ≤ r) = Función de distribución acumulada binomial
-- **Gᵦ(r | n, p)** = 1 - Fᵦ(r-1 | n, p) = P(X ≥ r) = Probabilidad de rechazar H₀
-            """)
-            
-            # Verificación
-            st.markdown("### ✓ Verificación")
-            
-            # Verificación usando G y F binomial (notación del profesor)
-            if case == 1:
-                G_binomial = 1 - binom.cdf(r_exact - 1, n_exact, p0)
-                F_binomial = binom.cdf(r_exact - 1, n_exact, p1)
-            else:
-                F_binomial_alpha = binom.cdf(r_exact, n_exact, p0)
-                G_binomial_beta = 1 - binom.cdf(r_exact, n_exact, p1)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                check1 = "✅" if actual_alpha <= alpha else "❌"
-                st.write(f"{check1} α calculado ≤ α objetivo: **{actual_alpha <= alpha}**")
-                if case == 1:
-                    st.caption(f"P(X ≥ r | n, p₀) = Gᵦ(r | n, p₀) ≤ α")
-                else:
-                    st.caption(f"P(X ≤ r | n, p₀) = Fᵦ(r | n, p₀) ≤ α")
-            with col2:
-                check2 = "✅" if actual_beta <= beta else "❌"
-                st.write(f"{check2} β calculado ≤ β objetivo: **{actual_beta <= beta}**")
-                if case == 1:
-                    st.caption(f"P(X ≤ r-1 | n, p₁) = Fᵦ(r-1 | n, p₁) ≤ β")
-                else:
-                    st.caption(f"P(X ≥ r+1 | n, p₁) = Gᵦ(r+1 | n, p₁) ≤ β")
-            
-            # Información adicional con notación G y F
-            with st.expander("📐 Verificación Detallada (Notación G y F Binomial)"):
-                if case == 1:
-                    st.markdown(f"""
-                **CASO 1: H₀: p ≤ p₀ vs H₁: p > p₀ (Prueba de Cola Superior)**
-                
-                **Notación:**
-                - **F(k | n, p)** = P(X ≤ k) = Función de distribución acumulada
-                - **G(k | n, p)** = P(X ≥ k) = 1 - F(k-1 | n, p) = Función de supervivencia
-                
-                **Condiciones que debe cumplir el plan de muestreo:**
-                
-                1. **Error Tipo I (α):**
-                   - α = P(rechazar H₀ | H₀ es cierto) = P(X ≥ r | n, p₀)
-                   - α = Gᵦ(r | n, p₀) = 1 - Fᵦ(r-1 | n, p₀)
-                   - α = {actual_alpha:.10f} ≤ {alpha} ✓
-                
-                2. **Error Tipo II (β):**
-                   - β = P(no rechazar H₀ | H₁ es cierto) = P(X < r | n, p₁)
-                   - β = P(X ≤ r-1 | n, p₁) = Fᵦ(r-1 | n, p₁)
-                   - β = {actual_beta:.10f} ≤ {beta} ✓
-                
-                **Usando notación alternativa:**
-                - Gᵦ({r_exact} | {n_exact}, {p0}) = P(X ≥ {r_exact}) = {G_binomial:.10f}
-                - Fᵦ({r_exact-1} | {n_exact}, {p1}) = P(X ≤ {r_exact-1}) = {F_binomial:.10f}
-                
-                **Nota:** El algoritmo busca minimizar n mientras se mantiene lo más cerca
-                posible de los límites permitidos de α y β, aprovechando al máximo los
-                errores permitidos para obtener el plan de muestreo más eficiente.
-                """)
-                else:
-                    st.markdown(f"""
-                **CASO 2: H₀: p ≥ p₀ vs H₁: p < p₀ (Prueba de Cola Inferior)**
-                
-                **Notación:**
-                - **F(k | n, p)** = P(X ≤ k) = Función de distribución acumulada
-                - **G(k | n, p)** = P(X ≥ k) = 1 - F(k-1 | n, p) = Función de supervivencia
-                
-                **Condiciones que debe cumplir el plan de muestreo:**
-                
-                1. **Error Tipo I (α):**
-                   - α = P(rechazar H₀ | H₀ es cierto) = P(X ≤ r | n, p₀)
-                   - α = Fᵦ(r | n, p₀)
-                   - α = {actual_alpha:.10f} ≤ {alpha} ✓
-                
-                2. **Error Tipo II (β):**
-                   - β = P(no rechazar H₀ | H₁ es cierto) = P(X > r | n, p₁)
-                   - β = P(X ≥ r+1 | n, p₁) = Gᵦ(r+1 | n, p₁) = 1 - Fᵦ(r | n, p₁)
-                   - β = {actual_beta:.10f} ≤ {beta} ✓
-                
-                **Usando notación alternativa:**
-                - Fᵦ({r_exact} | {n_exact}, {p0}) = P(X ≤ {r_exact}) = {F_binomial_alpha:.10f}
-                - Gᵦ({r_exact+1} | {n_exact}, {p1}) = P(X ≥ {r_exact+1}) = {G_binomial_beta:.10f}
-                
-                **Nota:** El algoritmo busca minimizar n mientras se mantiene lo más cerca
-                posible de los límites permitidos de α y β, aprovechando al máximo los
-                errores permitidos para obtener el plan de muestreo más eficiente.
-                """)
-            
-            
-            # Interpretación
-            with st.expander("ℹ️ Interpretación de Resultados"):
-                if case == 1:
-                    st.markdown(f"""
-                **Interpretación del Plan de Muestreo (CASO 1):**
-                
-                - La probabilidad de **rechazar H₀ cuando es verdadera** (Error Tipo I) es de **{actual_alpha:.6f}**
-                - La probabilidad de **no rechazar H₀ cuando p = {p1}** (Error Tipo II) es de **{actual_beta:.6f}**
-                - La **potencia de la prueba** es de **{1-actual_beta:.6f}** (probabilidad de detectar p₁ = {p1})
-                
-                **Aplicación Práctica:**
-                
-                Para aplicar este plan de muestreo:
-                1. Realizar {n_exact:,} pruebas independientes
-                2. Contar el número de éxitos obtenidos
-                3. Si se obtienen {r_exact:,} o más éxitos → Rechazar H₀ (evidencia de que p > {p0})
-                4. Si se obtienen menos de {r_exact:,} éxitos → No rechazar H₀
-                """)
-                else:
-                    st.markdown(f"""
-                **Interpretación del Plan de Muestreo (CASO 2):**
-                
-                - La probabilidad de **rechazar H₀ cuando es verdadera** (Error Tipo I) es de **{actual_alpha:.6f}**
-                - La probabilidad de **no rechazar H₀ cuando p = {p1}** (Error Tipo II) es de **{actual_beta:.6f}**
-                - La **potencia de la prueba** es de **{1-actual_beta:.6f}** (probabilidad de detectar p₁ = {p1})
-                
-                **Aplicación Práctica:**
-                
-                Para aplicar este plan de muestreo:
-                1. Realizar {n_exact:,} pruebas independientes
-                2. Contar el número de éxitos obtenidos
-                3. Si se obtienen {r_exact:,} o menos éxitos → Rechazar H₀ (evidencia de que p < {p0})
-                4. Si se obtienen más de {r_exact:,} éxitos → No rechazar H₀
-                """)
+        # Consultar primero el atlas de planes precalculados
+        result = lookup_plan(case, p0, p1, alpha, beta, search_mode)
+        if result is not None:
+            _store_plan_result(inputs, (n_approx, r_approx), result, ["⚡ Plan obtenido del atlas precalculado"])
         else:
-            st.error("❌ No se pudo encontrar una solución válida. Intenta ajustar los parámetros.")
+            # La búsqueda exacta corre en segundo plano; la página consulta su estado
+            if "sampling_job" in st.session_state:
+                cancel_job(st.session_state.sampling_job)
+            search = functools.partial(_run_search, search_mode, case, p0, alpha, p1, beta, n_approx, r_approx)
+            st.session_state.sampling_job = start_job(inputs, search, approx=(n_approx, r_approx),
+                                                      save_to_atlas=save_to_atlas)
+    
+    if "sampling_job" in st.session_state:
+        _show_running_search()
+    else:
+        stored = st.session_state.get("sampling_result")
+        if stored and stored["inputs"] == inputs:
+            _show_plan_result(case, p0, p1, alpha, beta, stored)
+            if stored["result"]:
+                from sampling_verify import show_verify_section
+                show_verify_section(case, p0, p1, alpha, beta, stored["result"])
+    
+    # Curvas OC de los planes calculados (persisten al cambiar el rango del gráfico)
+    show_oc_section()
+    
+    if valid:
+        from sampling_pareto import show_pareto_section
+        show_pareto_section(case, p0, p1, alpha, beta)
+        from sampling_bayes import show_bayesian_section
+        show_bayesian_section(case, p0, p1, alpha, beta)
+        from sampling_sweep import show_sweep_section
+        show_sweep_section(case, p0, p1, alpha, beta)
     
     # Ejemplos de uso
     with st.expander("📝 Ejemplo de Uso"):
@@ -0,0 +1,263 @@
+import math
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from sampling_plan import find_minimal_solution, oriented_proportions
+
+# Masa de probabilidad aún sin decidir por debajo de la cual se corta el SPRT sin truncar
+_MASS_EPS = 1e-10
+
+# Tope de ítems del SPRT sin truncar, en múltiplos del n del plan fijo
+_MAX_STEPS_FACTOR = 50
+
+# Factores de calibración de los riesgos nominales evaluados en cada pasada
+_CALIBRATION_GRID = 32
+
+# Niveles de los percentiles de N que se informan
+QUANTILE_LEVELS = (0.5, 0.95, 0.99)
+
+def wald_lines(q0, alpha, q1, beta):
+    """
+    Rectas de Wald (pendiente s y distancias h_a, h_r) orientadas como el
+    caso 1: tras n ítems con d éxitos se no rechaza H₀ si d ≤ s·n - h_a y
+    se rechaza si d ≥ s·n + h_r (log-verosimilitud ≤ log(β/(1-α)) o ≥ log((1-β)/α)).
+
+    alpha y beta pueden ser arreglos (una distancia por fila).
+    """
+    g1 = math.log(q1 / q0)
+    g2 = math.log((1 - q0) / (1 - q1))
+    slope = g2 / (g1 + g2)
+    h_accept = np.log((1 - alpha) / beta) / (g1 + g2)
+    h_reject = np.log((1 - beta) / alpha) / (g1 + g2)
+    return slope, h_accept, h_reject
+
+def sequential_oc_asn(slope, h_accept, h_reject, p, n_max, levels=()):
+    """
+    Curvas OC y ASN exactas del SPRT truncado en n_max.
+
+    Programación dinámica sobre los caminos que siguen abiertos, vectorizada
+    por filas: cada fila tiene su p y sus distancias h_a, h_r (con
+    broadcasting), así una sola pasada evalúa toda una grilla de p o de
+    rectas. En cada paso la distribución del número de éxitos se avanza para
+    todas las filas dentro de una ventana común y se anulan las celdas ya
+    decididas. En n_max se decide con la recta media. Cada 64 pasos se
+    descartan las filas cuya masa abierta ya es despreciable.
+
+    Retorna (P(no rechazar H₀), ASN, {nivel: percentil de N}, último n).
+    """
+    p, h_accept, h_reject = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float))
+                                                  for v in (p, h_accept, h_reject)))
+    rows = p.shape[0]
+    accept, asn = np.zeros(rows), np.zeros(rows)
+    quantiles = {level: np.zeros(rows, dtype=np.int64) for level in levels}
+    active = np.arange(rows)
+    p_col, h_a, h_r = p[:, None], h_accept, h_reject
+    probs, base, n = np.ones((rows, 1)), 0, 0
+    while probs.shape[1] > 0:
+        n += 1
+        asn[active] += probs.sum(axis=1)
+        advanced = np.empty((len(active), probs.shape[1] + 1))
+        advanced[:, :-1] = probs * (1 - p_col)
+        advanced[:, -1] = 0
+        advanced[:, 1:] += probs * p_col
+        if n == n_max:
+            acceptance = np.floor(slope * n + (h_r - h_a) / 2)
+            rejection = acceptance + 1
+        else:
+            acceptance = np.floor(slope * n - h_a)
+            rejection = np.maximum(np.ceil(slope * n + h_r), acceptance + 1)
+        values = base + np.arange(advanced.shape[1])
+        accepted = values <= acceptance[:, None]
+        accept[active] += np.where(accepted, advanced, 0).sum(axis=1)
+        advanced[accepted | (values >= rejection[:, None])] = 0
+
+        # Recortar la ventana a las columnas abiertas en alguna fila
+        first = int(min(max(acceptance.min() + 1 - base, 0), advanced.shape[1]))
+        last = int(max(min(rejection.max() - base, advanced.shape[1]), first))
+        probs = advanced[:, first:last]
+        base += first
+
+        if quantiles:
+            stopped = 1 - probs.sum(axis=1)
+            for level, reached in quantiles.items():
+                reached[active[(reached[active] == 0) & (stopped >= level - 1e-12)]] = n
+        if n % 64 == 0:
+            alive = probs.sum(axis=1) >= _MASS_EPS
+            if not alive.all():
+                active, probs = active[alive], probs[alive]
+                p_col, h_a, h_r = p_col[alive], h_a[alive], h_r[alive]
+                if len(active) == 0:
+                    break
+    for reached in quantiles.values():
+        reached[reached == 0] = n
+    return accept, asn, quantiles, n
+
+def design_sprt(p0, alpha, p1, beta, case=1, n_max=None, stats=None):
+    """
+    SPRT de Wald con las mismas entradas que el plan de n fijo.
+
+    Las rectas de Wald sólo cumplen α y β de forma aproximada (y la
+    truncación en n_max los aumenta), así que se calculan α_real y β_real
+    exactos y, si exceden los objetivos, se usan riesgos nominales f·α y
+    f·β con el mayor factor f que cumple: cada pasada de la programación
+    dinámica evalúa una grilla de factores a la vez, primero en [0.5, 1],
+    luego más abajo si hace falta, y una última pasada refina. Si ninguno
+    cumple (truncación muy corta) se elige el más cercano.
+
+    Sin n_max el SPRT se trunca, sólo para el cálculo, en 50 veces el n
+    fijo (la masa abierta es despreciable mucho antes).
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('pasadas_pd', 0)
+    q0, q1 = oriented_proportions(p0, p1, case)
+    fixed = find_minimal_solution(p0, alpha, p1, beta, case)
+    n_fixed = fixed[0] if fixed else None
+    horizon = n_max or _MAX_STEPS_FACTOR * (n_fixed or 1)
+
+    def evaluate(factors):
+        # Filas: (f₁, p₀), (f₁, p₁), (f₂, p₀), ...
+        slope, h_accept, h_reject = wald_lines(q0, factors * alpha, q1, factors * beta)
+        accept, asn, quantiles, steps = sequential_oc_asn(
+            slope, np.repeat(h_accept, 2), np.repeat(h_reject, 2), np.tile([q0, q1], len(factors)),
+            horizon, QUANTILE_LEVELS)
+        stats['pasadas_pd'] += 1
+        alpha_real, beta_real = 1 - accept[0::2], accept[1::2]
+        feasible = (alpha_real <= alpha) & (beta_real <= beta)
+        return factors, feasible, (slope, h_accept, h_reject, alpha_real, beta_real, asn, quantiles, steps)
+
+    result = evaluate(np.array([1.0]))
+    grids = (np.linspace(0.5, 1, _CALIBRATION_GRID, endpoint=False),
+             np.linspace(0, 0.5, _CALIBRATION_GRID, endpoint=False)[1:])
+    for grid in grids:
+        if result[1].any():
+            break
+        result = evaluate(grid)
+    factors, feasible, _ = result
+    if feasible.any() and not feasible[-1]:
+        # Refinar entre el mayor factor factible y el siguiente
+        k = np.flatnonzero(feasible)[-1]
+        result = evaluate(np.linspace(factors[k], factors[k + 1], _CALIBRATION_GRID, endpoint=False))
+    factors, feasible, (slope, h_accept, h_reject, alpha_real, beta_real, asn, quantiles, steps) = result
+    if feasible.any():
+        k = np.flatnonzero(feasible)[-1]
+    else:
+        k = int(np.argmin(np.maximum(alpha_real / alpha, beta_real / beta)))
+    return {
+        "case": case,
+        "slope": slope,
+        "h_accept": float(h_accept[k]),
+        "h_reject": float(h_reject[k]),
+        "n_max": n_max,
+        "horizon": horizon,
+        "factor": float(factors[k]),
+        "alpha_real": float(alpha_real[k]),
+        "beta_real": float(beta_real[k]),
+        "asn_p0": float(asn[2 * k]),
+        "asn_p1": float(asn[2 * k + 1]),
+        "quantiles_p0": {level: int(q[2 * k]) for level, q in quantiles.items()},
+        "quantiles_p1": {level: int(q[2 * k + 1]) for level, q in quantiles.items()},
+        "steps": steps,
+        "n_fixed": n_fixed,
+        "feasible": bool(feasible[k]),
+    }
+
+def sprt_curves(design, p):
+    """Curvas OC y ASN del SPRT diseñado sobre los valores de p (del caso pedido)"""
+    p = np.asarray(p, dtype=float)
+    q = p if design["case"] == 1 else 1 - p
+    accept, asn, _, _ = sequential_oc_asn(design["slope"], design["h_accept"], design["h_reject"], q,
+                                          design["horizon"])
+    return pd.DataFrame({"p": p, "Pa": accept, "ASN": asn})
+
+def decision_lines(design):
+    """
+    Rectas de decisión sobre los éxitos acumulados X tras n ítems, en la
+    orientación del caso: (pendiente, ordenada para no rechazar H₀,
+    ordenada para rechazar H₀).
+    """
+    slope, h_accept, h_reject = design["slope"], design["h_accept"], design["h_reject"]
+    if design["case"] == 1:
+        return slope, -h_accept, h_reject
+    return 1 - slope, h_accept, -h_reject
+
+def show_sprt_section(case, p0, p1, alpha, beta):
+    """Diseño del SPRT en la página de muestreo por etapas"""
+    n_max = st.number_input(
+        "Truncación: máximo de ítems a inspeccionar (0 = sin truncar)",
+        min_value=0, value=0, step=50,
+        help="En el último ítem se decide con la recta media entre las dos rectas de Wald"
+    )
+    inputs = (case, p0, p1, alpha, beta, n_max)
+    if st.button("Diseñar SPRT", type="primary"):
+        with st.spinner("Calculando OC y ASN exactos..."):
+            design = design_sprt(p0, alpha, p1, beta, case, n_max or None)
+        st.session_state.sprt_result = {"inputs": inputs, "design": design}
+
+    stored = st.session_state.get("sprt_result")
+    if not stored or stored["inputs"] != inputs:
+        return
+    design = stored["design"]
+    if not design["feasible"]:
+        st.warning("Con esta truncación ningún SPRT cumple α y β: aumente el máximo de ítems")
+
+    slope, accept_intercept, reject_intercept = decision_lines(design)
+    le, ge = ("≤", "≥") if case == 1 else ("≥", "≤")
+    st.markdown("## 🎯 SPRT de Wald")
+    st.info(
+        f"Tras inspeccionar **n** ítems con **X** éxitos acumulados:\n\n"
+        f"- **No rechazar H₀** si X {le} {slope:.6f}·n {accept_intercept:+.4f}\n"
+        f"- **Rechazar H₀** si X {ge} {slope:.6f}·n {reject_intercept:+.4f}\n"
+        f"- En otro caso, inspeccionar un ítem más"
+        + (f"\n\nEn n = {design['n_max']:,} se decide con la recta media." if design["n_max"] else "")
+    )
+    if design["factor"] < 1:
+        st.caption(f"Riesgos nominales calibrados a {design['factor']:.4f}·α y {design['factor']:.4f}·β "
+                   "para que los riesgos exactos cumplan los objetivos")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        check = "✅" if design["alpha_real"] <= alpha else "❌"
+        st.write(f"{check} α_real = {design['alpha_real']:.10f} ≤ {alpha}")
+    with col2:
+        check = "✅" if design["beta_real"] <= beta else "❌"
+        st.write(f"{check} β_real = {design['beta_real']:.10f} ≤ {beta}")
+
+    n_fixed = design["n_fixed"]
+    col1, col2, col3 = st.columns(3)
+    for col, label, asn, quantiles in ((col1, "p₀", design["asn_p0"], design["quantiles_p0"]),
+                                       (col2, "p₁", design["asn_p1"], design["quantiles_p1"])):
+        with col:
+            st.metric(f"ASN({label})", f"{asn:,.1f}",
+                      delta=f"{asn - n_fixed:,.1f} ítems vs n fijo" if n_fixed else None,
+                      delta_color="inverse")
+            st.caption(" · ".join(f"percentil {level:.0%} de N: {n:,}" for level, n in quantiles.items()))
+    with col3:
+        st.metric("n del plan fijo", f"{n_fixed:,}" if n_fixed else "—")
+
+    p_max = min(1.0, 2 * max(p0, p1))
+    curves = sprt_curves(design, np.linspace(0, p_max, 201))
+    if n_fixed:
+        worst = curves["ASN"].max()
+        st.caption(f"ASN máximo en [0, {p_max:.3f}]: {worst:,.1f} "
+                   f"({worst / n_fixed - 1:+.1%} respecto del n fijo)")
+    tab_oc, tab_asn = st.tabs(["OC", "ASN"])
+    with tab_oc:
+        chart = alt.Chart(curves).mark_line().encode(
+            x=alt.X("p:Q", title="p"), y=alt.Y("Pa:Q", title="P(no rechazar H₀ | p)"),
+            tooltip=[alt.Tooltip("p:Q", format=".4f"), alt.Tooltip("Pa:Q", format=".6f")]
+        ).interactive()
+        st.altair_chart(chart, width="stretch")
+    with tab_asn:
+        chart = alt.Chart(curves).mark_line().encode(
+            x=alt.X("p:Q", title="p"), y=alt.Y("ASN:Q", title="Tamaño medio de muestra"),
+            tooltip=[alt.Tooltip("p:Q", format=".4f"), alt.Tooltip("ASN:Q", format=",.1f")]
+        ).interactive()
+        if n_fixed:
+            rule = alt.Chart(pd.DataFrame({"n": [n_fixed]})).mark_rule(strokeDash=[4, 4]).encode(y="n:Q")
+            chart = chart + rule
+        st.altair_chart(chart, width="stretch")
+        st.caption("La línea punteada es el n del plan fijo de n mínimo")
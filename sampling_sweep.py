@@ -0,0 +1,155 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from sampling_plan import find_minimal_solution
+
+# Parámetros que se pueden barrer y sus etiquetas
+SWEEP_PARAMETERS = {
+    "p0": "p₀",
+    "p1": "p₁",
+    "alpha": "α",
+    "beta": "β",
+}
+
+def _valid(params, case):
+    """Mismas validaciones que la página: p₁ del lado correcto de p₀ y probabilidades en (0, 1)"""
+    if not all(0 < params[k] < 1 for k in SWEEP_PARAMETERS):
+        return False
+    return params["p1"] > params["p0"] if case == 1 else params["p1"] < params["p0"]
+
+def _solve_cell(params, case, n_hint, stats):
+    """Plan mínimo de una celda, partiendo del n de una celda vecina"""
+    if not _valid(params, case):
+        return None
+    return find_minimal_solution(params["p0"], params["alpha"], params["p1"], params["beta"], case,
+                                 n_hint=n_hint, stats=stats)
+
+def _solve_row(base, case, x_param, x_values, y_param, y_value, n_hint):
+    """
+    Resuelve una fila de la grilla (y fijo) recorriendo x en orden: cada
+    celda parte del n extrapolado de las dos celdas anteriores de la fila,
+    y la primera del n de la primera columna ya resuelta (`n_hint`).
+    """
+    stats = {}
+    row = []
+    previous = None
+    for x_value in x_values:
+        params = dict(base, **{x_param: float(x_value), y_param: float(y_value)})
+        plan = _solve_cell(params, case, n_hint, stats)
+        if plan:
+            # Extrapolación lineal desde las dos últimas celdas resueltas
+            n_hint = 2 * plan[0] - previous if previous else plan[0]
+            n_hint, previous = max(1, n_hint), plan[0]
+        row.append(plan)
+    return row, stats.get('evaluaciones_cdf', 0)
+
+def sweep_grid(base, case, x_param, x_values, y_param, y_values, workers=None):
+    """
+    Plan mínimo (find_minimal_solution) en cada celda de la grilla
+    x_values × y_values de dos parámetros; el resto queda en `base`.
+
+    1. La primera columna se resuelve en orden, cada celda partiendo del n
+       de la celda vecina anterior (n_hint del horquillado certificado).
+    2. Las filas se reparten entre `workers` procesos (por defecto, todos
+       los núcleos); dentro de cada fila cada celda parte del n
+       extrapolado de sus vecinas ya resueltas.
+
+    Retorna un dict con las matrices n y r (NaN donde no hay plan o los
+    parámetros no son válidos; filas = y, columnas = x), las evaluaciones
+    de la binomial y los segundos empleados.
+    """
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    x_values, y_values = np.asarray(x_values, dtype=float), np.asarray(y_values, dtype=float)
+    base = {k: float(v) for k, v in base.items()}
+
+    # 1. Primera columna, con arranque en caliente a lo largo de y
+    first_column, evaluations = _solve_row(base, case, y_param, y_values, x_param, x_values[0], None)
+    hints = [plan[0] if plan else None for plan in first_column]
+
+    # 2. Filas en paralelo, cada una desde su celda de la primera columna
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_solve_row, base, case, x_param, x_values[1:], y_param, y_value, hint)
+            for y_value, hint in zip(y_values, hints)
+        ]
+        rows = []
+        for plan, future in zip(first_column, futures):
+            row, row_evaluations = future.result()
+            rows.append([plan] + row)
+            evaluations += row_evaluations
+
+    n_grid = np.array([[plan[0] if plan else np.nan for plan in row] for row in rows])
+    r_grid = np.array([[plan[1] if plan else np.nan for plan in row] for row in rows])
+    return {
+        "n": n_grid,
+        "r": r_grid,
+        "evaluaciones_cdf": int(evaluations),
+        "procesos": workers,
+        "segundos": time.perf_counter() - started,
+    }
+
+def _heatmap(data, value, x_label, y_label):
+    return alt.Chart(data).mark_rect().encode(
+        x=alt.X("x:O", title=x_label, axis=alt.Axis(format=".4~f", labelOverlap=True)),
+        y=alt.Y("y:O", title=y_label, sort="descending", axis=alt.Axis(format=".4~f", labelOverlap=True)),
+        color=alt.Color(f"{value}:Q", scale=alt.Scale(scheme="viridis"), title=value),
+        tooltip=[alt.Tooltip("x:Q", title=x_label, format=".4f"), alt.Tooltip("y:Q", title=y_label, format=".4f"),
+                 alt.Tooltip("n:Q", format=",.0f"), alt.Tooltip("r:Q", format=",.0f")]
+    )
+
+def show_sweep_section(case, p0, p1, alpha, beta):
+    """Sección de la página para el análisis de sensibilidad sobre una grilla de parámetros"""
+    with st.expander("🗺️ Análisis de sensibilidad: n y r sobre una grilla de parámetros"):
+        st.markdown(
+            "Resuelve el plan mínimo en cada celda de una grilla de dos parámetros (por ejemplo p₁ × β) "
+            "y muestra n y r como mapas de calor. Cada celda parte de la solución de su vecina."
+        )
+        base = {"p0": p0, "p1": p1, "alpha": alpha, "beta": beta}
+        options = list(SWEEP_PARAMETERS)
+        axes = {}
+        for column, axis, default in zip(st.columns(2), ("x", "y"), ("p1", "beta")):
+            with column:
+                param = st.selectbox(f"Parámetro del eje {axis}", options, index=options.index(default),
+                                     format_func=SWEEP_PARAMETERS.get, key=f"sweep_{axis}_param")
+                center = base[param]
+                low = st.number_input(f"{SWEEP_PARAMETERS[param]} mínimo", min_value=0.0001, max_value=0.9999,
+                                      value=round(center * 0.9, 4), format="%.4f", key=f"sweep_{axis}_low")
+                high = st.number_input(f"{SWEEP_PARAMETERS[param]} máximo", min_value=0.0001, max_value=0.9999,
+                                       value=round(min(center * 1.1, 0.9999), 4), format="%.4f", key=f"sweep_{axis}_high")
+                points = st.number_input("Puntos", min_value=2, max_value=200, value=20, key=f"sweep_{axis}_points")
+                axes[axis] = (param, np.linspace(low, high, int(points)))
+        (x_param, x_values), (y_param, y_values) = axes["x"], axes["y"]
+        if x_param == y_param:
+            st.warning("Elige dos parámetros distintos")
+            return
+
+        inputs = (case, p0, p1, alpha, beta, x_param, tuple(x_values), y_param, tuple(y_values))
+        if st.button("Calcular grilla"):
+            with st.spinner(f"Resolviendo {len(x_values) * len(y_values):,} planes..."):
+                sweep = sweep_grid(base, case, x_param, x_values, y_param, y_values)
+            st.session_state.sweep_result = {"inputs": inputs, "sweep": sweep}
+
+        stored = st.session_state.get("sweep_result")
+        if not stored or stored["inputs"] != inputs:
+            return
+        sweep = stored["sweep"]
+        solved = int(np.isfinite(sweep["n"]).sum())
+        st.caption(f"{solved:,} de {sweep['n'].size:,} celdas con plan · "
+                   f"{sweep['evaluaciones_cdf']:,} evaluaciones de la binomial · "
+                   f"{sweep['procesos']} procesos · {sweep['segundos']:.2f} s")
+        grid_x, grid_y = np.meshgrid(x_values, y_values)
+        data = pd.DataFrame({"x": grid_x.ravel(), "y": grid_y.ravel(),
+                             "n": sweep["n"].ravel(), "r": sweep["r"].ravel()}).dropna()
+        x_label, y_label = SWEEP_PARAMETERS[x_param], SWEEP_PARAMETERS[y_param]
+        tab_n, tab_r = st.tabs(["n", "r"])
+        with tab_n:
+            st.altair_chart(_heatmap(data, "n", x_label, y_label), width="stretch")
+        with tab_r:
+            st.altair_chart(_heatmap(data, "r", x_label, y_label), width="stretch")
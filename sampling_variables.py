@@ -0,0 +1,234 @@
+import warnings
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy.stats import norm, nct
+
+from sampling_plan import find_minimal_solution
+from sampling_oc import acceptance_probability
+
+# Valores de k candidatos evaluados en bloque en el intervalo factible del n elegido
+_K_CANDIDATES = 129
+
+# Modelos de la desviación estándar del proceso
+SIGMA_MODELS = {
+    "conocida": "σ conocida (normal)",
+    "desconocida": "σ desconocida (t no central)",
+}
+
+def prob_statistic_above(k, n, p, sigma="conocida"):
+    """
+    G(k) = P(Q ≥ k | n, p) para el estadístico Q = (U - x̄)/σ (σ conocida) o
+    Q = (U - x̄)/s (σ desconocida), con U el límite de especificación y p la
+    fracción defectuosa del lote (P(X > U) = p, luego (U - μ)/σ = z_p).
+
+    σ conocida:    G = Φ((z_p - k)·√n)
+    σ desconocida: √n·Q sigue una t no central con n - 1 g.l. y parámetro
+                   √n·z_p, luego G = P(T' ≥ k·√n)
+
+    Acepta arreglos con broadcasting en k y n.
+    """
+    z_p = norm.isf(p)
+    sqrt_n = np.sqrt(n)
+    if sigma == "conocida":
+        return norm.cdf((z_p - k) * sqrt_n)
+    return nct.sf(k * sqrt_n, n - 1, sqrt_n * z_p)
+
+def _k_at(g, n, p, sigma="conocida"):
+    """Valor de k con G(k) = g (G es decreciente en k), vectorizado sobre n"""
+    z_p = norm.isf(p)
+    sqrt_n = np.sqrt(n)
+    if sigma == "conocida":
+        return z_p - norm.ppf(g) / sqrt_n
+    with warnings.catch_warnings():
+        # Para n muy grande Boost avisa que la serie converge lento; el
+        # resultado se verifica después con G
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return nct.isf(g, n - 1, sqrt_n * z_p) / sqrt_n
+
+def variables_error_probabilities(n, k, p0, p1, case=1, sigma="conocida"):
+    """
+    Probabilidades de error (α_real, β_real) del plan por variables (n, k).
+
+    Caso 1: H₀: p ≤ p₀ vs H₁: p > p₀, se rechaza H₀ si Q < k
+            α = 1 - G(k | p₀), β = G(k | p₁)
+    Caso 2: H₀: p ≥ p₀ vs H₁: p < p₀, se rechaza H₀ si Q ≥ k
+            α = G(k | p₀), β = 1 - G(k | p₁)
+    """
+    g0 = prob_statistic_above(k, n, p0, sigma)
+    g1 = prob_statistic_above(k, n, p1, sigma)
+    if case == 1:
+        return 1 - g0, g1
+    return g0, 1 - g1
+
+def _k_interval(ns, p0, alpha, p1, beta, case=1, sigma="conocida"):
+    """
+    Intervalo [k_lo, k_hi] de valores de k factibles para n (escalar o
+    arreglo; vacío donde k_lo > k_hi), invirtiendo G en ambos riesgos.
+    """
+    if case == 1:
+        return _k_at(beta, ns, p1, sigma), _k_at(1 - alpha, ns, p0, sigma)
+    return _k_at(alpha, ns, p0, sigma), _k_at(1 - beta, ns, p1, sigma)
+
+def find_variables_plan(p0, alpha, p1, beta, case=1, sigma="conocida", stats=None, n_limit=10**7):
+    """
+    Plan por variables (n, k) de menor n para fracciones defectuosas p₀
+    (AQL) y p₁ (LTPD), con los mismos casos que el plan de Bernoulli.
+
+    1. Cota inferior de n: con σ conocida, la fórmula cerrada
+       ((z_α + z_β)/(z_p₀ - z_p₁))²; con σ desconocida, el n mínimo con σ
+       conocida (con el σ real fijo, su prueba es una prueba más con σ
+       conocida, así que no puede necesitar menos).
+    2. Un n es factible si el intervalo de k que cumple ambos riesgos (una
+       inversión de G por riesgo) no es vacío; como ese intervalo se ensancha
+       con n, el primer n factible se halla por horquillado exponencial desde
+       la cota y bisección.
+    3. En ese n se evalúan en bloque `_K_CANDIDATES` valores de k del
+       intervalo y se elige el que deja α_real y β_real lo más cerca posible
+       de los límites, como en el plan de Bernoulli.
+
+    Retorna (n, k, α_real, β_real) o None. En `stats` se informan las
+    evaluaciones de la distribución y los n probados.
+    """
+    if stats is None:
+        stats = {}
+    stats.setdefault('evaluaciones', 0)
+    stats.setdefault('n_probados', 0)
+
+    def interval(n):
+        stats['evaluaciones'] += 2
+        stats['n_probados'] += 1
+        return _k_interval(n, p0, alpha, p1, beta, case, sigma)
+
+    if sigma == "conocida":
+        z_sum = norm.isf(alpha) + norm.isf(beta)
+        n_lb = max(1, int(np.floor((z_sum / (norm.isf(p0) - norm.isf(p1)))**2)))
+    else:
+        known = find_variables_plan(p0, alpha, p1, beta, case, "conocida", stats, n_limit)
+        if known is None:
+            return None
+        n_lb = max(2, known[0])
+
+    # 1. Horquillado exponencial: lo es infactible (o menor que la cota), hi factible
+    lo, hi = n_lb - 1, n_lb
+    while np.subtract(*interval(hi)) > 0:
+        if hi > n_limit:
+            return None
+        lo, hi = hi, 2 * hi
+    # 2. Bisección
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if np.subtract(*interval(mid)) > 0:
+            lo = mid
+        else:
+            hi = mid
+
+    # 3. Candidatos de k en el intervalo (se avanza si el redondeo lo deja vacío)
+    for n in range(hi, hi + 8):
+        k_lo, k_hi = interval(n)
+        ks = np.linspace(k_lo, k_hi, _K_CANDIDATES)
+        prob_type1, prob_type2 = variables_error_probabilities(n, ks, p0, p1, case, sigma)
+        stats['evaluaciones'] += 2 * ks.size
+        valid = np.flatnonzero((prob_type1 <= alpha) & (prob_type2 <= beta))
+        if valid.size:
+            best = valid[np.argmin((alpha - prob_type1[valid])**2 + (beta - prob_type2[valid])**2)]
+            return n, float(ks[best]), float(prob_type1[best]), float(prob_type2[best])
+    return None
+
+def show_variables_plan():
+    st.title("📏 Plan de Muestreo por Variables")
+    st.markdown("""
+    Para características **continuas** con un límite de especificación superior U,
+    la fracción defectuosa es p = P(X > U). En lugar de contar defectuosos se mide
+    cada unidad y se compara Q = (U - x̄)/σ (o (U - x̄)/s) con una constante **k**:
+    a igualdad de riesgos, el plan por variables necesita muestras mucho menores
+    que el plan por atributos.
+    """)
+
+    # Mismas convenciones de entrada que el plan de Bernoulli
+    case = st.radio(
+        "Seleccione el tipo de prueba de hipótesis:",
+        options=[1, 2],
+        format_func=lambda x: f"Caso {x}: H₀: p {'≤' if x == 1 else '≥'} p₀  vs  H₁: p {'>' if x == 1 else '<'} p₀",
+        horizontal=True
+    )
+    if case == 1:
+        st.caption("Se rechaza H₀ (lote con p > p₀) si (U - x̄)/σ < k")
+    else:
+        st.caption("Se rechaza H₀ (lote con p < p₀) si (U - x̄)/σ ≥ k")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        p0 = st.number_input("p₀ (Fracción defectuosa bajo H₀, AQL)", min_value=0.0001, max_value=0.9999,
+                             value=0.01, step=0.01, format="%.4f")
+        p1 = st.number_input("p₁ (Fracción defectuosa bajo H₁, LTPD)", min_value=0.0001, max_value=0.9999,
+                             value=0.05 if case == 1 else 0.002, step=0.01, format="%.4f")
+    with col2:
+        alpha = st.number_input("α (Nivel de significancia)", min_value=0.0001, max_value=0.9999,
+                                value=0.05, step=0.01, format="%.4f")
+        beta = st.number_input("β (Error tipo II)", min_value=0.0001, max_value=0.9999,
+                               value=0.10, step=0.01, format="%.4f")
+
+    if case == 1 and p1 <= p0:
+        st.error("⚠️ Para el Caso 1, p₁ debe ser mayor que p₀")
+        return
+    if case == 2 and p1 >= p0:
+        st.error("⚠️ Para el Caso 2, p₁ debe ser menor que p₀")
+        return
+
+    inputs = (case, p0, p1, alpha, beta)
+    if st.button("Calcular Plan por Variables", type="primary"):
+        plans, stats = {}, {}
+        for sigma in SIGMA_MODELS:
+            plans[sigma] = find_variables_plan(p0, alpha, p1, beta, case, sigma, stats)
+        attributes = find_minimal_solution(p0, alpha, p1, beta, case)
+        st.session_state.variables_result = {"inputs": inputs, "plans": plans,
+                                             "attributes": attributes, "stats": stats}
+
+    stored = st.session_state.get("variables_result")
+    if not stored or stored["inputs"] != inputs:
+        return
+    plans, attributes = stored["plans"], stored["attributes"]
+
+    st.markdown("## 🎯 Planes por Variables")
+    rows = []
+    for sigma, label in SIGMA_MODELS.items():
+        plan = plans[sigma]
+        if plan is None:
+            st.error(f"❌ No se encontró un plan con {label}")
+            continue
+        n, k, actual_alpha, actual_beta = plan
+        rows.append({"Plan": label, "n": n, "k": k, "α real": actual_alpha, "β real": actual_beta})
+    if attributes:
+        rows.append({"Plan": "Atributos (Bernoulli, r defectuosos)", "n": attributes[0], "k": None,
+                     "α real": attributes[2], "β real": attributes[3]})
+    st.dataframe(pd.DataFrame(rows), hide_index=True)
+    st.caption(f"{stored['stats']['evaluaciones']:,} evaluaciones de la normal / t no central")
+
+    unknown = plans["desconocida"]
+    if unknown and attributes:
+        st.info(f"Con σ desconocida se inspeccionan {unknown[0]:,} unidades frente a {attributes[0]:,} del plan "
+                f"por atributos ({1 - unknown[0] / attributes[0]:.0%} menos)")
+
+    # Curvas OC de los planes
+    p_max = min(1.0, 2 * max(p0, p1))
+    p = np.linspace(0, p_max, 400)[1:]
+    frames = []
+    for sigma, label in SIGMA_MODELS.items():
+        if plans[sigma]:
+            n, k = plans[sigma][:2]
+            g = prob_statistic_above(k, n, p, sigma)
+            frames.append(pd.DataFrame({"p": p, "Pa": g if case == 1 else 1 - g, "Plan": label}))
+    if attributes:
+        frames.append(pd.DataFrame({"p": p, "Pa": acceptance_probability(attributes[0], attributes[1], p, case),
+                                    "Plan": "Atributos"}))
+    if frames:
+        chart = alt.Chart(pd.concat(frames, ignore_index=True)).mark_line().encode(
+            x=alt.X("p:Q", title="Fracción defectuosa p"),
+            y=alt.Y("Pa:Q", title="P(no rechazar H₀ | p)"),
+            color=alt.Color("Plan:N"),
+            tooltip=["Plan", alt.Tooltip("p:Q", format=".4f"), alt.Tooltip("Pa:Q", format=".6f")]
+        ).interactive()
+        st.altair_chart(chart, width="stretch")
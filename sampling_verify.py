@@ -0,0 +1,191 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import streamlit as st
+from scipy.special import gammaln, xlogy, xlog1py
+
+from sampling_plan import BYTES_PER_CELL, error_probabilities, row_chunks
+
+# Tareas por proceso: más tareas que procesos equilibran la carga y permiten
+# descartar pronto los rangos que ya no pueden mejorar el resultado
+_TASKS_PER_WORKER = 8
+
+# Celdas (n, r) como máximo para ofrecer la verificación en la página
+# (≈ 1e7 celdas por segundo y proceso: unos minutos con un núcleo)
+MAX_VERIFY_CELLS = 2_000_000_000
+
+# Margen de los candidatos: las colas acumuladas difieren de binom.cdf en
+# menos que esto, y cada candidato se confirma con error_probabilities
+_CANDIDATE_MARGIN = 1e-9
+
+def _tail_tables(block_ns, width, p0, p1):
+    """
+    CDF binomiales P(X ≤ r | n, p₀) y P(X ≤ r | n, p₁) de un bloque de filas
+    (n) para r = 0..width-1, como suma acumulada de la pmf en escala
+    logarítmica. El término log Γ(n - r + 1) se comparte entre p₀ y p₁.
+    """
+    rs = np.arange(width)[None, :]
+    failures = np.maximum(block_ns - rs, 0)
+    log_comb = gammaln(block_ns + 1) - gammaln(rs + 1) - gammaln(failures + 1)
+    in_range = rs <= block_ns
+    cdfs = []
+    for p in (p0, p1):
+        pmf = np.where(in_range, np.exp(log_comb + xlogy(rs, p) + xlog1py(failures, -p)), 0.0)
+        cdfs.append(np.cumsum(pmf, axis=1))
+    return cdfs
+
+def verify_range(n_lo, n_hi, p0, alpha, p1, beta, case=1, memory_mb=64):
+    """
+    Revisa exhaustivamente todos los planes (n, r) con n_lo ≤ n ≤ n_hi.
+
+    Para cada n se evalúan todos los r de 0 a n + 1 (incluye las reglas que
+    nunca o siempre rechazan), en grillas (n × r) por bloques de filas de a
+    lo sumo `memory_mb` megabytes. Las colas salen de sumas acumuladas de la
+    pmf; las celdas que quedan dentro de un margen mínimo de α y β se
+    confirman con error_probabilities, las mismas fórmulas del resto del
+    módulo. Se detiene en el primer n factible, porque ningún n mayor del
+    rango puede ser el mínimo.
+
+    Retorna un dict con la cantidad de n revisados, las celdas evaluadas y el
+    primer plan factible (n, r, α_real, β_real) o None; r se elige con el
+    mismo criterio que find_exact_solution.
+    """
+    ns = np.arange(n_lo, n_hi + 1, dtype=np.int64)
+    max_cells = max(1, int(memory_mb * 2**20 // BYTES_PER_CELL))
+    certificate = {"n_lo": int(n_lo), "n_verificados": 0, "celdas": 0, "plan": None}
+    for start, end, width in row_chunks(ns + 2, max_cells):
+        block_ns = ns[start:end, None]
+        cdf0, cdf1 = _tail_tables(block_ns, width, p0, p1)
+        if case == 1:
+            # α(r) = 1 - F(r-1 | p₀), β(r) = F(r-1 | p₁), con F(-1) = 0
+            cdf0_prev = np.concatenate([np.zeros_like(block_ns, dtype=float), cdf0[:, :-1]], axis=1)
+            cdf1_prev = np.concatenate([np.zeros_like(block_ns, dtype=float), cdf1[:, :-1]], axis=1)
+            prob_type1, prob_type2 = 1 - cdf0_prev, cdf1_prev
+        else:
+            # α(r) = F(r | p₀), β(r) = 1 - F(r | p₁)
+            prob_type1, prob_type2 = cdf0, 1 - cdf1
+        rs = np.arange(width)[None, :]
+        candidates = ((rs <= block_ns + 1) & (prob_type1 <= alpha + _CANDIDATE_MARGIN)
+                      & (prob_type2 <= beta + _CANDIDATE_MARGIN))
+        certificate["celdas"] += int((block_ns + 2).sum())
+
+        for row in np.flatnonzero(candidates.any(axis=1)):
+            n = int(block_ns[row, 0])
+            cols = np.flatnonzero(candidates[row])
+            exact_type1, exact_type2 = error_probabilities(n, cols, p0, p1, case)
+            feasible = (exact_type1 <= alpha) & (exact_type2 <= beta)
+            if not feasible.any():
+                continue
+            certificate["n_verificados"] += row + 1
+            cols, exact_type1, exact_type2 = cols[feasible], exact_type1[feasible], exact_type2[feasible]
+            best = int(np.argmin((alpha - exact_type1)**2 + (beta - exact_type2)**2))
+            certificate["plan"] = (n, int(cols[best]), float(exact_type1[best]), float(exact_type2[best]))
+            return certificate
+        certificate["n_verificados"] += end - start
+    return certificate
+
+def _split_range(n_found, tasks):
+    """
+    Divide 1..n_found en `tasks` rangos contiguos con aproximadamente la misma
+    cantidad de celdas: el costo de cada n crece con n (n + 2 valores de r).
+    """
+    cells = np.cumsum(np.arange(1, n_found + 1, dtype=np.float64) + 2)
+    targets = cells[-1] * np.arange(1, tasks) / tasks
+    cuts = np.unique(np.searchsorted(cells, targets) + 1)
+    bounds = np.concatenate([[1], cuts[(cuts > 1) & (cuts <= n_found)], [n_found + 1]])
+    return [(int(lo), int(hi) - 1) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+def verify_minimal_plan(n_found, p0, alpha, p1, beta, case=1, workers=None, memory_mb=64):
+    """
+    Certifica por fuerza bruta el menor n factible en 1..n_found.
+
+    La factibilidad no es monótona en n, así que la parada temprana de
+    find_exact_solution podría saltarse un plan menor. El rango se reparte
+    entre `workers` procesos (por defecto, todos los núcleos) en tareas de
+    costo parejo; cada una revisa todos sus (n, r) con verify_range y las
+    tareas que empiezan después de un n factible ya encontrado se cancelan.
+
+    Retorna el certificado: n revisados (todos los n menores que el mínimo
+    encontrado), celdas evaluadas, el menor plan factible (o None si no hay
+    ninguno con n ≤ n_found), procesos y segundos empleados.
+    """
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    ranges = _split_range(int(n_found), _TASKS_PER_WORKER * workers)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(verify_range, lo, hi, p0, alpha, p1, beta, case, memory_mb): lo
+            for lo, hi in ranges
+        }
+        best_n = None
+        for done in as_completed(futures):
+            if done.cancelled():
+                continue
+            certificate = done.result()
+            results.append(certificate)
+            plan = certificate["plan"]
+            if plan and (best_n is None or plan[0] < best_n):
+                best_n = plan[0]
+                # Los rangos que empiezan después de best_n no pueden mejorarlo
+                for future, lo in futures.items():
+                    if lo > best_n:
+                        future.cancel()
+
+    plans = [c["plan"] for c in results if c["plan"]]
+    best = min(plans, key=lambda plan: plan[0]) if plans else None
+    # Sólo cuentan los n revisados por debajo del mínimo (o en todo el rango)
+    limit = best[0] if best else int(n_found) + 1
+    checked = sum(min(c["n_verificados"], max(0, limit - c["n_lo"])) for c in results)
+    return {
+        "n_hasta": int(n_found),
+        "n_verificados": int(checked),
+        "celdas": sum(c["celdas"] for c in results),
+        "plan": best,
+        "procesos": workers,
+        "segundos": time.perf_counter() - started,
+    }
+
+def show_verify_section(case, p0, p1, alpha, beta, result):
+    """Sección de la página para certificar que no existe un plan con n menor"""
+    with st.expander("🔍 Verificación exhaustiva de optimalidad (multinúcleo)"):
+        n_found = result[0]
+        st.markdown(
+            f"Revisa todos los planes (n, r) con n ≤ {n_found:,} repartidos entre varios procesos "
+            "y certifica cuál es el menor n factible. La factibilidad no es monótona en n, así que "
+            "la búsqueda heurística podría saltarse un plan menor."
+        )
+        cells = n_found * (n_found + 5) / 2
+        if cells > MAX_VERIFY_CELLS:
+            st.error(f"⚠️ Serían ≈ {cells:,.0f} celdas (n, r), más que el máximo de {MAX_VERIFY_CELLS:,}: "
+                     "la verificación exhaustiva no es viable para este plan")
+            return
+        workers = st.number_input("Procesos", min_value=1, value=os.cpu_count() or 1, step=1)
+        st.caption(f"≈ {cells:,.0f} celdas (n, r) a evaluar")
+        inputs = (case, p0, p1, alpha, beta, n_found)
+        if st.button("Verificar optimalidad"):
+            with st.spinner("Revisando todos los planes (n, r)..."):
+                certificate = verify_minimal_plan(n_found, p0, alpha, p1, beta, case, int(workers))
+            st.session_state.verify_result = {"inputs": inputs, "certificate": certificate}
+
+        stored = st.session_state.get("verify_result")
+        if not stored or stored["inputs"] != inputs:
+            return
+        certificate = stored["certificate"]
+        st.caption(
+            f"{certificate['n_verificados']:,} valores de n y {certificate['celdas']:,} celdas (n, r) "
+            f"revisados con {certificate['procesos']} procesos en {certificate['segundos']:.2f} s"
+        )
+        plan = certificate["plan"]
+        if plan is None:
+            st.error(f"❌ Ningún plan con n ≤ {n_found:,} es factible")
+        elif plan[0] == n_found:
+            st.success(f"✅ Certificado: ningún n < {n_found:,} es factible; el plan encontrado es mínimo")
+        else:
+            n_min, r_min, alpha_min, beta_min = plan
+            st.warning(
+                f"⚠️ Existe un plan menor: n = {n_min:,}, r = {r_min:,} · α_real = {alpha_min:.6f} · "
+                f"β_real = {beta_min:.6f}. Ningún n < {n_min:,} es factible."
+            )
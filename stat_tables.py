@@ -0,0 +1,222 @@
+import argparse
+import functools
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy.stats import binom, chi2, f, norm, poisson, t
+
+# Carpeta por defecto de las tablas precalculadas (un .npy por tabla más el índice de grillas)
+TABLES_PATH = Path(__file__).resolve().parent / "tablas_estadisticas"
+_INDEX_FILE = "indice.json"
+
+# Niveles de significancia estándar (cola derecha), en orden creciente
+ALPHAS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.10, 0.25)
+
+# Tolerancia para considerar que un valor cae exactamente en la grilla
+_GRID_TOL = 1e-9
+
+def _grid(start, stop, step, decimals):
+    """Grilla regular redondeada para que sus valores coincidan con los que se escriben a mano"""
+    return np.round(np.arange(round((stop - start) / step) + 1) * step + start, decimals)
+
+# Tablas: ejes (nombre → grilla), función vectorizada con los ejes como argumentos y descripción
+TABLES = {
+    "chi2": {
+        "titulo": "Valores críticos de χ² (cola derecha α)",
+        "ejes": {"gl": np.arange(1, 201), "alpha": np.array(ALPHAS)},
+        "calcular": lambda gl, alpha: chi2.isf(alpha, gl),
+    },
+    "t": {
+        "titulo": "Valores críticos de t de Student (cola derecha α)",
+        "ejes": {"gl": np.arange(1, 201), "alpha": np.array(ALPHAS)},
+        "calcular": lambda gl, alpha: t.isf(alpha, gl),
+    },
+    "f": {
+        "titulo": "Valores críticos de F de Fisher-Snedecor (cola derecha α)",
+        "ejes": {"df1": np.arange(1, 101), "df2": np.arange(1, 201), "alpha": np.array(ALPHAS)},
+        "calcular": lambda df1, df2, alpha: f.isf(alpha, df1, df2),
+    },
+    "normal": {
+        "titulo": "Distribución normal estándar Φ(z) = P(Z ≤ z)",
+        "ejes": {"z": _grid(-4.0, 4.0, 0.01, 2)},
+        "calcular": lambda z: norm.cdf(z),
+    },
+    "binomial": {
+        "titulo": "Distribución binomial acumulada P(X ≤ r | n, p)",
+        "ejes": {"n": np.arange(1, 101), "r": np.arange(0, 101), "p": _grid(0.01, 0.99, 0.01, 2)},
+        "calcular": lambda n, r, p: binom.cdf(r, n, p),
+    },
+    "poisson": {
+        "titulo": "Distribución de Poisson acumulada P(X ≤ k | λ)",
+        "ejes": {"lambda": _grid(0.1, 50.0, 0.1, 1), "k": np.arange(0, 151)},
+        "calcular": lambda lam, k: poisson.cdf(k, lam),
+    },
+}
+
+def _compute_table(name):
+    """Arreglo denso float64 de la tabla sobre el producto de sus grillas"""
+    spec = TABLES[name]
+    mesh = np.meshgrid(*spec["ejes"].values(), indexing="ij")
+    return np.ascontiguousarray(spec["calcular"](*mesh), dtype=np.float64)
+
+def build_tables(path=TABLES_PATH, names=None):
+    """
+    Calcula las tablas y las guarda en `path`: un .npy por tabla (mapeable
+    en memoria) y un índice JSON con las grillas de cada eje. Retorna
+    {nombre: segundos}.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    timings = {}
+    index = {}
+    for name in names or TABLES:
+        started = time.perf_counter()
+        np.save(path / f"{name}.npy", _compute_table(name))
+        timings[name] = time.perf_counter() - started
+        index[name] = {axis: values.tolist() for axis, values in TABLES[name]["ejes"].items()}
+    index_path = path / _INDEX_FILE
+    if index_path.exists():
+        index = {**json.loads(index_path.read_text(encoding="utf-8")), **index}
+    index_path.write_text(json.dumps(index), encoding="utf-8")
+    return timings
+
+_loaded = {}
+
+def load_table(name, path=TABLES_PATH):
+    """
+    (valores, grillas) de la tabla: el arreglo mapeado en memoria desde el
+    almacén (se vuelve a abrir sólo si el archivo cambió) o, si la tabla no
+    está generada o sus grillas no coinciden con las actuales, calculado y
+    guardado en memoria.
+    """
+    path = Path(path)
+    file = path / f"{name}.npy"
+    try:
+        mtime = file.stat().st_mtime_ns
+    except FileNotFoundError:
+        return _computed_table(name), TABLES[name]["ejes"]
+    cached = _loaded.get(file)
+    if cached is None or cached[0] != mtime:
+        grids = json.loads((path / _INDEX_FILE).read_text(encoding="utf-8")).get(name, {})
+        current = all(np.array_equal(grids.get(axis), values) for axis, values in TABLES[name]["ejes"].items())
+        values = np.load(file, mmap_mode="r") if current else _computed_table(name)
+        cached = (mtime, values)
+        _loaded[file] = cached
+    return cached[1], TABLES[name]["ejes"]
+
+@functools.lru_cache(maxsize=None)
+def _computed_table(name):
+    values = _compute_table(name)
+    values.setflags(write=False)
+    return values
+
+def _grid_index(grid, value):
+    """Índice de `value` en la grilla ordenada, o None si no cae en ella"""
+    i = int(np.searchsorted(grid, value - _GRID_TOL * max(1.0, abs(value))))
+    if i < len(grid) and abs(grid[i] - value) <= _GRID_TOL * max(1.0, abs(value)):
+        return i
+    return None
+
+def lookup(name, path=TABLES_PATH, **values):
+    """
+    Valor de la tabla en el punto dado por los ejes (por nombre, por
+    ejemplo lookup("chi2", gl=5, alpha=0.05)): lectura directa si todos
+    los valores caen en la grilla y SciPy en otro caso.
+    """
+    spec = TABLES[name]
+    table, grids = load_table(name, path)
+    indices = tuple(_grid_index(grids[axis], float(values[axis])) for axis in spec["ejes"])
+    if None not in indices:
+        return float(table[indices])
+    return float(spec["calcular"](*(values[axis] for axis in spec["ejes"])))
+
+def chi2_critical(alpha, gl, path=TABLES_PATH):
+    """Valor crítico de χ² con gl grados de libertad y cola derecha α"""
+    return lookup("chi2", path, gl=gl, alpha=alpha)
+
+def f_critical(alpha, df1, df2, path=TABLES_PATH):
+    """Valor crítico de F(df1, df2) con cola derecha α"""
+    return lookup("f", path, df1=df1, df2=df2, alpha=alpha)
+
+def table_frame(name, path=TABLES_PATH, **fixed):
+    """
+    Tabla imprimible (DataFrame): filas = primer eje libre, columnas =
+    segundo. En las tablas de tres ejes se fija el tercero con `fixed`
+    (por ejemplo alpha=0.05 en F o n=20 en la binomial). La normal se
+    arma como la tabla clásica: filas z con un decimal, columnas el
+    segundo decimal.
+    """
+    import pandas as pd
+
+    spec = TABLES[name]
+    table, grids = load_table(name, path)
+    if name == "normal":
+        # Fila = signo, entero y primer decimal de z (con "-0.0" para los negativos); columna = segundo decimal
+        z = np.asarray(grids["z"])
+        hundredths = np.round(np.abs(z) * 100).astype(int)
+        labels = [f"{'-' if value < 0 else ''}{h // 10 / 10:.1f}" for value, h in zip(z, hundredths)]
+        frame = pd.DataFrame({"z": labels, "columna": (hundredths % 10) / 100, "Φ(z)": np.asarray(table)})
+        order = list(dict.fromkeys(labels))
+        return (frame.pivot(index="z", columns="columna", values="Φ(z)")
+                .reindex(order).rename_axis(columns=None))
+
+    selection = []
+    free = []
+    for axis in spec["ejes"]:
+        if axis in fixed:
+            i = _grid_index(grids[axis], float(fixed[axis]))
+            if i is None:
+                raise ValueError(f"{axis} = {fixed[axis]} no está en la grilla de la tabla {name}")
+            selection.append(i)
+        else:
+            selection.append(slice(None))
+            free.append(axis)
+    values = np.asarray(table[tuple(selection)])
+    rows, columns = free
+    frame = pd.DataFrame(values, index=pd.Index(grids[rows], name=rows), columns=grids[columns])
+    if name == "binomial":
+        # Las filas con r > n no son parte de la tabla impresa
+        frame = frame.loc[frame.index <= int(fixed["n"])]
+    return frame
+
+def show_table_section(name, key):
+    """Expander de una página con la tabla completa, para ver o descargar en CSV"""
+    import streamlit as st
+
+    spec = TABLES[name]
+    with st.expander(f"📋 Tabla: {spec['titulo']}"):
+        axes = list(spec["ejes"])
+        fixed = {}
+        if len(axes) == 3:
+            axis = axes[-1] if name != "binomial" else "n"
+            options = spec["ejes"][axis].tolist()
+            default = options.index(0.05) if 0.05 in options else min(19, len(options) - 1)
+            fixed[axis] = st.selectbox(f"Valor de {axis}", options, index=default, key=f"{key}_{axis}")
+        started = time.perf_counter()
+        frame = table_frame(name, **fixed)
+        elapsed = time.perf_counter() - started
+        stored = (TABLES_PATH / f"{name}.npy").exists()
+        st.caption(f"{frame.size:,} valores en {elapsed * 1000:.1f} ms · "
+                   + ("almacén precalculado (memoria mapeada)" if stored else
+                      "calculada en memoria: genera el almacén con `python stat_tables.py`"))
+        st.dataframe(frame.style.format("{:.4f}"))
+        suffix = "_".join(f"{axis}{value}" for axis, value in fixed.items())
+        st.download_button("⬇️ Descargar tabla (CSV)", frame.to_csv(float_format="%.6f"),
+                           file_name=f"tabla_{name}{'_' + suffix if suffix else ''}.csv", mime="text/csv",
+                           key=f"{key}_descarga")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera el almacén de tablas estadísticas precalculadas.")
+    parser.add_argument("--salida", default=str(TABLES_PATH), help="Carpeta del almacén")
+    parser.add_argument("--tablas", nargs="+", choices=list(TABLES), default=None)
+    args = parser.parse_args(argv)
+
+    timings = build_tables(args.salida, args.tablas)
+    for name, seconds in timings.items():
+        print(f"{name}: {TABLES[name]['titulo']} ({seconds:.2f} s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()